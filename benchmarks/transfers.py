@@ -0,0 +1,131 @@
+"""
+Transfers per second under contention: many concurrent workers moving money
+between a handful of hot accounts.
+
+    uv run python benchmarks/transfers.py --accounts 4 --workers 64 --duration 10
+
+Connects with the same DB_* settings as the API and creates its own customer and
+accounts, which it deletes again afterwards. Fails if money was created or lost.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from dummy_bank.api.settings import Settings
+from dummy_bank.domain import Account, Customer
+from dummy_bank.repository import (
+    AccountsRepository,
+    CustomerRepository,
+    DBAccount,
+    DBCustomer,
+)
+
+INITIAL_BALANCE = 1_000_000
+
+
+async def worker(
+    repository: AccountsRepository,
+    accounts: list[Account],
+    deadline: float,
+    results: dict[str, int],
+) -> None:
+    while time.perf_counter() < deadline:
+        source, target = random.sample(accounts, 2)
+        try:
+            await repository.transfer(source.id, target.id, random.randint(1, 100))
+            results["transfers"] += 1
+        except ValueError:
+            results["rejected"] += 1
+
+
+async def run(
+    engine: AsyncEngine, n_accounts: int, workers: int, duration: float
+) -> None:
+    customers = CustomerRepository(engine)
+    repository = AccountsRepository(engine)
+
+    customer = Customer(
+        id=uuid4(),
+        created_at=None,
+        updated_at=None,
+        first_name="Bench",
+        middle_names=None,
+        last_name="Mark",
+        email=f"benchmark-{uuid4()}@example.com",
+        phone="07000000000",
+    )
+    await customers.save_customer(customer)
+
+    accounts = [
+        Account(
+            id=uuid4(),
+            created_at=None,
+            updated_at=None,
+            customer_id=customer.id,
+            account_type="current",
+            account_number=f"{i:08}",
+            account_balance=INITIAL_BALANCE,
+        )
+        for i in range(n_accounts)
+    ]
+    await repository.save_accounts(accounts)
+
+    results = {"transfers": 0, "rejected": 0}
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                worker(repository, accounts, start + duration, results)
+                for _ in range(workers)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        loaded = await repository.load_accounts_with_ids(a.id for a in accounts)
+        total = sum(account.account_balance for account in loaded.values())
+        expected = sum(account.account_balance for account in accounts)
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(DBAccount).where(DBAccount.customer_id == customer.id)
+            )
+            await conn.execute(delete(DBCustomer).where(DBCustomer.id == customer.id))
+
+    print(
+        f"{results['transfers']} transfers in {elapsed:.1f}s "
+        f"({results['transfers'] / elapsed:.0f}/s) across {n_accounts} accounts "
+        f"with {workers} workers, {results['rejected']} rejected"
+    )
+    if total != expected:
+        raise SystemExit(f"balances do not add up: {total} != {expected}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark contended transfers.")
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    settings = Settings()
+    options = settings.engine_options()
+    options["pool_size"] = max(options["pool_size"], args.workers)
+
+    async def _run() -> None:
+        engine = create_async_engine(settings.database_url(), **options)
+        try:
+            await run(engine, args.accounts, args.workers, args.duration)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,36 @@
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import AwareDatetime
 
 from dummy_bank.api import exceptions
+from dummy_bank.api.bulk_import import REQUEST_BODY, import_rows
 from dummy_bank.api.dependencies import (
     AccountRepositoryDep,
     CustomerRepositoryDep,
-    LockManagerDep,
     LoggerDep,
+    TransactionsRepositoryDep,
+    UnitOfWorkDep,
 )
+from dummy_bank.api.export import export_response
 from dummy_bank.domain import Account
-from dummy_bank.repository import SearchCondition
+from dummy_bank.repository import InvalidCursorError, SearchCondition
 
 from ..models import (
     AccountResponse,
     AccountsQueryParams,
+    BalanceResponse,
     BalanceTransfer,
     BalanceUpdate,
     CreateAccount,
+    ExportQueryParams,
+    ImportAccount,
+    ImportQueryParams,
+    ImportResponse,
     PaginatedResponse,
+    TransactionResponse,
+    TransactionsQueryParams,
 )
 
 router = APIRouter(tags=["accounts"])
@@ -37,11 +49,18 @@ async def list_accounts(
 ) -> PaginatedResponse:
     logger.info("retrieving accounts")
 
-    paginated_accounts = await repository.load_paginated_accounts(
-        page_size=params.page_size,
-        page=params.page,
-        customer_id=params.customer_id,
-    )
+    try:
+        paginated_accounts = await repository.load_paginated_accounts(
+            page_size=params.page_size,
+            page=params.page,
+            customer_id=params.customer_id,
+            cursor=params.cursor,
+            count=params.count,
+            search_condition=params.search_condition(),
+        )
+    except InvalidCursorError as e:
+        logger.info("invalid pagination cursor", cursor=params.cursor)
+        raise exceptions.InvalidRequestError(str(e))
 
     logger.info(
         "retrieved accounts",
@@ -60,9 +79,56 @@ async def list_accounts(
         total_pages=paginated_accounts["total_pages"],
         page=paginated_accounts["page"],
         page_size=paginated_accounts["page_size"],
+        next_cursor=paginated_accounts["next_cursor"],
+    )
+
+
+@router.get(
+    "/dummy-bank/v1/accounts/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export every account as NDJSON or CSV",
+)
+async def export_accounts(
+    logger: LoggerDep,
+    repository: AccountRepositoryDep,
+    params: ExportQueryParams = Depends(),
+) -> StreamingResponse:
+    logger.info("exporting accounts", format=params.format)
+
+    return export_response(
+        repository.stream_accounts(), AccountResponse, params.format, "accounts"
     )
 
 
+@router.post(
+    "/dummy-bank/v1/accounts/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Import accounts from NDJSON or CSV",
+    openapi_extra=REQUEST_BODY,
+)
+async def import_accounts(
+    logger: LoggerDep,
+    repository: AccountRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
+    request: Request,
+    params: ImportQueryParams = Depends(),
+) -> ImportResponse:
+    logger.info("importing accounts", format=params.format)
+
+    report = await import_rows(
+        request.stream(),
+        params.format,
+        ImportAccount,
+        repository.import_accounts,
+        unit_of_work.commit,
+    )
+
+    logger.info("imported accounts", imported=report.imported, rejected=report.rejected)
+    return report
+
+
 @router.post(
     "/dummy-bank/v1/accounts",
     response_model=AccountResponse,
@@ -73,6 +139,7 @@ async def create_account(
     logger: LoggerDep,
     customer_repository: CustomerRepositoryDep,
     account_repository: AccountRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     body: CreateAccount,
 ) -> AccountResponse:
     logger.info("retrieving customer", customer_id=str(body.customer_id))
@@ -109,6 +176,7 @@ async def create_account(
     logger.info("saving account", account_id=str(account.id))
 
     await account_repository.save_account(account)
+    await unit_of_work.commit()
     return AccountResponse.model_validate(account)
 
 
@@ -121,22 +189,23 @@ async def create_account(
 async def deposit(
     logger: LoggerDep,
     repository: AccountRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     account_id: UUID,
     body: BalanceUpdate,
 ) -> AccountResponse:
     logger.info("depositing amount", account_id=str(account_id), amount=body.amount)
 
-    account = await repository.load_account_with_id(account_id)
+    account = await repository.increase_balance(
+        account_id, Account.to_cents(body.amount)
+    )
     if not account:
         logger.info("account not found", account_id=account_id)
         raise exceptions.NotFoundError("account not found")
 
-    account.increase_balance(body.amount)
-
+    await unit_of_work.commit()
     logger.info(
         "balance updated", account_id=str(account_id), balance=account.account_balance
     )
-    await repository.save_account(account)
 
     return AccountResponse.model_validate(account)
 
@@ -149,39 +218,36 @@ async def deposit(
 )
 async def withdraw(
     repository: AccountRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     logger: LoggerDep,
     account_id: UUID,
     body: BalanceUpdate,
-    lock_manager: LockManagerDep,
 ) -> AccountResponse:
     logger.info("withdrawing amount", account_id=str(account_id), amount=body.amount)
 
-    async with lock_manager.lock(account_id):
-        account = await repository.load_account_with_id(account_id)
-        if not account:
-            logger.info("account not found", account_id=account_id)
-            raise exceptions.NotFoundError("account not found")
-
-        try:
-            current_balance = account.account_balance
-            account.decrease_balance(body.amount)
-            logger.info(
-                "balance updated",
-                account_id=account_id,
-                previous_balance=current_balance,
-                new_balance=account.account_balance,
-            )
-            await repository.save_account(account)
-        except ValueError as e:
-            logger.error(
-                "failed to withdraw money",
-                account_id=account_id,
-                amount=body.amount,
-                error=str(e),
-            )
-            raise exceptions.InvalidRequestError(str(e))
-
-        return AccountResponse.model_validate(account)
+    try:
+        account = await repository.decrease_balance(
+            account_id, Account.to_cents(body.amount)
+        )
+    except ValueError as e:
+        logger.error(
+            "failed to withdraw money",
+            account_id=account_id,
+            amount=body.amount,
+            error=str(e),
+        )
+        raise exceptions.InvalidRequestError(str(e))
+
+    if not account:
+        logger.info("account not found", account_id=account_id)
+        raise exceptions.NotFoundError("account not found")
+
+    await unit_of_work.commit()
+    logger.info(
+        "balance updated", account_id=account_id, new_balance=account.account_balance
+    )
+
+    return AccountResponse.model_validate(account)
 
 
 @router.post(
@@ -193,13 +259,31 @@ async def withdraw(
 async def transfer(
     logger: LoggerDep,
     repository: AccountRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     account_id: UUID,
     body: BalanceTransfer,
-    lock_manager: LockManagerDep,
 ) -> list[AccountResponse]:
-    account = await repository.load_account_with_id(account_id)
-    account_2 = await repository.load_account_with_id(body.account_id)
-    if not account or not account_2:
+    logger.info(
+        "transferring amount",
+        account_id1=str(account_id),
+        account_id2=str(body.account_id),
+        amount=body.amount,
+    )
+
+    try:
+        accounts = await repository.transfer(
+            account_id, body.account_id, Account.to_cents(body.amount)
+        )
+    except ValueError as e:
+        logger.error(
+            "failed to transfer money",
+            account_id=account_id,
+            amount=body.amount,
+            error=str(e),
+        )
+        raise exceptions.InvalidRequestError(str(e))
+
+    if not accounts:
         logger.info(
             "account not found",
             account_id1=str(account_id),
@@ -207,28 +291,14 @@ async def transfer(
         )
         raise exceptions.NotFoundError("account not found")
 
-    async with lock_manager.lock(account_id):
-        try:
-            account.decrease_balance(body.amount)
-            await repository.save_account(account)
-            logger.info(
-                "balance updated",
-                account_id=str(account_id),
-                balance=account.account_balance,
-            )
-        except ValueError as e:
-            logger.error(
-                "failed to transfer money",
-                account_id=account_id,
-                amount=body.amount,
-                error=str(e),
-            )
-            raise exceptions.InvalidRequestError(str(e))
-
-        account_2.increase_balance(body.amount)
-
-    await repository.save_account(account_2)
+    await unit_of_work.commit()
 
+    account, account_2 = accounts
+    logger.info(
+        "balance updated",
+        account_id=str(account.id),
+        balance=account.account_balance,
+    )
     logger.info(
         "balance updated",
         account_id=str(account_2.id),
@@ -239,3 +309,87 @@ async def transfer(
         AccountResponse.model_validate(account),
         AccountResponse.model_validate(account_2),
     ]
+
+
+@router.get(
+    "/dummy-bank/v1/accounts/{account_id}/transactions",
+    response_model=PaginatedResponse,
+    status_code=status.HTTP_200_OK,
+    summary="List transactions for Account",
+)
+async def list_transactions(
+    logger: LoggerDep,
+    account_repository: AccountRepositoryDep,
+    repository: TransactionsRepositoryDep,
+    account_id: UUID,
+    params: TransactionsQueryParams = Depends(),
+) -> PaginatedResponse:
+    logger.info("retrieving transactions", account_id=str(account_id))
+
+    if not await account_repository.load_account_with_id(account_id):
+        logger.info("account not found", account_id=account_id)
+        raise exceptions.NotFoundError("account not found")
+
+    try:
+        paginated_transactions = await repository.load_paginated_transactions(
+            page_size=params.page_size,
+            page=params.page,
+            account_id=account_id,
+            cursor=params.cursor,
+            count=params.count,
+            search_condition=params.search_condition(),
+        )
+    except InvalidCursorError as e:
+        logger.info("invalid pagination cursor", cursor=params.cursor)
+        raise exceptions.InvalidRequestError(str(e))
+
+    logger.info(
+        "retrieved transactions",
+        n=len(paginated_transactions["results"]),
+        total_count=paginated_transactions["total_count"],
+        page=paginated_transactions["page"],
+    )
+
+    return PaginatedResponse[TransactionResponse](
+        results=[
+            TransactionResponse.model_validate(transaction)
+            for transaction in paginated_transactions["results"]
+        ],
+        total_count=paginated_transactions["total_count"],
+        total_pages=paginated_transactions["total_pages"],
+        page=paginated_transactions["page"],
+        page_size=paginated_transactions["page_size"],
+        next_cursor=paginated_transactions["next_cursor"],
+    )
+
+
+@router.get(
+    "/dummy-bank/v1/accounts/{account_id}/balance",
+    response_model=BalanceResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the balance of Account at a point in time",
+)
+async def get_balance(
+    logger: LoggerDep,
+    account_repository: AccountRepositoryDep,
+    repository: TransactionsRepositoryDep,
+    account_id: UUID,
+    at: AwareDatetime,
+) -> BalanceResponse:
+    logger.info("retrieving balance", account_id=str(account_id), at=at.isoformat())
+
+    account = await account_repository.load_account_with_id(account_id)
+    if not account:
+        logger.info("account not found", account_id=account_id)
+        raise exceptions.NotFoundError("account not found")
+
+    if account.created_at is not None and at < account.created_at:
+        logger.info("account not open yet", account_id=account_id)
+        raise exceptions.InvalidRequestError("account was not open at this time")
+
+    balance = await repository.balance_at(account_id, at)
+    if balance is None:
+        logger.info("account not found", account_id=account_id)
+        raise exceptions.NotFoundError("account not found")
+
+    return BalanceResponse(account_id=account_id, at=at, balance=balance)
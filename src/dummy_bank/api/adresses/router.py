@@ -1,21 +1,30 @@
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 
 from dummy_bank.api import exceptions
+from dummy_bank.api.bulk_import import REQUEST_BODY, import_rows
 from dummy_bank.api.dependencies import (
     AddressesRepositoryDep,
     CustomerRepositoryDep,
     LoggerDep,
     SettingsDep,
+    UnitOfWorkDep,
 )
 from dummy_bank.domain import Address
-from dummy_bank.repository import SearchCondition
+from dummy_bank.repository import (
+    InvalidCursorError,
+    SearchCondition,
+    VersionConflictError,
+)
 
 from ..models import (
     AddressesQueryParam,
     AddressResponse,
     CreateAddress,
+    ImportAddress,
+    ImportQueryParams,
+    ImportResponse,
     PaginatedResponse,
     UpdateAddress,
 )
@@ -36,9 +45,18 @@ async def list_addresses(
 ) -> PaginatedResponse:
     logger.info("retrieving addresses")
 
-    paginated_addresses = await repository.load_paginated_addresses(
-        page_size=params.page_size, page=params.page, customer_id=params.customer_id
-    )
+    try:
+        paginated_addresses = await repository.load_paginated_addresses(
+            page_size=params.page_size,
+            page=params.page,
+            customer_id=params.customer_id,
+            cursor=params.cursor,
+            count=params.count,
+            search_condition=params.search_condition(),
+        )
+    except InvalidCursorError as e:
+        logger.info("invalid pagination cursor", cursor=params.cursor)
+        raise exceptions.InvalidRequestError(str(e))
 
     logger.info(
         "retrieved addresses",
@@ -57,8 +75,39 @@ async def list_addresses(
         total_pages=paginated_addresses["total_pages"],
         page=paginated_addresses["page"],
         page_size=paginated_addresses["page_size"],
+        next_cursor=paginated_addresses["next_cursor"],
+    )
+
+
+@router.post(
+    "/dummy-bank/v1/addresses/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Import addresses from NDJSON or CSV",
+    openapi_extra=REQUEST_BODY,
+)
+async def import_addresses(
+    logger: LoggerDep,
+    repository: AddressesRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
+    request: Request,
+    params: ImportQueryParams = Depends(),
+) -> ImportResponse:
+    logger.info("importing addresses", format=params.format)
+
+    report = await import_rows(
+        request.stream(),
+        params.format,
+        ImportAddress,
+        repository.import_addresses,
+        unit_of_work.commit,
     )
 
+    logger.info(
+        "imported addresses", imported=report.imported, rejected=report.rejected
+    )
+    return report
+
 
 @router.post(
     "/dummy-bank/v1/addresses",
@@ -71,6 +120,7 @@ async def create_address(
     settings: SettingsDep,
     customer_repository: CustomerRepositoryDep,
     addresses_repository: AddressesRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     body: CreateAddress,
 ) -> AddressResponse:
     existing_customer = await customer_repository.load_customer_with_id(
@@ -115,6 +165,7 @@ async def create_address(
         logger.error("error retrieving coordinates", error=str(e))
 
     await addresses_repository.save_address(address)
+    await unit_of_work.commit()
     logger.info("address created", address_id=str(address.id))
 
     return AddressResponse.model_validate(address)
@@ -131,6 +182,7 @@ async def update_address(
     settings: SettingsDep,
     address_id: UUID,
     addresses_repository: AddressesRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     body: UpdateAddress,
 ) -> AddressResponse:
     existing = await addresses_repository.load_address_with_id(id=address_id)
@@ -139,7 +191,15 @@ async def update_address(
         logger.info("address not found", address_id=str(address_id))
         raise exceptions.NotFoundError("address not found")
 
-    to_update = body.model_dump(exclude_unset=True)
+    if body.version is not None and body.version != existing.version:
+        logger.info(
+            "address version out of date",
+            address_id=str(address_id),
+            version=body.version,
+        )
+        raise exceptions.ConflictError("address has been changed since it was read")
+
+    to_update = body.model_dump(exclude_unset=True, exclude={"version"})
 
     if "building_name" in to_update:
         existing.building_name = to_update["building_name"]
@@ -174,5 +234,10 @@ async def update_address(
 
     logger.info("address updated", address_id=str(address_id), to_update=to_update)
 
-    await addresses_repository.save_address(existing)
+    try:
+        await addresses_repository.save_address(existing)
+    except VersionConflictError:
+        logger.info("address changed during update", address_id=str(address_id))
+        raise exceptions.ConflictError("address has been changed since it was read")
+    await unit_of_work.commit()
     return AddressResponse.model_validate(existing)
@@ -0,0 +1,180 @@
+import asyncio
+import csv
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+
+from dummy_bank.repository import ImportResult
+
+from .models import DataFormat, ImportResponse, RejectedRow
+
+# rows are inserted, and committed, this many at a time
+BATCH_SIZE = 5_000
+# the most rejects an import response lists, however many rows were rejected
+MAX_LISTED_REJECTS = 1_000
+# how many rows are parsed at a time while a batch is being inserted
+_YIELD_EVERY = 100
+
+# documents the body of the import endpoints, which is read as a stream rather
+# than declared as a parameter
+REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+async def import_rows(
+    chunks: AsyncIterator[bytes],
+    format: DataFormat,
+    row_model: type[BaseModel],
+    insert: Callable[[Sequence[dict[str, Any]]], Awaitable[ImportResult]],
+    commit: Callable[[], Awaitable[None]] | None = None,
+    batch_size: int = BATCH_SIZE,
+    max_listed_rejects: int | None = MAX_LISTED_REJECTS,
+) -> ImportResponse:
+    """
+    Import the ``format`` rows read from ``chunks``, one row per line and a header
+    line first for CSV. Rows are parsed and validated as ``row_model`` as they
+    arrive, and every ``batch_size`` valid rows are handed to ``insert`` and then
+    ``commit``, so memory use does not grow with the import and a failed import
+    can be run again from the start. Each batch is inserted while the next one is
+    parsed, so the import runs as fast as the slower of the two.
+
+    Rows that cannot be parsed, are invalid, repeat an id or conflict with an
+    existing row are rejected with their line number and the reason, which never
+    includes the values themselves.
+    """
+    imported = 0
+    rejected: list[RejectedRow] = []
+    n_rejected = 0
+    # valid rows waiting to be inserted, with their line numbers, by id
+    batch: dict[UUID, tuple[int, dict[str, Any]]] = {}
+    inserting: asyncio.Task[None] | None = None
+
+    def reject(line: int, id: UUID | None, reason: str) -> None:
+        nonlocal n_rejected
+        n_rejected += 1
+        if max_listed_rejects is None or len(rejected) < max_listed_rejects:
+            rejected.append(RejectedRow(line=line, id=id, reason=reason))
+
+    async def insert_batch(batch: dict[UUID, tuple[int, dict[str, Any]]]) -> None:
+        nonlocal imported
+        result = await insert([values for _, values in batch.values()])
+        if commit is not None:
+            await commit()
+
+        for id, (line, _) in batch.items():
+            if id in result.inserted:
+                imported += 1
+            elif id in result.missing_parent:
+                reject(line, id, "refers to a customer that does not exist")
+            else:
+                reject(line, id, "conflicts with an existing row")
+
+    try:
+        async for line, record in _records(chunks, format):
+            if isinstance(record, str):
+                reject(line, None, record)
+                continue
+
+            try:
+                if isinstance(record, bytes):
+                    values = row_model.model_validate_json(record).model_dump()
+                else:
+                    values = row_model.model_validate(record).model_dump()
+            except ValidationError as e:
+                reject(line, None, _describe(e))
+                continue
+
+            if values["id"] in batch:
+                reject(line, values["id"], "repeats the id of an earlier row")
+                continue
+
+            batch[values["id"]] = (line, values)
+            if len(batch) >= batch_size:
+                if inserting is not None:
+                    await inserting
+                inserting = asyncio.create_task(insert_batch(batch))
+                batch = {}
+            elif inserting is not None and len(batch) % _YIELD_EVERY == 0:
+                # parsing never waits on its own, so let the insert make progress
+                await asyncio.sleep(0)
+
+        if inserting is not None:
+            await inserting
+        if batch:
+            await insert_batch(batch)
+    finally:
+        if inserting is not None and not inserting.done():
+            inserting.cancel()
+
+    rejected.sort(key=lambda reject: reject.line)
+    return ImportResponse(imported=imported, rejected=n_rejected, rejects=rejected)
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    The lines of a byte stream. Splitting before decoding is safe for UTF-8,
+    which never has a newline byte inside another character.
+    """
+    pending = b""
+    async for chunk in chunks:
+        *complete, pending = (pending + chunk).split(b"\n")
+        for line in complete:
+            yield line
+    if pending:
+        yield pending
+
+
+async def _records(
+    chunks: AsyncIterator[bytes], format: DataFormat
+) -> AsyncIterator[tuple[int, bytes | dict[str, Any] | str]]:
+    """
+    The line number of each row read from ``chunks`` with the row itself, as a
+    JSON document or CSV fields, or why it could not be read. Blank lines are
+    skipped, and empty CSV fields are read as missing.
+    """
+    header: list[str] | None = None
+    line = 0
+    async for raw_line in _lines(chunks):
+        line += 1
+        if not raw_line.strip():
+            continue
+        if format is DataFormat.NDJSON:
+            # parsed together with validating it
+            yield line, raw_line
+            continue
+
+        try:
+            text = raw_line.decode().rstrip("\r")
+        except UnicodeDecodeError:
+            yield line, "is not valid UTF-8"
+            continue
+        try:
+            fields = next(csv.reader([text], strict=True))
+        except csv.Error as e:
+            yield line, f"is not valid CSV: {e}"
+            continue
+        if header is None:
+            header = fields
+        elif len(fields) != len(header):
+            yield line, f"has {len(fields)} fields rather than {len(header)}"
+        else:
+            yield (
+                line,
+                {name: value for name, value in zip(header, fields) if value != ""},
+            )
+
+
+def _describe(error: ValidationError) -> str:
+    reasons = []
+    for detail in error.errors(include_url=False, include_input=False):
+        location = ".".join(str(part) for part in detail["loc"])
+        reasons.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return "; ".join(reasons)
@@ -1,18 +1,37 @@
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
 
 from dummy_bank.api import exceptions
-from dummy_bank.api.dependencies import CustomerRepositoryDep, LoggerDep
+from dummy_bank.api.bulk_import import REQUEST_BODY, import_rows
+from dummy_bank.api.dependencies import (
+    CustomerRepositoryDep,
+    LoggerDep,
+    UnitOfWorkDep,
+)
+from dummy_bank.api.export import export_response
 from dummy_bank.api.models import (
+    AccountResponse,
+    AddressResponse,
     CreateCustomer,
+    CustomerOverviewResponse,
     CustomerResponse,
+    CustomerSearchQueryParams,
+    CustomersQueryParams,
+    ExportQueryParams,
+    ImportCustomer,
+    ImportQueryParams,
+    ImportResponse,
     PaginatedResponse,
-    PaginationQueryParams,
     UpdateCustomer,
 )
 from dummy_bank.domain import Customer
-from dummy_bank.repository import SearchCondition
+from dummy_bank.repository import (
+    InvalidCursorError,
+    SearchCondition,
+    VersionConflictError,
+)
 
 router = APIRouter(tags=["customers"])
 
@@ -26,13 +45,21 @@ router = APIRouter(tags=["customers"])
 async def list_customers(
     logger: LoggerDep,
     repository: CustomerRepositoryDep,
-    params: PaginationQueryParams = Depends(),
+    params: CustomersQueryParams = Depends(),
 ) -> PaginatedResponse:
     logger.info("retrieving customers")
 
-    paginated_customers = await repository.load_paginated_customers(
-        page_size=params.page_size, page=params.page
-    )
+    try:
+        paginated_customers = await repository.load_paginated_customers(
+            page_size=params.page_size,
+            page=params.page,
+            cursor=params.cursor,
+            count=params.count,
+            search_condition=params.search_condition(),
+        )
+    except InvalidCursorError as e:
+        logger.info("invalid pagination cursor", cursor=params.cursor)
+        raise exceptions.InvalidRequestError(str(e))
 
     logger.info(
         "retrieved customers",
@@ -51,9 +78,77 @@ async def list_customers(
         total_pages=paginated_customers["total_pages"],
         page=paginated_customers["page"],
         page_size=paginated_customers["page_size"],
+        next_cursor=paginated_customers["next_cursor"],
     )
 
 
+@router.get(
+    "/dummy-bank/v1/customers/search",
+    response_model=list[CustomerResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Search customers by name, email or phone",
+)
+async def search_customers(
+    logger: LoggerDep,
+    repository: CustomerRepositoryDep,
+    params: CustomerSearchQueryParams = Depends(),
+) -> list[CustomerResponse]:
+    customers = await repository.search_customers(params.q, limit=params.limit)
+
+    # the query itself is personal data, so only the number of matches is logged
+    logger.info("searched customers", n=len(customers))
+
+    return [CustomerResponse.model_validate(customer) for customer in customers]
+
+
+@router.get(
+    "/dummy-bank/v1/customers/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export every customer as NDJSON or CSV",
+)
+async def export_customers(
+    logger: LoggerDep,
+    repository: CustomerRepositoryDep,
+    params: ExportQueryParams = Depends(),
+) -> StreamingResponse:
+    logger.info("exporting customers", format=params.format)
+
+    return export_response(
+        repository.stream_customers(), CustomerResponse, params.format, "customers"
+    )
+
+
+@router.post(
+    "/dummy-bank/v1/customers/import",
+    response_model=ImportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Import customers from NDJSON or CSV",
+    openapi_extra=REQUEST_BODY,
+)
+async def import_customers(
+    logger: LoggerDep,
+    repository: CustomerRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
+    request: Request,
+    params: ImportQueryParams = Depends(),
+) -> ImportResponse:
+    logger.info("importing customers", format=params.format)
+
+    report = await import_rows(
+        request.stream(),
+        params.format,
+        ImportCustomer,
+        repository.import_customers,
+        unit_of_work.commit,
+    )
+
+    logger.info(
+        "imported customers", imported=report.imported, rejected=report.rejected
+    )
+    return report
+
+
 @router.get(
     "/dummy-bank/v1/customers/{customer_id}",
     response_model=CustomerResponse,
@@ -72,6 +167,36 @@ async def get_customer_by_id(
     return CustomerResponse.model_validate(customer)
 
 
+@router.get(
+    "/dummy-bank/v1/customers/{customer_id}/overview",
+    response_model=CustomerOverviewResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Retrieve a customer with their accounts and addresses",
+)
+async def get_customer_overview(
+    logger: LoggerDep, repository: CustomerRepositoryDep, customer_id: UUID
+) -> CustomerOverviewResponse:
+    overview = await repository.load_customer_overview(customer_id)
+
+    if not overview:
+        logger.info("customer not found", customer_id=str(customer_id))
+        raise exceptions.NotFoundError("customer not found")
+
+    customer, accounts, addresses = overview
+    logger.info(
+        "retrieved customer overview",
+        customer_id=str(customer_id),
+        n_accounts=len(accounts),
+        n_addresses=len(addresses),
+    )
+
+    return CustomerOverviewResponse(
+        customer=CustomerResponse.model_validate(customer),
+        accounts=[AccountResponse.model_validate(account) for account in accounts],
+        addresses=[AddressResponse.model_validate(address) for address in addresses],
+    )
+
+
 @router.post(
     "/dummy-bank/v1/customers",
     response_model=CustomerResponse,
@@ -79,15 +204,20 @@ async def get_customer_by_id(
     summary="Create Customer",
 )
 async def create_customer(
-    logger: LoggerDep, repository: CustomerRepositoryDep, body: CreateCustomer
+    logger: LoggerDep,
+    repository: CustomerRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
+    body: CreateCustomer,
 ) -> CustomerResponse:
-    existing_customer = await repository.load_customer(
-        SearchCondition(email=body.email)
-    )
+    # customers without an email have nothing to be duplicates of
+    if body.email is not None:
+        existing_customer = await repository.load_customer(
+            SearchCondition(email=body.email)
+        )
 
-    if existing_customer:
-        logger.info("customer already exists", customer_id=existing_customer.id)
-        raise exceptions.AlreadyExistsError("customer already exists")
+        if existing_customer:
+            logger.info("customer already exists", customer_id=existing_customer.id)
+            raise exceptions.AlreadyExistsError("customer already exists")
 
     customer = Customer(
         id=uuid4(),
@@ -100,6 +230,7 @@ async def create_customer(
         updated_at=None,
     )
     await repository.save_customer(customer)
+    await unit_of_work.commit()
     logger.info("customer created", customer_id=customer.id)
     return CustomerResponse.model_validate(customer)
 
@@ -113,6 +244,7 @@ async def create_customer(
 async def update_application(
     logger: LoggerDep,
     repository: CustomerRepositoryDep,
+    unit_of_work: UnitOfWorkDep,
     customer_id: UUID,
     body: UpdateCustomer,
 ) -> CustomerResponse:
@@ -122,7 +254,15 @@ async def update_application(
         logger.info("customer not find", customer_id=str(customer_id))
         raise exceptions.NotFoundError("customer not found")
 
-    to_update = body.model_dump(exclude_unset=True)
+    if body.version is not None and body.version != existing_customer.version:
+        logger.info(
+            "customer version out of date",
+            customer_id=str(customer_id),
+            version=body.version,
+        )
+        raise exceptions.ConflictError("customer has been changed since it was read")
+
+    to_update = body.model_dump(exclude_unset=True, exclude={"version"})
 
     if "first_name" in to_update:
         existing_customer.first_name = to_update["first_name"]
@@ -139,7 +279,12 @@ async def update_application(
     if "email" in to_update:
         existing_customer.email = to_update["email"]
 
-    await repository.save_customer(existing_customer)
+    try:
+        await repository.save_customer(existing_customer)
+    except VersionConflictError:
+        logger.info("customer changed during update", customer_id=str(customer_id))
+        raise exceptions.ConflictError("customer has been changed since it was read")
+    await unit_of_work.commit()
     logger.info(
         "customer updated", customer_id=str(existing_customer.id), to_update=to_update
     )
@@ -1,18 +1,20 @@
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Annotated
 
 import structlog
 from fastapi import Depends, Request
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from dummy_bank.repository import (
     AccountsRepository,
     AddressesRepository,
     CustomerRepository,
+    ReplicaSet,
     Repository,
+    TransactionsRepository,
+    UnitOfWork,
 )
 
-from .lock_manager import LockManager
 from .settings import Settings
 
 
@@ -28,39 +30,92 @@ def get_database_engine(request: Request) -> AsyncEngine:
     return request.state._database_engine
 
 
+def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    return request.state._session_factory
+
+
+def get_replicas(request: Request) -> ReplicaSet | None:
+    """
+    The read replicas, for requests that cannot write. Anything else reads from the
+    primary so a read that a later write depends on is never stale.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    return request.state._replicas
+
+
+async def get_unit_of_work(
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+) -> AsyncIterator[UnitOfWork]:
+    unit_of_work = UnitOfWork(session_factory)
+    try:
+        yield unit_of_work
+    finally:
+        await unit_of_work.close()
+
+
 def get_repository(
     engine: Annotated[AsyncEngine, Depends(get_database_engine)],
+    unit_of_work: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    replicas: Annotated[ReplicaSet | None, Depends(get_replicas)],
 ) -> Iterator[Repository]:
-    yield Repository(engine=engine)
+    yield Repository(engine=engine, unit_of_work=unit_of_work, replicas=replicas)
 
 
 def get_customer_repository(
     engine: Annotated[AsyncEngine, Depends(get_database_engine)],
+    unit_of_work: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    replicas: Annotated[ReplicaSet | None, Depends(get_replicas)],
 ) -> Iterator[CustomerRepository]:
-    yield CustomerRepository(engine=engine)
+    yield CustomerRepository(
+        engine=engine, unit_of_work=unit_of_work, replicas=replicas
+    )
 
 
 def get_account_repository(
     engine: Annotated[AsyncEngine, Depends(get_database_engine)],
+    unit_of_work: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    replicas: Annotated[ReplicaSet | None, Depends(get_replicas)],
 ) -> Iterator[AccountsRepository]:
-    yield AccountsRepository(engine=engine)
+    yield AccountsRepository(
+        engine=engine, unit_of_work=unit_of_work, replicas=replicas
+    )
 
 
 def get_address_repository(
     engine: Annotated[AsyncEngine, Depends(get_database_engine)],
+    unit_of_work: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    replicas: Annotated[ReplicaSet | None, Depends(get_replicas)],
 ) -> Iterator[AddressesRepository]:
-    yield AddressesRepository(engine=engine)
+    yield AddressesRepository(
+        engine=engine, unit_of_work=unit_of_work, replicas=replicas
+    )
 
 
-def get_lock_manager(request: Request) -> Settings:
-    return request.state._lock_manager
+def get_transactions_repository(
+    engine: Annotated[AsyncEngine, Depends(get_database_engine)],
+    unit_of_work: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+    replicas: Annotated[ReplicaSet | None, Depends(get_replicas)],
+) -> Iterator[TransactionsRepository]:
+    yield TransactionsRepository(
+        engine=engine, unit_of_work=unit_of_work, replicas=replicas
+    )
 
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 LoggerDep = Annotated[structlog.stdlib.BoundLogger, Depends(get_logger)]
 DatabaseEngineDep = Annotated[AsyncEngine, Depends(get_database_engine)]
+SessionFactoryDep = Annotated[
+    async_sessionmaker[AsyncSession], Depends(get_session_factory)
+]
+ReplicasDep = Annotated[ReplicaSet | None, Depends(get_replicas)]
+UnitOfWorkDep = Annotated[UnitOfWork, Depends(get_unit_of_work)]
 RepositoryDep = Annotated[Repository, Depends(get_repository)]
 CustomerRepositoryDep = Annotated[CustomerRepository, Depends(get_customer_repository)]
 AccountRepositoryDep = Annotated[AccountsRepository, Depends(get_account_repository)]
 AddressesRepositoryDep = Annotated[AddressesRepository, Depends(get_address_repository)]
-LockManagerDep = Annotated[LockManager, Depends(get_lock_manager)]
+TransactionsRepositoryDep = Annotated[
+    TransactionsRepository, Depends(get_transactions_repository)
+]
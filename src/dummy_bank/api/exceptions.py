@@ -12,3 +12,7 @@ class NotFoundError(ServiceError):
 
 class InvalidRequestError(ServiceError):
     pass
+
+
+class ConflictError(ServiceError):
+    pass
@@ -0,0 +1,50 @@
+import csv
+import io
+from typing import Any, AsyncIterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .models import DataFormat
+
+_MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv",
+}
+
+
+def export_response(
+    batches: AsyncIterator[Sequence[Any]],
+    response_model: type[BaseModel],
+    format: DataFormat,
+    name: str,
+) -> StreamingResponse:
+    """
+    Stream ``batches`` of domain objects as a ``format`` download, one row per
+    object shaped by ``response_model``. Each batch is written out as one chunk
+    before the next is read, so memory use does not grow with the export.
+    """
+
+    async def body() -> AsyncIterator[str]:
+        if format is DataFormat.CSV:
+            yield _csv_chunk([list(response_model.model_fields)])
+        async for batch in batches:
+            items = [response_model.model_validate(item) for item in batch]
+            if format is DataFormat.CSV:
+                yield _csv_chunk(
+                    [item.model_dump(mode="json").values() for item in items]
+                )
+            else:
+                yield "".join(f"{item.model_dump_json()}\n" for item in items)
+
+    return StreamingResponse(
+        body(),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+def _csv_chunk(rows: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
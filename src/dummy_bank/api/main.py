@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncIterator, TypedDict
@@ -6,7 +7,12 @@ import structlog
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from dummy_bank.api import exceptions
 from dummy_bank.api.accounts.router import router as accounts_router
@@ -14,35 +20,99 @@ from dummy_bank.api.adresses.router import router as address_router
 from dummy_bank.api.customers.router import router as customers_router
 from dummy_bank.api.exception_handlers import (
     handle_already_exists_error,
+    handle_conflict_error,
     handle_invalid_request_error,
     handle_not_found_error,
 )
-from dummy_bank.api.lock_manager import LockManager
+from dummy_bank.api.middleware import log_requests
 from dummy_bank.api.settings import Settings
+from dummy_bank.repository import ReplicaSet, Repository
+from dummy_bank.repository.pool import PoolMetrics, warm_pool
+from dummy_bank.repository.query_stats import QueryStats
+from dummy_bank.repository.slow_queries import SlowQueryLog
 
 
 class State(TypedDict):
     _logger: structlog.stdlib.BoundLogger
     _settings: Settings
     _database_engine: AsyncEngine
-    _lock_manager: LockManager
+    _session_factory: async_sessionmaker[AsyncSession]
+    _replicas: ReplicaSet | None
 
 
 def create_app(settings: Settings, logger: structlog.stdlib.BoundLogger) -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncIterator[State]:
-        engine = create_async_engine(settings.database_url())
+        engine = create_async_engine(
+            settings.database_url(), **settings.engine_options()
+        )
+        pool_metrics = PoolMetrics.attach(engine)
+        QueryStats.attach(engine)
+        slow_queries = None
+        if settings.DB_SLOW_QUERY_THRESHOLD > 0:
+            slow_queries = SlowQueryLog(settings.DB_SLOW_QUERY_THRESHOLD, logger)
+            slow_queries.attach(engine)
+        background = []
+
+        if settings.DB_POOL_PREWARM:
+            try:
+                await asyncio.wait_for(
+                    warm_pool(engine, settings.DB_POOL_SIZE),
+                    timeout=settings.DB_POOL_TIMEOUT,
+                )
+            except Exception as e:
+                # the pool still fills on demand, so start anyway
+                logger.warning("failed to warm database pool", error=str(e))
+
+        if settings.DB_POOL_METRICS_INTERVAL > 0:
+            background.extend(
+                asyncio.create_task(
+                    metrics.publish(logger, settings.DB_POOL_METRICS_INTERVAL)
+                )
+                for metrics in (pool_metrics, Repository.statements)
+            )
+
+        replicas = None
+        if settings.DB_REPLICA_HOSTS:
+            replica_engines = [
+                create_async_engine(url, **settings.engine_options())
+                for url in settings.replica_database_urls()
+            ]
+            for replica_engine in replica_engines:
+                QueryStats.attach(replica_engine)
+                if slow_queries is not None:
+                    slow_queries.attach(replica_engine)
+            replicas = ReplicaSet(
+                replica_engines,
+                max_lag=settings.DB_REPLICA_MAX_LAG,
+                logger=logger,
+            )
+            await replicas.check()
+            background.append(
+                asyncio.create_task(
+                    replicas.monitor(settings.DB_REPLICA_CHECK_INTERVAL)
+                )
+            )
+
         yield {
             "_logger": logger,
             "_settings": settings,
             "_database_engine": engine,
-            "_lock_manager": LockManager(),
+            "_session_factory": async_sessionmaker(engine, expire_on_commit=False),
+            "_replicas": replicas,
         }
         await settings.google_maps_client().client.aclose()
+        for task in background:
+            task.cancel()
+        if replicas is not None:
+            await replicas.dispose()
+        logger.info("database pool", **pool_metrics.stats())
         await engine.dispose()
+        logger.info("statement registry", **Repository.statements.stats())
 
     app = FastAPI(lifespan=lifespan)
 
+    app.middleware("http")(log_requests(logger, settings.DB_QUERY_BUDGET))
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -58,6 +128,7 @@ def create_app(settings: Settings, logger: structlog.stdlib.BoundLogger) -> Fast
     app.add_exception_handler(
         exceptions.InvalidRequestError, handle_invalid_request_error
     )
+    app.add_exception_handler(exceptions.ConflictError, handle_conflict_error)
     app.include_router(accounts_router)
     app.include_router(address_router)
     app.include_router(customers_router)
@@ -0,0 +1,62 @@
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import structlog
+from fastapi import Request, Response
+
+from dummy_bank.repository.query_stats import QueryStats
+
+Middleware = Callable[
+    [Request, Callable[[Request], Awaitable[Response]]], Awaitable[Response]
+]
+
+
+def log_requests(logger: structlog.stdlib.BoundLogger, query_budget: int) -> Middleware:
+    """
+    Log one line per request with the time it took and the statements it ran, as a
+    warning if it ran more than ``query_budget`` of them, which usually means a
+    query is being issued per row. The line is logged once the whole response body
+    has been sent.
+    """
+
+    async def middleware(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        start = time.perf_counter()
+        with QueryStats.track() as queries:
+            response = await call_next(request)
+
+        def log() -> None:
+            route = request.scope.get("route")
+            fields = {
+                "method": request.method,
+                "path": getattr(route, "path", request.url.path),
+                "status_code": response.status_code,
+                "duration": round(time.perf_counter() - start, 6),
+                **queries.stats(),
+            }
+            if query_budget and queries.count > query_budget:
+                logger.warning(
+                    "query budget exceeded", query_budget=query_budget, **fields
+                )
+            else:
+                logger.info("request", **fields)
+
+        body = getattr(response, "body_iterator", None)
+        if body is None:
+            log()
+            return response
+
+        async def body_then_log() -> AsyncIterator[Any]:
+            # a streamed body, such as an export, runs its statements while it is
+            # being sent, so only log once it has been
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                log()
+
+        setattr(response, "body_iterator", body_then_log())
+        return response
+
+    return middleware
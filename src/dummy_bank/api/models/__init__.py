@@ -4,15 +4,33 @@ from .payloads import (
     CreateAccount,
     CreateAddress,
     CreateCustomer,
+    ImportAccount,
+    ImportAddress,
+    ImportCustomer,
     UpdateAddress,
     UpdateCustomer,
 )
-from .queries import AccountsQueryParams, AddressesQueryParam, PaginationQueryParams
+from .queries import (
+    AccountsQueryParams,
+    AddressesQueryParam,
+    CustomerSearchQueryParams,
+    CustomersQueryParams,
+    DataFormat,
+    ExportQueryParams,
+    ImportQueryParams,
+    PaginationQueryParams,
+    TransactionsQueryParams,
+)
 from .responses import (
     AccountResponse,
     AddressResponse,
+    BalanceResponse,
+    CustomerOverviewResponse,
     CustomerResponse,
+    ImportResponse,
     PaginatedResponse,
+    RejectedRow,
+    TransactionResponse,
 )
 
 __all__ = [
@@ -21,13 +39,27 @@ __all__ = [
     "CreateAccount",
     "CreateAddress",
     "CreateCustomer",
+    "ImportAccount",
+    "ImportAddress",
+    "ImportCustomer",
     "UpdateAddress",
     "UpdateCustomer",
     "AccountsQueryParams",
     "AddressesQueryParam",
     "PaginationQueryParams",
+    "CustomersQueryParams",
+    "CustomerSearchQueryParams",
+    "DataFormat",
+    "ExportQueryParams",
+    "ImportQueryParams",
+    "TransactionsQueryParams",
     "AccountResponse",
     "AddressResponse",
+    "BalanceResponse",
     "CustomerResponse",
+    "CustomerOverviewResponse",
+    "ImportResponse",
     "PaginatedResponse",
+    "RejectedRow",
+    "TransactionResponse",
 ]
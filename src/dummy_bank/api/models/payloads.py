@@ -1,9 +1,18 @@
-from uuid import UUID
+import re
+from functools import lru_cache
+from typing import Annotated, Any
+from uuid import UUID, uuid4
 
+import email_validator
 from pydantic import (
+    AwareDatetime,
     BaseModel,
     EmailStr,
+    Field,
     NonNegativeFloat,
+    NonNegativeInt,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
 )
 
 
@@ -21,6 +30,8 @@ class UpdateCustomer(BaseModel):
     last_name: str | None = None
     email: EmailStr | None = None
     phone: str | None = None
+    # the version the update is based on, if it should fail once changed
+    version: int | None = None
 
 
 class CreateAccount(BaseModel):
@@ -46,6 +57,7 @@ class UpdateAddress(BaseModel):
     post_code: str | None = None
     county: str | None = None
     country: str | None = None
+    version: int | None = None
 
 
 class CreateAddress(BaseModel):
@@ -57,3 +69,69 @@ class CreateAddress(BaseModel):
     post_code: str
     county: str | None = None
     country: str
+
+
+# a lowercase ASCII local part, which email-validator accepts as it is whatever the
+# domain. Anything else, including the mailbox names it lowercases, is left to it.
+_PLAIN_LOCAL_PART = re.compile(r"[a-z0-9_+-]+(\.[a-z0-9_+-]+)*")
+_MAX_EMAIL_LENGTH = 254
+
+
+@lru_cache(maxsize=10_000)
+def _email_domain(domain: str) -> tuple[str, str] | None:
+    """The normalised and ASCII forms of a domain, or None if it is not valid."""
+    try:
+        validated = email_validator.validate_email(
+            f"a@{domain}", check_deliverability=False
+        )
+    except email_validator.EmailNotValidError:
+        return None
+    return validated.domain, validated.ascii_domain
+
+
+def _validate_email(value: Any, handler: ValidatorFunctionWrapHandler) -> str:
+    """
+    Validate an email as ``EmailStr`` does, which spends nearly all its time on the
+    domain, but check each domain only once.
+    """
+    if isinstance(value, str):
+        local, _, domain = value.rpartition("@")
+        if (
+            len(local) <= 64
+            and _PLAIN_LOCAL_PART.fullmatch(local)
+            and (domains := _email_domain(domain))
+        ):
+            email, ascii_email = (f"{local}@{domain}" for domain in domains)
+            if max(len(email.encode()), len(ascii_email)) <= _MAX_EMAIL_LENGTH:
+                return email
+    return handler(value)
+
+
+# ``EmailStr`` takes around 100µs an address, which alone would hold an import
+# to about 10k customers a second
+BulkEmailStr = Annotated[EmailStr, WrapValidator(_validate_email)]
+
+
+# rows of a bulk import, shaped like the rows of an export so one can be fed back
+# into the other. Rows without an id are given a new one.
+class ImportCustomer(CreateCustomer):
+    id: UUID = Field(default_factory=uuid4)
+    created_at: AwareDatetime | None = None
+    email: BulkEmailStr | None = None
+
+
+class ImportAccount(BaseModel):
+    id: UUID = Field(default_factory=uuid4)
+    customer_id: UUID
+    created_at: AwareDatetime | None = None
+    account_type: str
+    account_number: str
+    # in pence, as stored, rather than the pounds of ``CreateAccount``
+    account_balance: NonNegativeInt
+
+
+class ImportAddress(CreateAddress):
+    id: UUID = Field(default_factory=uuid4)
+    created_at: AwareDatetime | None = None
+    latitude: str | None = None
+    longitude: str | None = None
@@ -1,16 +1,96 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
 from uuid import UUID
 
 from fastapi import Query
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from dummy_bank.domain import TransactionKind
+from dummy_bank.repository import CountMode, SearchCondition, SortOrder
 
 
 class PaginationQueryParams(BaseModel):
     page: int = Field(Query(default=1, ge=1))
     page_size: int = Field(Query(default=50, ge=1, le=100))
+    cursor: str | None = Field(Query(default=None))
+    count: CountMode = Field(Query(default=CountMode.EXACT))
+    sort: SortOrder = Field(Query(default=SortOrder.OLDEST_FIRST))
+    created_after: datetime | None = Field(Query(default=None))
+    created_before: datetime | None = Field(Query(default=None))
+
+    def search_condition(self) -> SearchCondition:
+        """The filters and sort order to load the page with."""
+        filters = {
+            "created_after": self.created_after,
+            "created_before": self.created_before,
+            **self._filters(),
+        }
+        return SearchCondition(
+            sort=self.sort,
+            **{key: value for key, value in filters.items() if value is not None},
+        )
+
+    def _filters(self) -> dict[str, Any]:
+        return {}
+
+
+class CustomersQueryParams(PaginationQueryParams):
+    first_name_prefix: str | None = Field(Query(default=None, min_length=1))
+    last_name_prefix: str | None = Field(Query(default=None, min_length=1))
+    email_prefix: str | None = Field(Query(default=None, min_length=1))
+
+    def _filters(self) -> dict[str, Any]:
+        return {
+            "first_name_prefix": self.first_name_prefix,
+            "last_name_prefix": self.last_name_prefix,
+            "email_prefix": self.email_prefix,
+        }
+
+
+class DataFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportQueryParams(BaseModel):
+    format: DataFormat = Field(Query(default=DataFormat.NDJSON))
+
+
+class ImportQueryParams(BaseModel):
+    format: DataFormat = Field(Query(default=DataFormat.NDJSON))
+
+
+class CustomerSearchQueryParams(BaseModel):
+    # shorter terms have too few trigrams for the indexes to narrow the search
+    q: str = Field(Query(min_length=3, max_length=100))
+    limit: int = Field(Query(default=20, ge=1, le=100))
 
 
 class AccountsQueryParams(PaginationQueryParams):
     customer_id: UUID
+    account_type: list[str] | None = Field(Query(default=None))
+    min_balance: NonNegativeInt | None = Field(Query(default=None))
+    max_balance: NonNegativeInt | None = Field(Query(default=None))
+
+    def _filters(self) -> dict[str, Any]:
+        return {
+            "account_types": self.account_type,
+            "min_balance": self.min_balance,
+            "max_balance": self.max_balance,
+        }
+
+
+class AddressesQueryParam(PaginationQueryParams):
+    customer_id: UUID
+    post_code_prefix: str | None = Field(Query(default=None, min_length=1))
+
+    def _filters(self) -> dict[str, Any]:
+        return {"post_code_prefix": self.post_code_prefix}
+
 
+class TransactionsQueryParams(PaginationQueryParams):
+    kind: list[TransactionKind] | None = Field(Query(default=None))
 
-class AddressesQueryParam(AccountsQueryParams): ...
+    def _filters(self) -> dict[str, Any]:
+        return {"kinds": [kind.value for kind in self.kind] if self.kind else None}
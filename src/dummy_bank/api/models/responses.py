@@ -8,13 +8,16 @@ from pydantic import (
     NonNegativeInt,
 )
 
+from dummy_bank.domain import TransactionKind
+
 
 class PaginatedResponse[T](BaseModel):
     results: list[T]
     page: int
     page_size: int
-    total_count: int
-    total_pages: int
+    total_count: int | None
+    total_pages: int | None
+    next_cursor: str | None = None
 
 
 class AccountResponse(BaseModel):
@@ -24,11 +27,30 @@ class AccountResponse(BaseModel):
     customer_id: UUID
     created_at: datetime
     updated_at: datetime
+    version: int
     account_balance: NonNegativeInt
     account_type: str
     account_number: str
 
 
+class TransactionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    account_id: UUID
+    created_at: datetime
+    kind: TransactionKind
+    amount: int
+    balance_after: int
+    counterparty_account_id: UUID | None
+
+
+class BalanceResponse(BaseModel):
+    account_id: UUID
+    at: datetime
+    balance: int
+
+
 class AddressResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -36,6 +58,7 @@ class AddressResponse(BaseModel):
     customer_id: UUID
     created_at: datetime
     updated_at: datetime
+    version: int
     display_address: str
     building_name: str | None
     building_number: str
@@ -60,3 +83,23 @@ class CustomerResponse(BaseModel):
     phone: str | None
     created_at: datetime
     updated_at: datetime
+    version: int
+
+
+class CustomerOverviewResponse(BaseModel):
+    customer: CustomerResponse
+    accounts: list[AccountResponse]
+    addresses: list[AddressResponse]
+
+
+class RejectedRow(BaseModel):
+    line: int
+    id: UUID | None
+    reason: str
+
+
+class ImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    # only the first rejects are listed, see ``bulk_import.MAX_LISTED_REJECTS``
+    rejects: list[RejectedRow]
@@ -5,6 +5,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy import URL
 
 from dummy_bank.lib.geolocation_client import GoogleMapsClient
+from dummy_bank.repository.pool import TimedPool
 
 
 class Settings(BaseSettings):
@@ -26,19 +27,79 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_PORT: int
 
+    # compiled statements kept by SQLAlchemy per engine, and server side prepared
+    # statements kept by asyncpg per connection
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+
+    # connection pool of each engine. DB_POOL_SIZE connections are opened at startup
+    # and pool metrics and statement registry stats are logged every
+    # DB_POOL_METRICS_INTERVAL seconds, 0 to disable. Pinging on checkout costs a
+    # round trip per checkout, and recycling already replaces connections before
+    # idle timeouts close them, so it is off unless something between here and
+    # Postgres drops connections early.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_PREWARM: bool = True
+    DB_POOL_METRICS_INTERVAL: float = 60.0
+
+    # read replicas as "host" or "host:port", sharing the primary's credentials and
+    # database name. Replicas further behind than DB_REPLICA_MAX_LAG seconds are
+    # skipped until they catch up.
+    DB_REPLICA_HOSTS: list[str] = []
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+
+    # requests running more statements than this are logged as a warning, 0 to
+    # disable
+    DB_QUERY_BUDGET: int = 20
+    # statements slower than this many seconds are logged with their plan, once per
+    # statement, 0 to disable
+    DB_SLOW_QUERY_THRESHOLD: float = 0.5
+
     GOOGLE_API_KEY: str
     GOOGLE_API_URL: str
 
     __cached_google_maps_client: GoogleMapsClient | None = None
 
+    def engine_options(self) -> dict[str, Any]:
+        """Keyword arguments for ``create_async_engine``."""
+        return {
+            "poolclass": TimedPool,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "query_cache_size": self.DB_QUERY_CACHE_SIZE,
+        }
+
     def database_url(self) -> URL:
+        return self._database_url(self.DB_HOST, self.DB_PORT)
+
+    def replica_database_urls(self) -> list[URL]:
+        urls = []
+        for replica in self.DB_REPLICA_HOSTS:
+            host, _, port = replica.partition(":")
+            urls.append(self._database_url(host, int(port) if port else self.DB_PORT))
+        return urls
+
+    def _database_url(self, host: str, port: int) -> URL:
         return URL.create(
             "postgresql+asyncpg",
             username=self.DB_USER,
             password=self.DB_PASS,
-            host=self.DB_HOST,
-            port=self.DB_PORT,
+            host=host,
+            port=port,
             database=self.DB_NAME,
+            query={
+                "prepared_statement_cache_size": str(
+                    self.DB_PREPARED_STATEMENT_CACHE_SIZE
+                )
+            },
         )
 
     def google_maps_client(self) -> GoogleMapsClient:
@@ -1,5 +1,13 @@
+"""
+Domain objects validate their values when they are constructed. Rows read back
+from the database were validated when they were written, so each object's
+``from_record`` sets its attributes directly instead, as it runs for every row
+of every read.
+"""
+
 from .account import Account
 from .address import Address
 from .customer import Customer
+from .transaction import Transaction, TransactionKind
 
-__all__ = ["Customer", "Account", "Address"]
+__all__ = ["Customer", "Account", "Address", "Transaction", "TransactionKind"]
@@ -19,6 +19,7 @@ class Account:
         account_balance: NonNegativeFloat,
         customer_id: UUID,
         is_new: bool = True,
+        version: int | None = None,
     ) -> None:
         self._id = id
         self._created_at = created_at
@@ -28,10 +29,16 @@ class Account:
         self._customer_id = customer_id
         # if not new, the value will already be normalised in the db.
         self._account_balance = (
-            int((Decimal(account_balance) * 100).quantize(Decimal("1")))
-            if is_new
-            else account_balance
+            self.to_cents(account_balance) if is_new else account_balance
         )
+        # ``None`` until the account is first saved
+        self.version = version
+
+    @staticmethod
+    @validate_call
+    def to_cents(amount: NonNegativeFloat) -> int:
+        """Convert an amount in pounds to the whole pence balances are stored in."""
+        return int((Decimal(amount) * 100).quantize(Decimal("1")))
 
     @property
     def created_at(self) -> datetime | None:
@@ -66,11 +73,11 @@ class Account:
 
     @validate_call
     def increase_balance(self, amount: NonNegativeFloat) -> None:
-        self._account_balance += int((Decimal(amount) * 100).quantize(Decimal("1")))
+        self._account_balance += self.to_cents(amount)
 
     @validate_call
     def decrease_balance(self, amount: NonNegativeFloat) -> None:
-        cents = int((Decimal(amount) * 100).quantize(Decimal("1")))
+        cents = self.to_cents(amount)
         if self._account_balance < cents:
             raise ValueError("insufficient funds for this transaction")
 
@@ -78,13 +85,13 @@ class Account:
 
     @classmethod
     def from_record(cls, record: Any) -> Self:
-        return cls(
-            id=record.id,
-            customer_id=record.customer_id,
-            created_at=record.created_at,
-            updated_at=record.updated_at,
-            account_type=record.account_type,
-            account_number=record.account_number,
-            account_balance=record.account_balance,
-            is_new=False,
-        )
+        account = cls.__new__(cls)
+        account._id = record.id
+        account._created_at = record.created_at
+        account.updated_at = record.updated_at
+        account._account_type = record.account_type
+        account._account_number = record.account_number
+        account._customer_id = record.customer_id
+        account._account_balance = record.account_balance
+        account.version = record.version
+        return account
@@ -23,6 +23,7 @@ class Address:
         country: str,
         latitude: str | None,
         longitude: str | None,
+        version: int | None = None,
     ) -> None:
         self._id = id
         self._customer_id = customer_id
@@ -37,6 +38,8 @@ class Address:
         self.country = country
         self.latitude = latitude
         self.longitude = longitude
+        # ``None`` until the address is first saved
+        self.version = version
 
     @property
     def created_at(self) -> datetime | None:
@@ -72,18 +75,19 @@ class Address:
 
     @classmethod
     def from_record(cls, record: Any) -> Self:
-        return cls(
-            id=record.id,
-            customer_id=record.customer_id,
-            created_at=record.created_at,
-            updated_at=record.updated_at,
-            building_name=record.building_name,
-            building_number=record.building_number,
-            street=record.street,
-            post_code=record.post_code,
-            town=record.town,
-            county=record.county,
-            country=record.country,
-            latitude=record.latitude,
-            longitude=record.longitude,
-        )
+        address = cls.__new__(cls)
+        address._id = record.id
+        address._customer_id = record.customer_id
+        address._created_at = record.created_at
+        address.updated_at = record.updated_at
+        address.building_name = record.building_name
+        address.building_number = record.building_number
+        address.street = record.street
+        address.town = record.town
+        address.post_code = record.post_code
+        address.county = record.county
+        address.country = record.country
+        address.latitude = record.latitude
+        address.longitude = record.longitude
+        address.version = record.version
+        return address
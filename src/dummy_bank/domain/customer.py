@@ -18,6 +18,7 @@ class Customer:
         last_name: str | None,
         email: EmailStr | None,
         phone: str | None,
+        version: int | None = None,
     ) -> None:
         self._id = id
         self._created_at = created_at
@@ -27,6 +28,8 @@ class Customer:
         self.last_name = last_name
         self._email = email
         self.phone = phone
+        # the version of the stored row, ``None`` until the object is first saved
+        self.version = version
 
     @property
     def created_at(self) -> datetime | None:
@@ -64,13 +67,14 @@ class Customer:
 
     @classmethod
     def from_record(cls, record: Any) -> Self:
-        return cls(
-            id=record.id,
-            created_at=record.created_at,
-            updated_at=record.updated_at,
-            first_name=record.first_name,
-            middle_names=record.middle_names,
-            last_name=record.last_name,
-            email=record.email,
-            phone=record.phone,
-        )
+        customer = cls.__new__(cls)
+        customer._id = record.id
+        customer._created_at = record.created_at
+        customer.updated_at = record.updated_at
+        customer.first_name = record.first_name
+        customer.middle_names = record.middle_names
+        customer.last_name = record.last_name
+        customer._email = record.email
+        customer.phone = record.phone
+        customer.version = record.version
+        return customer
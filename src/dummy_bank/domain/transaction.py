@@ -0,0 +1,82 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Any, Self
+from uuid import UUID
+
+from pydantic import validate_call
+
+
+class TransactionKind(StrEnum):
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER_IN = "transfer_in"
+    TRANSFER_OUT = "transfer_out"
+
+
+class Transaction:
+    """
+    One entry of an account's ledger. ``amount`` is the signed change to the
+    balance in pence and ``balance_after`` the balance it left behind.
+
+    The ledger is append-only, so nothing about a transaction can be changed.
+    """
+
+    @validate_call
+    def __init__(
+        self,
+        *,
+        id: UUID,
+        account_id: UUID,
+        created_at: datetime,
+        kind: TransactionKind,
+        amount: int,
+        balance_after: int,
+        counterparty_account_id: UUID | None = None,
+    ) -> None:
+        self._id = id
+        self._account_id = account_id
+        self._created_at = created_at
+        self._kind = kind
+        self._amount = amount
+        self._balance_after = balance_after
+        self._counterparty_account_id = counterparty_account_id
+
+    @property
+    def id(self) -> UUID:
+        return self._id
+
+    @property
+    def account_id(self) -> UUID:
+        return self._account_id
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @property
+    def kind(self) -> TransactionKind:
+        return self._kind
+
+    @property
+    def amount(self) -> int:
+        return self._amount
+
+    @property
+    def balance_after(self) -> int:
+        return self._balance_after
+
+    @property
+    def counterparty_account_id(self) -> UUID | None:
+        return self._counterparty_account_id
+
+    @classmethod
+    def from_record(cls, record: Any) -> Self:
+        transaction = cls.__new__(cls)
+        transaction._id = record.id
+        transaction._account_id = record.account_id
+        transaction._created_at = record.created_at
+        transaction._kind = TransactionKind(record.kind)
+        transaction._amount = record.amount
+        transaction._balance_after = record.balance_after
+        transaction._counterparty_account_id = record.counterparty_account_id
+        return transaction
@@ -0,0 +1,194 @@
+"""
+Database maintenance commands, run on a schedule outside the API.
+
+    python -m dummy_bank.maintenance create-partitions --months-ahead 3
+    python -m dummy_bank.maintenance detach-partitions --before 2025-01-01
+    python -m dummy_bank.maintenance take-snapshots
+    python -m dummy_bank.maintenance backfill-balances --batch-size 10000
+    python -m dummy_bank.maintenance bulk-import customers customers.csv --format csv
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import AsyncIterator
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from dummy_bank.api.bulk_import import import_rows
+from dummy_bank.api.models import (
+    DataFormat,
+    ImportAccount,
+    ImportAddress,
+    ImportCustomer,
+)
+from dummy_bank.api.settings import Settings
+from dummy_bank.repository import (
+    WIDENED_BALANCES,
+    AccountsRepository,
+    AddressesRepository,
+    CustomerRepository,
+    TransactionsRepository,
+    backfill_wide_columns,
+)
+
+# what each table is imported as, and with, see ``bulk_import``
+_IMPORTS = {
+    "customers": (ImportCustomer, CustomerRepository, "import_customers"),
+    "accounts": (ImportAccount, AccountsRepository, "import_accounts"),
+    "addresses": (ImportAddress, AddressesRepository, "import_addresses"),
+}
+
+
+async def create_partitions(
+    engine: AsyncEngine, logger: structlog.stdlib.BoundLogger, args: argparse.Namespace
+) -> None:
+    created = await TransactionsRepository(engine).create_partitions(
+        months_ahead=args.months_ahead
+    )
+    logger.info(
+        "created ledger partitions",
+        partitions=[p.name for p in created] or None,
+        # rows written while no partition covered them, now moved into one
+        moved_from_default={p.name: n for p, n in created.items() if n} or None,
+    )
+
+
+async def detach_partitions(
+    engine: AsyncEngine, logger: structlog.stdlib.BoundLogger, args: argparse.Namespace
+) -> None:
+    detached = await TransactionsRepository(engine).detach_partitions(
+        before=args.before
+    )
+    logger.info(
+        "detached ledger partitions", partitions=[p.name for p in detached] or None
+    )
+
+
+async def take_snapshots(
+    engine: AsyncEngine, logger: structlog.stdlib.BoundLogger, args: argparse.Namespace
+) -> None:
+    at = datetime.combine(args.at, time(), tzinfo=timezone.utc)
+    written = await TransactionsRepository(engine).take_snapshots(at)
+    logger.info("took balance snapshots", at=at.isoformat(), accounts=written)
+
+
+async def backfill_balances(
+    engine: AsyncEngine, logger: structlog.stdlib.BoundLogger, args: argparse.Namespace
+) -> None:
+    for model in WIDENED_BALANCES:
+        copied = 0
+        async for batch in backfill_wide_columns(engine, model, args.batch_size):
+            copied += batch
+            logger.info(
+                "backfilling wide balances", table=model.__tablename__, rows=copied
+            )
+        logger.info("backfilled wide balances", table=model.__tablename__, rows=copied)
+
+
+async def _read(path: Path, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+async def bulk_import(
+    engine: AsyncEngine, logger: structlog.stdlib.BoundLogger, args: argparse.Namespace
+) -> None:
+    row_model, repository_class, method = _IMPORTS[args.table]
+    repository = repository_class(engine)
+    format = args.format or DataFormat(args.path.suffix.removeprefix("."))
+
+    report = await import_rows(
+        _read(args.path),
+        format,
+        row_model,
+        getattr(repository, method),
+        batch_size=args.batch_size,
+        max_listed_rejects=None,
+    )
+
+    for reject in report.rejects:
+        logger.info(
+            "rejected row",
+            line=reject.line,
+            id=str(reject.id) if reject.id else None,
+            reason=reject.reason,
+        )
+    logger.info(
+        "imported rows",
+        table=args.table,
+        imported=report.imported,
+        rejected=report.rejected,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m dummy_bank.maintenance")
+    commands = parser.add_subparsers(required=True)
+
+    create = commands.add_parser(
+        "create-partitions",
+        help="create ledger partitions for this month and the months ahead",
+    )
+    create.add_argument("--months-ahead", type=int, default=3)
+    create.set_defaults(command=create_partitions)
+
+    detach = commands.add_parser(
+        "detach-partitions",
+        help="detach ledger partitions that end on or before a date for archiving",
+    )
+    detach.add_argument("--before", type=date.fromisoformat, required=True)
+    detach.set_defaults(command=detach_partitions)
+
+    snapshots = commands.add_parser(
+        "take-snapshots",
+        help="checkpoint every account's balance at the start of a day (UTC)",
+    )
+    snapshots.add_argument(
+        "--at",
+        type=date.fromisoformat,
+        default=datetime.now(timezone.utc).date(),
+        help="the day to checkpoint, defaults to today",
+    )
+    snapshots.set_defaults(command=take_snapshots)
+
+    backfill = commands.add_parser(
+        "backfill-balances",
+        help="copy balances and amounts into their 64 bit columns before the swap",
+    )
+    backfill.add_argument("--batch-size", type=int, default=10_000)
+    backfill.set_defaults(command=backfill_balances)
+
+    importer = commands.add_parser(
+        "bulk-import",
+        help="insert the new customers, accounts or addresses in an NDJSON or CSV file",
+    )
+    importer.add_argument("table", choices=list(_IMPORTS))
+    importer.add_argument("path", type=Path)
+    importer.add_argument(
+        "--format",
+        type=DataFormat,
+        choices=list(DataFormat),
+        help="defaults to the file's extension",
+    )
+    importer.add_argument("--batch-size", type=int, default=5_000)
+    importer.set_defaults(command=bulk_import)
+
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> None:
+    settings = Settings()
+    logger = structlog.get_logger()
+    engine = create_async_engine(settings.database_url())
+    try:
+        await args.command(engine, logger, args)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,65 @@
+"""keyset pagination indexes
+
+Revision ID: 5b8c3f1e7a2d
+Revises: 2e71f412a558
+Create Date: 2026-10-16 09:12:44.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8c3f1e7a2d"
+down_revision: Union[str, None] = "2e71f412a558"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # built concurrently so existing tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customers_created_at_id",
+            "customers",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_accounts_customer_id_created_at_id",
+            "accounts",
+            ["customer_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_addresses_customer_id_created_at_id",
+            "addresses",
+            ["customer_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_addresses_customer_id_created_at_id",
+            table_name="addresses",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_accounts_customer_id_created_at_id",
+            table_name="accounts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_customers_created_at_id",
+            table_name="customers",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
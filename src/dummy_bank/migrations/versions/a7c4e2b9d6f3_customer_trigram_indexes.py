@@ -0,0 +1,51 @@
+"""customer trigram indexes
+
+Revision ID: a7c4e2b9d6f3
+Revises: f4b2d8e6a1c9
+Create Date: 2026-10-17 11:02:37.418205
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c4e2b9d6f3"
+down_revision: Union[str, None] = "f4b2d8e6a1c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = [
+    ("ix_customers_full_name_trgm", "(first_name || ' ' || last_name)"),
+    ("ix_customers_email_trgm", "email"),
+    ("ix_customers_phone_trgm", "phone"),
+]
+
+
+def upgrade() -> None:
+    op.execute("create extension if not exists pg_trgm")
+
+    # built concurrently so customers stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, expression in _INDEXES:
+            op.create_index(
+                name,
+                "customers",
+                [sa.text(f"{expression} gin_trgm_ops")],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name="customers",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,58 @@
+"""index audit
+
+Revision ID: b2d9f6a3c8e1
+Revises: a7c4e2b9d6f3
+Create Date: 2026-10-17 13:26:51.094317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d9f6a3c8e1"
+down_revision: Union[str, None] = "a7c4e2b9d6f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a failed concurrent build leaves an invalid index behind, which
+    # ``if_not_exists`` would then skip on the next attempt, so check first
+    if not op.get_context().as_sql:
+        duplicates = op.get_bind().scalar(
+            sa.text(
+                "select count(*) from ("
+                "select 1 from customers where email is not null "
+                "group by lower(email) having count(*) > 1"
+                ") as duplicates"
+            )
+        )
+        if duplicates:
+            raise RuntimeError(
+                f"{duplicates} emails are shared by customers that differ only in "
+                "case, merge them before building ix_customers_lower_email"
+            )
+
+    # built concurrently so customers stay writable while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customers_lower_email",
+            "customers",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_customers_lower_email",
+            table_name="customers",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,111 @@
+"""partition transactions by month
+
+Revision ID: c3e9f0a4b7d2
+Revises: 8d4a6c2f9b1e
+Create Date: 2026-10-16 16:41:09.214377
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e9f0a4b7d2"
+down_revision: Union[str, None] = "8d4a6c2f9b1e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    "id, account_id, created_at, kind, amount, balance_after, counterparty_account_id"
+)
+
+
+def _create_transactions_table(primary_key: list[str], **kwargs: str) -> None:
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("balance_after", sa.Integer(), nullable=False),
+        sa.Column("counterparty_account_id", sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **kwargs,
+    )
+    op.create_index(
+        "ix_transactions_account_id_created_at_id",
+        "transactions",
+        ["account_id", "created_at", "id"],
+    )
+
+
+def _move_aside_transactions_table(suffix: str) -> str:
+    old = f"transactions_{suffix}"
+    op.rename_table("transactions", old)
+    op.execute(f"alter table {old} rename constraint transactions_pkey to {old}_pkey")
+    op.execute(
+        f"alter index ix_transactions_account_id_created_at_id "
+        f"rename to ix_{old}_account_id_created_at_id"
+    )
+    return old
+
+
+def upgrade() -> None:
+    old = _move_aside_transactions_table("unpartitioned")
+    # the partition key has to be part of the primary key
+    _create_transactions_table(
+        ["id", "created_at"], postgresql_partition_by="RANGE (created_at)"
+    )
+
+    op.execute("create table transactions_default partition of transactions default")
+
+    # one partition per month from the oldest existing row to three months ahead,
+    # after which `python -m dummy_bank.maintenance create-partitions` keeps them
+    # coming. Bounds are in UTC.
+    op.execute(
+        f"""
+        do $$
+        declare
+            month timestamp;
+        begin
+            for month in
+                select generate_series(
+                    date_trunc(
+                        'month',
+                        coalesce(
+                            (select min(created_at) from {old}), now()
+                        ) at time zone 'utc'
+                    ),
+                    date_trunc('month', now() at time zone 'utc')
+                        + interval '3 months',
+                    interval '1 month'
+                )
+            loop
+                execute format(
+                    'create table %I partition of transactions '
+                    'for values from (%L) to (%L)',
+                    'transactions_y' || to_char(month, 'YYYY"m"MM'),
+                    month || '+00',
+                    (month + interval '1 month') || '+00'
+                );
+            end loop;
+        end
+        $$
+        """
+    )
+
+    op.execute(f"insert into transactions ({_COLUMNS}) select {_COLUMNS} from {old}")
+    op.drop_table(old)
+
+
+def downgrade() -> None:
+    old = _move_aside_transactions_table("partitioned")
+    _create_transactions_table(["id"])
+    op.execute(f"insert into transactions ({_COLUMNS}) select {_COLUMNS} from {old}")
+    # drops every partition along with it
+    op.drop_table(old)
@@ -0,0 +1,70 @@
+"""add wide balance columns
+
+Revision ID: c5e8a1f3b9d7
+Revises: b2d9f6a3c8e1
+Create Date: 2026-10-17 14:52:18.630471
+
+The first of three steps moving balances and amounts from 32 to 64 bit
+integers without rewriting the tables under an exclusive lock:
+
+1. this revision adds a nullable ``BIGINT`` copy of each column, which every
+   insert and update keeps in step from now on,
+2. ``python -m dummy_bank.maintenance backfill-balances`` copies the existing
+   rows over in small batches,
+3. revision d7a2c6e4f1b8 swaps the copies in for the originals.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e8a1f3b9d7"
+down_revision: Union[str, None] = "b2d9f6a3c8e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WIDENED = {
+    "accounts": ["account_balance"],
+    "balance_snapshots": ["balance"],
+    "transactions": ["amount", "balance_after"],
+}
+
+
+def upgrade() -> None:
+    # a nullable column without a default is only added to the catalog, but that
+    # still waits for an exclusive lock. Give up rather than queue every other
+    # query behind a long running transaction.
+    op.execute("set local lock_timeout = '5s'")
+
+    for table, columns in _WIDENED.items():
+        for column in columns:
+            op.add_column(table, sa.Column(f"{column}_wide", sa.BigInteger()))
+
+        copies = " ".join(f"new.{column}_wide := new.{column};" for column in columns)
+        op.execute(
+            f"""
+            create function {table}_write_wide_balances() returns trigger
+            language plpgsql as $$
+            begin
+                {copies}
+                return new;
+            end
+            $$
+            """
+        )
+        op.execute(
+            f"create trigger {table}_write_wide_balances "
+            f"before insert or update on {table} "
+            f"for each row execute function {table}_write_wide_balances()"
+        )
+
+
+def downgrade() -> None:
+    for table, columns in reversed(_WIDENED.items()):
+        op.execute(f"drop trigger {table}_write_wide_balances on {table}")
+        op.execute(f"drop function {table}_write_wide_balances()")
+        for column in columns:
+            op.drop_column(table, f"{column}_wide")
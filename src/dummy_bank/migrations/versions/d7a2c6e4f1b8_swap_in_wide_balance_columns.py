@@ -0,0 +1,90 @@
+"""swap in wide balance columns
+
+Revision ID: d7a2c6e4f1b8
+Revises: c5e8a1f3b9d7
+Create Date: 2026-10-17 15:07:44.215903
+
+The last step of the move to 64 bit balances, see c5e8a1f3b9d7. Run
+``python -m dummy_bank.maintenance backfill-balances`` first, otherwise this
+fails while validating that every row has been copied.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a2c6e4f1b8"
+down_revision: Union[str, None] = "c5e8a1f3b9d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WIDENED = {
+    "accounts": ["account_balance"],
+    "balance_snapshots": ["balance"],
+    "transactions": ["amount", "balance_after"],
+}
+
+
+def _not_null(table: str, column: str) -> str:
+    return f"{table}_{column}_wide_not_null"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("set lock_timeout = '5s'")
+
+        # a NOT VALID check only holds its exclusive lock for a moment, and
+        # validating it reads the table without blocking writes
+        for table, columns in _WIDENED.items():
+            for column in columns:
+                name = _not_null(table, column)
+                op.execute(f"alter table {table} drop constraint if exists {name}")
+                op.execute(
+                    f"alter table {table} add constraint {name} "
+                    f"check ({column}_wide is not null) not valid"
+                )
+                op.execute(f"alter table {table} validate constraint {name}")
+
+    # the validated checks let SET NOT NULL skip its scan, so from here on only
+    # the catalog changes and the exclusive locks are held for a moment
+    for table, columns in _WIDENED.items():
+        op.execute(f"drop trigger {table}_write_wide_balances on {table}")
+        op.execute(f"drop function {table}_write_wide_balances()")
+        for column in columns:
+            op.alter_column(table, f"{column}_wide", nullable=False)
+            op.drop_constraint(_not_null(table, column), table)
+            op.drop_column(table, column)
+            op.alter_column(table, f"{column}_wide", new_column_name=column)
+
+    op.execute("reset lock_timeout")
+
+
+def downgrade() -> None:
+    # rewrites the tables, and fails if a value no longer fits in 32 bits
+    for table, columns in reversed(_WIDENED.items()):
+        for column in columns:
+            op.alter_column(table, column, new_column_name=f"{column}_wide")
+            op.add_column(table, sa.Column(column, sa.Integer()))
+            op.execute(f"update {table} set {column} = {column}_wide")
+            op.alter_column(table, column, nullable=False)
+
+        copies = " ".join(f"new.{column}_wide := new.{column};" for column in columns)
+        op.execute(
+            f"""
+            create function {table}_write_wide_balances() returns trigger
+            language plpgsql as $$
+            begin
+                {copies}
+                return new;
+            end
+            $$
+            """
+        )
+        op.execute(
+            f"create trigger {table}_write_wide_balances "
+            f"before insert or update on {table} "
+            f"for each row execute function {table}_write_wide_balances()"
+        )
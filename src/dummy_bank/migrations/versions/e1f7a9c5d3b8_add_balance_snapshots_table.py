@@ -0,0 +1,33 @@
+"""add balance snapshots table
+
+Revision ID: e1f7a9c5d3b8
+Revises: c3e9f0a4b7d2
+Create Date: 2026-10-16 17:22:41.318560
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f7a9c5d3b8"
+down_revision: Union[str, None] = "c3e9f0a4b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "balance_snapshots",
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("account_id", "taken_at"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("balance_snapshots")
@@ -0,0 +1,41 @@
+"""row versions
+
+Revision ID: e3f9b7d1a5c2
+Revises: d7a2c6e4f1b8
+Create Date: 2026-10-17 18:06:41.203518
+
+Adds the ``version`` every write to a customer, account or address bumps, so a
+write based on an out of date copy of the row can be turned away.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f9b7d1a5c2"
+down_revision: Union[str, None] = "d7a2c6e4f1b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("customers", "accounts", "addresses")
+
+
+def upgrade() -> None:
+    # with a constant default the existing rows are not rewritten, the column is
+    # only added to the catalog. That still waits for an exclusive lock, so give
+    # up rather than queue every other query behind a long running transaction.
+    op.execute("set local lock_timeout = '5s'")
+
+    for table in _TABLES:
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        op.drop_column(table, "version")
@@ -0,0 +1,49 @@
+"""prefix search indexes
+
+Revision ID: f4b2d8e6a1c9
+Revises: e1f7a9c5d3b8
+Create Date: 2026-10-17 09:41:05.772913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4b2d8e6a1c9"
+down_revision: Union[str, None] = "e1f7a9c5d3b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = [
+    ("ix_customers_lower_first_name_pattern", "customers", "first_name"),
+    ("ix_customers_lower_last_name_pattern", "customers", "last_name"),
+    ("ix_customers_lower_email_pattern", "customers", "email"),
+    ("ix_addresses_lower_post_code_pattern", "addresses", "post_code"),
+]
+
+
+def upgrade() -> None:
+    # built concurrently so existing tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, column in _INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(f"lower({column}) text_pattern_ops")],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,65 @@
+"""restrict ledger account deletes
+
+Revision ID: f8c1d4a7e2b6
+Revises: e3f9b7d1a5c2
+Create Date: 2026-10-18 09:12:37.518204
+
+Deleting an account used to cascade to its ledger entries, which the ledger being
+append-only rules out. An account with entries can no longer be deleted.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f8c1d4a7e2b6"
+down_revision: Union[str, None] = "e3f9b7d1a5c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_account_foreign_key(on_delete: str) -> None:
+    # a foreign key on a partitioned table cannot be added NOT VALID, so adding it
+    # checks every ledger entry while holding a lock that blocks writes to it
+    op.execute("set local lock_timeout = '5s'")
+
+    # the constraint was named by Postgres, and the table has been recreated once
+    # to partition it, so look the name up rather than assume it
+    op.execute(
+        """
+        do $$
+        declare
+            name text;
+        begin
+            for name in
+                select conname from pg_constraint
+                where conrelid = 'transactions'::regclass
+                    and confrelid = 'accounts'::regclass
+                    and contype = 'f'
+            loop
+                execute format(
+                    'alter table transactions drop constraint %I', name
+                );
+            end loop;
+        end
+        $$
+        """
+    )
+    op.create_foreign_key(
+        "transactions_account_id_fkey",
+        "transactions",
+        "accounts",
+        ["account_id"],
+        ["id"],
+        ondelete=on_delete,
+    )
+
+
+def upgrade() -> None:
+    _replace_account_foreign_key("RESTRICT")
+
+
+def downgrade() -> None:
+    _replace_account_foreign_key("CASCADE")
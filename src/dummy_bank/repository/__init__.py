@@ -1,20 +1,41 @@
 from .accounts_repository import AccountsRepository
 from .addresses_repository import AddressesRepository
+from .backfill import WIDENED_BALANCES, backfill_wide_columns
+from .count_mode import CountMode
+from .cursor import InvalidCursorError
 from .customer_repository import CustomerRepository
 from .db_account import DBAccount
 from .db_address import DBAddress
+from .db_balance_snapshot import DBBalanceSnapshot
 from .db_customer import Base, DBCustomer
-from .repository import Repository
-from .search_condition import SearchCondition
+from .db_transaction import DBTransaction
+from .replicas import ReplicaSet
+from .repository import ImportResult, Repository, VersionConflictError
+from .search_condition import SearchCondition, SortOrder
+from .transactions_repository import LedgerPartition, TransactionsRepository
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "Base",
     "CustomerRepository",
     "Repository",
+    "ImportResult",
+    "VersionConflictError",
     "SearchCondition",
+    "SortOrder",
     "AccountsRepository",
     "DBCustomer",
     "DBAccount",
     "AddressesRepository",
     "DBAddress",
+    "UnitOfWork",
+    "CountMode",
+    "InvalidCursorError",
+    "ReplicaSet",
+    "DBTransaction",
+    "TransactionsRepository",
+    "LedgerPartition",
+    "DBBalanceSnapshot",
+    "WIDENED_BALANCES",
+    "backfill_wide_columns",
 ]
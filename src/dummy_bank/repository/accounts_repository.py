@@ -1,47 +1,305 @@
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator, Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    CTE,
+    BindParameter,
+    ColumnElement,
+    Select,
+    Uuid,
+    any_,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
-from dummy_bank.domain import Account
+from dummy_bank.domain import Account, TransactionKind
 
+from .count_mode import CountMode
 from .db_account import DBAccount
-from .repository import Repository
+from .db_transaction import DBTransaction
+from .repository import ImportResult, Repository
 from .search_condition import SearchCondition
 
 
 class AccountsRepository(Repository):
+    @staticmethod
+    def _as_values(account: Account, now: datetime) -> dict[str, Any]:
+        return {
+            "id": account.id,
+            "customer_id": account.customer_id,
+            "created_at": account.created_at or now,
+            "updated_at": now,
+            "account_type": account.account_type,
+            "account_number": account.account_number,
+            "account_balance": account.account_balance,
+            "version": (account.version or 0) + 1,
+        }
+
     async def save_account(self, account: Account) -> None:
         now = datetime.now(timezone.utc)
-        account.updated_at = now
-
-        try:
-            account.created_at = now
-        except AttributeError:
-            pass
-
-        record = DBAccount(
-            id=account.id,
-            customer_id=account.customer_id,
-            created_at=account.created_at,
-            updated_at=account.updated_at,
-            account_type=account.account_type,
-            account_number=account.account_number,
-            account_balance=account.account_balance,
+
+        created_at, updated_at, version = await self._upsert(
+            DBAccount, **self._as_values(account, now)
+        )
+
+        account.updated_at = updated_at
+        account.version = version
+        if account.created_at is None:
+            account.created_at = created_at
+
+    async def save_accounts(self, accounts: Iterable[Account]) -> None:
+        """
+        Save many accounts with a single commit, see ``Repository._upsert_many``.
+        """
+        now = datetime.now(timezone.utc)
+        accounts = list(accounts)
+
+        stored = await self._upsert_many(
+            DBAccount, [self._as_values(account, now) for account in accounts]
         )
 
+        for account in accounts:
+            created_at, updated_at, version = stored[account.id]
+            account.updated_at = updated_at
+            account.version = version
+            if account.created_at is None:
+                account.created_at = created_at
+
+    async def import_accounts(self, rows: Sequence[dict[str, Any]]) -> ImportResult:
+        """
+        Insert already validated rows of account columns that do not exist yet,
+        see ``Repository._copy_insert``.
+        """
+        return await self._copy_insert(DBAccount, rows)
+
+    async def increase_balance(self, id: UUID, amount: int) -> Account | None:
+        """
+        Add ``amount`` pence to the balance of account ``id`` in a single ``UPDATE``
+        and return the updated account, or ``None`` if it does not exist.
+
+        The new balance is computed by the database from the stored one, so
+        concurrent changes from any number of workers never overwrite each other.
+        """
+        return await self._change_balance(id, amount, decrease=False)
+
+    async def decrease_balance(self, id: UUID, amount: int) -> Account | None:
+        """
+        Take ``amount`` pence from the balance of account ``id`` in a single
+        ``UPDATE``, see ``increase_balance``. The update only applies if the balance
+        covers ``amount``, otherwise a ``ValueError`` is raised.
+        """
+        return await self._change_balance(id, amount, decrease=True)
+
+    async def _change_balance(
+        self, id: UUID, amount: int, decrease: bool
+    ) -> Account | None:
+        stmt = self._change_balance_statement(decrease)
+        params = {"id": id, "amount": amount, "now": datetime.now(timezone.utc)}
+
         async with self._session() as session:
-            await session.merge(record)
-            await session.commit()
+            record = (await session.execute(stmt, params)).one_or_none()
+
+            if record is None and decrease:
+                # tell a missing account apart from one that cannot cover the amount
+                exists = await session.execute(
+                    self._select_statement(DBAccount, {"id": id}), {"id": id}
+                )
+                if exists.first() is not None:
+                    raise ValueError("insufficient funds for this transaction")
+
+            await self._commit(session)
+
+        return Account.from_record(record) if record is not None else None
+
+    @classmethod
+    def _change_balance_statement(cls, decrease: bool) -> Select[Any]:
+        def build() -> Select[Any]:
+            table = DBAccount.__table__
+            amount = cls._amount_param()
+
+            stmt = update(table).where(table.c.id == bindparam("id", type_=Uuid))
+            if decrease:
+                stmt = stmt.where(table.c.account_balance >= amount).values(
+                    account_balance=table.c.account_balance - amount
+                )
+            else:
+                stmt = stmt.values(account_balance=table.c.account_balance + amount)
+
+            updated = (
+                stmt.values(updated_at=cls._now_param(), version=table.c.version + 1)
+                .returning(*table.c)
+                .cte("updated")
+            )
+            kind = TransactionKind.WITHDRAWAL if decrease else TransactionKind.DEPOSIT
+            return cls._with_ledger_entries(
+                updated,
+                kind=literal(kind.value),
+                amount=-amount if decrease else amount,
+                counterparty_account_id=cast(null(), Uuid),
+            )
+
+        return cls.statements.get(
+            ("change_balance", DBAccount.__tablename__, decrease), build
+        )
+
+    @staticmethod
+    def _amount_param() -> BindParameter[int]:
+        return bindparam("amount", type_=DBAccount.__table__.c.account_balance.type)
+
+    @staticmethod
+    def _now_param() -> BindParameter[datetime]:
+        return bindparam("now", type_=DBAccount.__table__.c.updated_at.type)
+
+    @classmethod
+    def _with_ledger_entries(
+        cls,
+        updated: CTE,
+        kind: ColumnElement[str],
+        amount: ColumnElement[int],
+        counterparty_account_id: ColumnElement[Any],
+    ) -> Select[Any]:
+        """
+        Select the accounts changed by the ``updated`` balance ``UPDATE ...
+        RETURNING``, appending a ledger entry for each of them on the way. The
+        balance change and its ledger entries are written by one statement, so
+        they commit together and cost no extra round trip.
+
+        ``kind``, ``amount`` and ``counterparty_account_id`` may refer to the
+        columns of ``updated``.
+        """
+        ledger = DBTransaction.__table__
+        entries = insert(ledger).from_select(
+            [
+                ledger.c.id,
+                ledger.c.account_id,
+                ledger.c.created_at,
+                ledger.c.kind,
+                ledger.c.amount,
+                ledger.c.balance_after,
+                ledger.c.counterparty_account_id,
+            ],
+            select(
+                func.gen_random_uuid(),
+                updated.c.id,
+                updated.c.updated_at,
+                kind,
+                amount,
+                updated.c.account_balance,
+                counterparty_account_id,
+            ),
+        )
+        return select(updated).add_cte(entries.cte("ledger_entries"))
+
+    async def transfer(
+        self, from_id: UUID, to_id: UUID, amount: int
+    ) -> tuple[Account, Account] | None:
+        """
+        Move ``amount`` pence from account ``from_id`` to account ``to_id`` and
+        return both updated accounts, or ``None`` if either does not exist. A
+        ``ValueError`` is raised if the source balance does not cover ``amount``.
+
+        Both rows are locked with ``SELECT ... FOR UPDATE`` in id order, so two
+        transfers between the same accounts in opposite directions queue behind
+        each other rather than deadlock. Both legs are then applied by one
+        ``UPDATE`` and committed together.
+        """
+        if from_id == to_id:
+            raise ValueError("cannot transfer to the same account")
+
+        ids = {"ids": [from_id, to_id]}
+
+        async with self._session() as session:
+            locked = {
+                record.id: record
+                for record in await session.execute(
+                    self._select_for_update_statement(), ids
+                )
+            }
+            if len(locked) != 2:
+                return None
+
+            if locked[from_id].account_balance < amount:
+                raise ValueError("insufficient funds for this transaction")
+
+            updated = {
+                record.id: Account.from_record(record)
+                for record in await session.execute(
+                    self._transfer_statement(),
+                    {
+                        **ids,
+                        "from_id": from_id,
+                        "to_id": to_id,
+                        "amount": amount,
+                        "now": datetime.now(timezone.utc),
+                    },
+                )
+            }
+            await self._commit(session)
+
+        return updated[from_id], updated[to_id]
+
+    @classmethod
+    def _select_for_update_statement(cls) -> Select[Any]:
+        table = DBAccount.__table__
+        return cls.statements.get(
+            ("select_for_update", DBAccount.__tablename__),
+            lambda: (
+                cls._select_with_ids_statement(DBAccount)
+                .order_by(table.c.id)
+                .with_for_update()
+            ),
+        )
+
+    @classmethod
+    def _transfer_statement(cls) -> Select[Any]:
+        def build() -> Select[Any]:
+            table = DBAccount.__table__
+            amount = cls._amount_param()
+            from_id = bindparam("from_id", type_=Uuid)
+            to_id = bindparam("to_id", type_=Uuid)
+
+            updated = (
+                update(table)
+                .where(table.c.id == any_(bindparam("ids", type_=ARRAY(Uuid))))
+                .values(
+                    account_balance=table.c.account_balance
+                    + case((table.c.id == to_id, amount), else_=-amount),
+                    updated_at=cls._now_param(),
+                    version=table.c.version + 1,
+                )
+                .returning(*table.c)
+                .cte("updated")
+            )
+            is_target = updated.c.id == to_id
+            return cls._with_ledger_entries(
+                updated,
+                kind=case(
+                    (is_target, TransactionKind.TRANSFER_IN.value),
+                    else_=TransactionKind.TRANSFER_OUT.value,
+                ),
+                amount=case((is_target, amount), else_=-amount),
+                counterparty_account_id=case((is_target, from_id), else_=to_id),
+            )
+
+        return cls.statements.get(("transfer", DBAccount.__tablename__), build)
 
     async def load_account(
         self, search_condition: SearchCondition
     ) -> list[Account] | None:
-        stmt = select(DBAccount).filter_by(**search_condition.as_filter_by_kwargs())
+        filters = search_condition.as_filter_by_kwargs()
+        stmt = self._select_statement(DBAccount, filters)
 
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        async with self._session(read_only=True) as session:
+            results = (await session.execute(stmt, self._filter_params(filters))).all()
 
         if not results:
             return None
@@ -59,27 +317,44 @@ class AccountsRepository(Repository):
         condition = SearchCondition(customer_id=customer_id)
         return await self.load_account(search_condition=condition)
 
+    async def stream_accounts(
+        self, batch_size: int = 1_000
+    ) -> AsyncIterator[list[Account]]:
+        """Yield every account in batches of ``batch_size``, see ``_stream``."""
+        async for rows in self._stream(DBAccount, batch_size):
+            yield [Account.from_record(record) for record in rows]
+
     async def load_paginated_accounts(
-        self, page: int, page_size: int, customer_id: UUID
+        self,
+        page: int,
+        page_size: int,
+        customer_id: UUID,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        search_condition: SearchCondition | None = None,
     ) -> dict[str, Any]:
-        offset = (page - 1) * page_size
-        count = await self.get_count(DBAccount, customer_id=customer_id)
-        total_pages = (count + page_size - 1) // page_size
-
-        stmt = (
-            select(DBAccount)
-            .filter_by(customer_id=customer_id)
-            .limit(page_size)
-            .offset(offset)
+        search_condition = search_condition or SearchCondition()
+        results, total_count, next_cursor = await self._load_page(
+            DBAccount,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+            sort=search_condition.sort,
+            **{**search_condition.as_filter_by_kwargs(), "customer_id": customer_id},
         )
 
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        total_pages = (
+            (total_count + page_size - 1) // page_size
+            if total_count is not None
+            else None
+        )
 
         return {
             "results": [Account.from_record(record) for record in results],
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
-            "total_count": count,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
         }
@@ -1,53 +1,80 @@
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
-
 from dummy_bank.domain import Address
 
+from .count_mode import CountMode
 from .db_address import DBAddress
-from .repository import Repository
+from .repository import ImportResult, Repository
 from .search_condition import SearchCondition
 
 
 class AddressesRepository(Repository):
+    @staticmethod
+    def _as_values(address: Address, now: datetime) -> dict[str, Any]:
+        return {
+            "id": address.id,
+            "customer_id": address.customer_id,
+            "created_at": address.created_at or now,
+            "updated_at": now,
+            "building_name": address.building_name,
+            "building_number": address.building_number,
+            "street": address.street,
+            "town": address.town,
+            "post_code": address.post_code,
+            "county": address.county,
+            "country": address.country,
+            "latitude": address.latitude,
+            "longitude": address.longitude,
+            "version": (address.version or 0) + 1,
+        }
+
     async def save_address(self, address: Address) -> None:
         now = datetime.now(timezone.utc)
-        address.updated_at = now
-
-        try:
-            address.created_at = now
-        except AttributeError:
-            pass
-
-        record = DBAddress(
-            id=address.id,
-            customer_id=address.customer_id,
-            created_at=address.created_at,
-            updated_at=address.updated_at,
-            building_name=address.building_name,
-            building_number=address.building_number,
-            street=address.street,
-            town=address.town,
-            post_code=address.post_code,
-            county=address.county,
-            country=address.country,
-            latitude=address.latitude,
-            longitude=address.longitude,
+
+        created_at, updated_at, version = await self._upsert(
+            DBAddress, **self._as_values(address, now)
+        )
+
+        address.updated_at = updated_at
+        address.version = version
+        if address.created_at is None:
+            address.created_at = created_at
+
+    async def save_addresses(self, addresses: Iterable[Address]) -> None:
+        """
+        Save many addresses with a single commit, see ``Repository._upsert_many``.
+        """
+        now = datetime.now(timezone.utc)
+        addresses = list(addresses)
+
+        stored = await self._upsert_many(
+            DBAddress, [self._as_values(address, now) for address in addresses]
         )
 
-        async with self._session() as session:
-            await session.merge(record)
-            await session.commit()
+        for address in addresses:
+            created_at, updated_at, version = stored[address.id]
+            address.updated_at = updated_at
+            address.version = version
+            if address.created_at is None:
+                address.created_at = created_at
+
+    async def import_addresses(self, rows: Sequence[dict[str, Any]]) -> ImportResult:
+        """
+        Insert already validated rows of address columns that do not exist yet,
+        see ``Repository._copy_insert``.
+        """
+        return await self._copy_insert(DBAddress, rows)
 
     async def load_address(
         self, search_condition: SearchCondition
     ) -> list[Address] | None:
-        stmt = select(DBAddress).filter_by(**search_condition.as_filter_by_kwargs())
+        filters = search_condition.as_filter_by_kwargs()
+        stmt = self._select_statement(DBAddress, filters)
 
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        async with self._session(read_only=True) as session:
+            results = (await session.execute(stmt, self._filter_params(filters))).all()
 
         if not results:
             return None
@@ -66,26 +93,36 @@ class AddressesRepository(Repository):
         return await self.load_address(search_condition=condition)
 
     async def load_paginated_addresses(
-        self, page: int, page_size: int, customer_id: UUID
+        self,
+        page: int,
+        page_size: int,
+        customer_id: UUID,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        search_condition: SearchCondition | None = None,
     ) -> dict[str, Any]:
-        offset = (page - 1) * page_size
-        count = await self.get_count(DBAddress, customer_id=customer_id)
-        total_pages = (count + page_size - 1) // page_size
-
-        stmt = (
-            select(DBAddress)
-            .filter_by(customer_id=customer_id)
-            .limit(page_size)
-            .offset(offset)
+        search_condition = search_condition or SearchCondition()
+        results, total_count, next_cursor = await self._load_page(
+            DBAddress,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+            sort=search_condition.sort,
+            **{**search_condition.as_filter_by_kwargs(), "customer_id": customer_id},
         )
 
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        total_pages = (
+            (total_count + page_size - 1) // page_size
+            if total_count is not None
+            else None
+        )
 
         return {
             "results": [Address.from_record(record) for record in results],
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
-            "total_count": count,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
         }
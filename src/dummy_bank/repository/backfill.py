@@ -0,0 +1,106 @@
+from typing import Any, AsyncIterator
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Select,
+    bindparam,
+    column,
+    func,
+    or_,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .db_account import DBAccount
+from .db_balance_snapshot import DBBalanceSnapshot
+from .db_transaction import DBTransaction
+
+# the columns moving from 32 to 64 bit integers. Migration c5e8a1f3b9d7 gives each
+# one a ``<column>_wide`` copy that every write fills in, and d7a2c6e4f1b8 swaps
+# the copies in once ``backfill_wide_columns`` has filled in the existing rows.
+WIDENED_BALANCES: dict[Any, tuple[str, ...]] = {
+    DBAccount: ("account_balance",),
+    DBBalanceSnapshot: ("balance",),
+    DBTransaction: ("amount", "balance_after"),
+}
+
+
+def _backfill_statement(
+    model: Any, columns: tuple[str, ...], after_key: bool
+) -> Select[Any]:
+    """
+    Copy ``columns`` into their wide columns for the next ``batch_size`` rows in
+    primary key order, starting after the ``after_<key>`` parameters if
+    ``after_key``. Selects the last key of the batch and how many rows needed
+    copying, or nothing once every row has been visited.
+    """
+    source = model.__table__
+    keys = [key.name for key in source.primary_key]
+    target = table(
+        source.name,
+        *(column(key, source.c[key].type) for key in keys),
+        *(column(name, BigInteger) for name in columns),
+        *(column(f"{name}_wide", BigInteger) for name in columns),
+    )
+
+    batch = (
+        select(*(target.c[key] for key in keys))
+        .order_by(*(target.c[key] for key in keys))
+        .limit(bindparam("batch_size", type_=Integer))
+    )
+    if after_key:
+        batch = batch.where(
+            tuple_(*(target.c[key] for key in keys))
+            > tuple_(
+                *(bindparam(f"after_{key}", type_=source.c[key].type) for key in keys)
+            )
+        )
+    batch_cte = batch.cte("batch")
+
+    copied = (
+        update(target)
+        .values({f"{name}_wide": target.c[name] for name in columns})
+        .where(
+            *(target.c[key] == batch_cte.c[key] for key in keys),
+            or_(*(target.c[f"{name}_wide"].is_(None) for name in columns)),
+        )
+        .returning(target.c[keys[0]])
+        .cte("copied")
+    )
+    return (
+        select(
+            *(batch_cte.c[key] for key in keys),
+            select(func.count()).select_from(copied).scalar_subquery().label("copied"),
+        )
+        .order_by(*(batch_cte.c[key].desc() for key in keys))
+        .limit(1)
+    )
+
+
+async def backfill_wide_columns(
+    engine: AsyncEngine, model: Any, batch_size: int = 10_000
+) -> AsyncIterator[int]:
+    """
+    Fill in the wide copies of ``model``'s ``WIDENED_BALANCES`` for rows written
+    before the copies existed, ``batch_size`` rows at a time, yielding how many
+    rows each batch copied. Every batch commits on its own, so rows are only
+    locked for as long as it takes to update one batch.
+    """
+    columns = WIDENED_BALANCES[model]
+    keys = [key.name for key in model.__table__.primary_key]
+    params: dict[str, Any] = {"batch_size": batch_size}
+
+    while True:
+        stmt = _backfill_statement(model, columns, after_key=len(params) > 1)
+        async with engine.begin() as conn:
+            last = (await conn.execute(stmt, params)).one_or_none()
+
+        if last is None:
+            return
+
+        yield last.copied
+        params.update({f"after_{key}": getattr(last, key) for key in keys})
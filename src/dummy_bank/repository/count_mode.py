@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class CountMode(StrEnum):
+    """How the total row count of a paginated list is worked out."""
+
+    EXACT = "exact"
+    # read from the planner statistics, only used for unfiltered lists.
+    ESTIMATED = "estimated"
+    NONE = "none"
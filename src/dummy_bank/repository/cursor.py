@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple, Self
+from uuid import UUID
+
+
+class InvalidCursorError(ValueError):
+    """A cursor that was not handed out by ``Cursor.encode``."""
+
+
+class Cursor(NamedTuple):
+    """
+    Position of the last row of a page in the ``(created_at, id)`` ordering, handed
+    to clients as an opaque string so the next page can be read with a keyset seek
+    rather than an offset.
+    """
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        payload = json.dumps([self.created_at.isoformat(), str(self.id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> Self:
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+            return cls(created_at=datetime.fromisoformat(created_at), id=UUID(id))
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise InvalidCursorError("invalid cursor") from e
@@ -1,46 +1,93 @@
 from datetime import datetime, timezone
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    ScalarSelect,
+    Select,
+    String,
+    Uuid,
+    bindparam,
+    func,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
 
-from dummy_bank.domain import Customer
+from dummy_bank.domain import Account, Address, Customer
 
-from .db_customer import DBCustomer
-from .repository import Repository
+from .count_mode import CountMode
+from .db_account import DBAccount
+from .db_address import DBAddress
+from .db_customer import DBCustomer, full_name
+from .repository import ImportResult, Repository
 from .search_condition import SearchCondition
 
+# JSON has no UUID or timestamp types, so those columns come back as strings
+_JSON_PARSERS: dict[type, Any] = {UUID: UUID, datetime: datetime.fromisoformat}
+
 
 class CustomerRepository(Repository):
+    @staticmethod
+    def _as_values(customer: Customer, now: datetime) -> dict[str, Any]:
+        return {
+            "id": customer.id,
+            "created_at": customer.created_at or now,
+            "updated_at": now,
+            "first_name": customer.first_name,
+            "middle_names": customer.middle_names,
+            "last_name": customer.last_name,
+            "email": customer.email,
+            "phone": customer.phone,
+            "version": (customer.version or 0) + 1,
+        }
+
     async def save_customer(self, customer: Customer) -> None:
         now = datetime.now(timezone.utc)
-        customer.updated_at = now
-
-        try:
-            customer.created_at = now
-        except AttributeError:
-            pass
-
-        record = DBCustomer(
-            id=customer.id,
-            created_at=customer.created_at,
-            updated_at=customer.updated_at,
-            first_name=customer.first_name,
-            middle_names=customer.middle_names,
-            last_name=customer.last_name,
-            email=customer.email,
-            phone=customer.phone,
+
+        created_at, updated_at, version = await self._upsert(
+            DBCustomer, **self._as_values(customer, now)
         )
 
-        async with self._session() as session:
-            await session.merge(record)
-            await session.commit()
+        customer.updated_at = updated_at
+        customer.version = version
+        if customer.created_at is None:
+            customer.created_at = created_at
+
+    async def save_customers(self, customers: Iterable[Customer]) -> None:
+        """
+        Save many customers with a single commit, see ``Repository._upsert_many``.
+        """
+        now = datetime.now(timezone.utc)
+        customers = list(customers)
+
+        stored = await self._upsert_many(
+            DBCustomer, [self._as_values(customer, now) for customer in customers]
+        )
+
+        for customer in customers:
+            created_at, updated_at, version = stored[customer.id]
+            customer.updated_at = updated_at
+            customer.version = version
+            if customer.created_at is None:
+                customer.created_at = created_at
+
+    async def import_customers(self, rows: Sequence[dict[str, Any]]) -> ImportResult:
+        """
+        Insert already validated rows of customer columns that do not exist yet,
+        see ``Repository._copy_insert``.
+        """
+        return await self._copy_insert(DBCustomer, rows)
 
     async def load_customer(self, search_condition: SearchCondition) -> Customer | None:
-        stmt = select(DBCustomer).filter_by(**search_condition.as_filter_by_kwargs())
+        filters = search_condition.as_filter_by_kwargs()
+        stmt = self._select_statement(DBCustomer, filters)
 
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        async with self._session(read_only=True) as session:
+            results = (await session.execute(stmt, self._filter_params(filters))).all()
 
         if not results:
             return None
@@ -53,21 +100,159 @@ class CustomerRepository(Repository):
         condition = SearchCondition(id=id)
         return await self.load_customer(search_condition=condition)
 
+    async def load_customer_overview(
+        self, id: UUID
+    ) -> tuple[Customer, list[Account], list[Address]] | None:
+        """
+        Load customer ``id`` together with all of their accounts and addresses in
+        one query, or ``None`` if the customer does not exist. Accounts and
+        addresses are aggregated into JSON arrays by correlated sub-selects, so
+        each customer comes back as a single row.
+        """
+        async with self._session(read_only=True) as session:
+            record = (
+                await session.execute(self._overview_statement(), {"id": id})
+            ).one_or_none()
+
+        if record is None:
+            return None
+
+        return (
+            Customer.from_record(record),
+            [
+                Account.from_record(account)
+                for account in self._from_json(DBAccount, record.accounts)
+            ],
+            [
+                Address.from_record(address)
+                for address in self._from_json(DBAddress, record.addresses)
+            ],
+        )
+
+    @classmethod
+    def _overview_statement(cls) -> Select[Any]:
+        def build() -> Select[Any]:
+            customers = DBCustomer.__table__
+            return select(
+                customers,
+                cls._json_rows(DBAccount, customers.c.id).label("accounts"),
+                cls._json_rows(DBAddress, customers.c.id).label("addresses"),
+            ).where(customers.c.id == bindparam("id", type_=Uuid))
+
+        return cls.statements.get(("overview", DBCustomer.__tablename__), build)
+
+    @staticmethod
+    def _json_rows(model: Any, customer_id: Any) -> ScalarSelect[Any]:
+        """
+        The rows of ``model`` belonging to ``customer_id`` as a JSON array, in the
+        same order as the list endpoints return them.
+        """
+        table = model.__table__
+        rows = func.json_agg(
+            aggregate_order_by(table.table_valued(), table.c.created_at, table.c.id)
+        )
+        return (
+            select(func.coalesce(rows, text("'[]'::json"), type_=JSON))
+            .where(table.c.customer_id == customer_id)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _from_json(model: Any, rows: list[dict[str, Any]]) -> list[SimpleNamespace]:
+        """Turn the JSON ``rows`` of ``model`` back into records with typed columns."""
+        parsers = {
+            column.name: parser
+            for column in model.__table__.c
+            if (parser := _JSON_PARSERS.get(column.type.python_type)) is not None
+        }
+        return [
+            SimpleNamespace(
+                **{
+                    name: parsers[name](value)
+                    if name in parsers and value is not None
+                    else value
+                    for name, value in row.items()
+                }
+            )
+            for row in rows
+        ]
+
+    async def search_customers(self, query: str, limit: int = 20) -> list[Customer]:
+        """
+        Up to ``limit`` customers whose full name, email or phone contains a close
+        match for ``query``, best match first. Matching uses ``pg_trgm`` word
+        similarity, so misspellings and partial terms are found, and is served
+        by the trigram indexes on those columns.
+        """
+        async with self._session(read_only=True) as session:
+            results = (
+                await session.execute(
+                    self._search_statement(), {"q": query, "limit": limit}
+                )
+            ).all()
+
+        return [Customer.from_record(record) for record in results]
+
+    @classmethod
+    def _search_statement(cls) -> Select[Any]:
+        def build() -> Select[Any]:
+            customers = DBCustomer.__table__
+            query = bindparam("q", type_=String)
+            columns = (full_name(customers), customers.c.email, customers.c.phone)
+            # ``%>`` is true when the column has a word similar enough to the query,
+            # and unlike ``word_similarity`` itself can use the indexes
+            similarity = func.greatest(
+                *(
+                    func.coalesce(func.word_similarity(query, column), 0)
+                    for column in columns
+                )
+            )
+            return (
+                select(customers)
+                .where(or_(*(column.op("%>")(query) for column in columns)))
+                .order_by(similarity.desc(), customers.c.id)
+                .limit(bindparam("limit", type_=Integer))
+            )
+
+        return cls.statements.get(("search", DBCustomer.__tablename__), build)
+
+    async def stream_customers(
+        self, batch_size: int = 1_000
+    ) -> AsyncIterator[list[Customer]]:
+        """Yield every customer in batches of ``batch_size``, see ``_stream``."""
+        async for rows in self._stream(DBCustomer, batch_size):
+            yield [Customer.from_record(record) for record in rows]
+
     async def load_paginated_customers(
-        self, page: int, page_size: int
+        self,
+        page: int,
+        page_size: int,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        search_condition: SearchCondition | None = None,
     ) -> dict[str, Any]:
-        offset = (page - 1) * page_size
-        count = await self.get_count(DBCustomer)
-        total_pages = (count + page_size - 1) // page_size
+        search_condition = search_condition or SearchCondition()
+        results, total_count, next_cursor = await self._load_page(
+            DBCustomer,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+            sort=search_condition.sort,
+            **search_condition.as_filter_by_kwargs(),
+        )
 
-        stmt = select(DBCustomer).limit(page_size).offset(offset)
-        async with self._session() as session:
-            results = (await session.scalars(stmt)).all()
+        total_pages = (
+            (total_count + page_size - 1) // page_size
+            if total_count is not None
+            else None
+        )
 
         return {
             "results": [Customer.from_record(record) for record in results],
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
-            "total_count": count,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
         }
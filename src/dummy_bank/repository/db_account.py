@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from dummy_bank.repository.db_customer import Base  # Ensure this import exists
@@ -9,6 +9,11 @@ from dummy_bank.repository.db_customer import Base  # Ensure this import exists
 
 class DBAccount(Base):
     __tablename__ = "accounts"
+    __table_args__ = (
+        Index(
+            "ix_accounts_customer_id_created_at_id", "customer_id", "created_at", "id"
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
     customer_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("customers.id"), nullable=False
@@ -17,6 +22,8 @@ class DBAccount(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     account_number: Mapped[str] = mapped_column(String, nullable=False)
     account_type: Mapped[str] = mapped_column(String, nullable=True)
-    account_balance: Mapped[int] = mapped_column(Integer, nullable=False)
+    account_balance: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # bumped by every write, see ``Repository._on_conflict_update``
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     customer = relationship("DBCustomer", backref="accounts")
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from dummy_bank.repository.db_customer import Base
@@ -9,6 +9,11 @@ from dummy_bank.repository.db_customer import Base
 
 class DBAddress(Base):
     __tablename__ = "addresses"
+    __table_args__ = (
+        Index(
+            "ix_addresses_customer_id_created_at_id", "customer_id", "created_at", "id"
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
     customer_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("customers.id"), nullable=False
@@ -24,4 +29,14 @@ class DBAddress(Base):
     country: Mapped[str] = mapped_column(String, nullable=False)
     latitude: Mapped[str] = mapped_column(String, nullable=True)
     longitude: Mapped[str] = mapped_column(String, nullable=True)
+    # bumped by every write, see ``Repository._on_conflict_update``
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     customer = relationship("DBCustomer", backref="addresses")
+
+
+# serves the case-insensitive post code prefix filter, see ``SearchCondition``
+Index(
+    "ix_addresses_lower_post_code_pattern",
+    func.lower(DBAddress.__table__.c.post_code).label("post_code"),
+    postgresql_ops={"post_code": "text_pattern_ops"},
+)
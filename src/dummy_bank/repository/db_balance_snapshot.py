@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dummy_bank.repository.db_customer import Base
+
+
+class DBBalanceSnapshot(Base):
+    """
+    An account's balance at ``taken_at``, counting every ledger entry created
+    before it. Written by ``TransactionsRepository.take_snapshots``.
+    """
+
+    __tablename__ = "balance_snapshots"
+    account_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    taken_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    balance: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -1,7 +1,17 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+    literal_column,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -9,8 +19,15 @@ class Base(DeclarativeBase):
     pass
 
 
+# trigram indexes for the customer search, see ``CustomerRepository.search_customers``
+event.listen(
+    Base.metadata, "before_create", DDL("create extension if not exists pg_trgm")
+)
+
+
 class DBCustomer(Base):
     __tablename__ = "customers"
+    __table_args__ = (Index("ix_customers_created_at_id", "created_at", "id"),)
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -19,3 +36,44 @@ class DBCustomer(Base):
     last_name: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str] = mapped_column(String, nullable=True)
     phone: Mapped[str] = mapped_column(String, nullable=True)
+    # bumped by every write, see ``Repository._on_conflict_update``
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+
+# emails are matched case-insensitively, so they have to be unique that way too
+Index(
+    "ix_customers_lower_email",
+    func.lower(DBCustomer.__table__.c.email),
+    unique=True,
+)
+
+# serve the case-insensitive prefix filters, see ``SearchCondition``
+for _name in ("first_name", "last_name", "email"):
+    Index(
+        f"ix_customers_lower_{_name}_pattern",
+        func.lower(DBCustomer.__table__.c[_name]).label(_name),
+        postgresql_ops={_name: "text_pattern_ops"},
+    )
+
+
+def full_name(table: Any) -> Any:
+    """
+    ``first_name last_name``, written so the search query and the index on it
+    compile to the same expression.
+    """
+    return table.c.first_name + literal_column("' '") + table.c.last_name
+
+
+Index(
+    "ix_customers_full_name_trgm",
+    full_name(DBCustomer.__table__).label("full_name"),
+    postgresql_using="gin",
+    postgresql_ops={"full_name": "gin_trgm_ops"},
+)
+for _name in ("email", "phone"):
+    Index(
+        f"ix_customers_{_name}_trgm",
+        DBCustomer.__table__.c[_name],
+        postgresql_using="gin",
+        postgresql_ops={_name: "gin_trgm_ops"},
+    )
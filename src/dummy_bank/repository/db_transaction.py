@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DDL, BigInteger, DateTime, ForeignKey, Index, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dummy_bank.repository.db_customer import Base
+
+
+class DBTransaction(Base):
+    """
+    The ledger, range partitioned by month on ``created_at``. Partitions are
+    created ahead of time by ``TransactionsRepository.create_partitions``; rows
+    that fall outside every monthly partition land in ``transactions_default``.
+    """
+
+    __tablename__ = "transactions"
+    __table_args__ = (
+        Index(
+            "ix_transactions_account_id_created_at_id",
+            "account_id",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # the partition key has to be part of the primary key
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    # the ledger is append-only, so an account with entries cannot be deleted
+    account_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("accounts.id", ondelete="RESTRICT"), nullable=False
+    )
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    balance_after: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    counterparty_account_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+
+
+event.listen(
+    DBTransaction.__table__,
+    "after_create",
+    DDL(
+        "create table if not exists transactions_default "
+        "partition of transactions default"
+    ),
+)
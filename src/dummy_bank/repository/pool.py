@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """
+    Running totals for one engine's connection pool: how long checkouts waited for
+    a connection, how many went into overflow or timed out, and how many
+    connections are in use right now.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._pool: Pool | None = None
+
+    @classmethod
+    def attach(cls, engine: AsyncEngine) -> "PoolMetrics":
+        """Start collecting metrics for ``engine``, which must use ``TimedPool``."""
+        metrics = cls()
+        pool = engine.sync_engine.pool
+        if isinstance(pool, TimedPool):
+            pool.metrics = metrics
+        metrics._pool = pool
+
+        event.listen(engine.sync_engine, "checkout", metrics._on_checkout)
+        return metrics
+
+    def _on_checkout(self, *_: Any) -> None:
+        self.checkouts += 1
+        if isinstance(self._pool, AsyncAdaptedQueuePool) and self._pool.overflow() > 0:
+            self.overflow_checkouts += 1
+
+    def record_wait(self, seconds: float) -> None:
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    @property
+    def in_use(self) -> int:
+        if isinstance(self._pool, AsyncAdaptedQueuePool):
+            return self._pool.checkedout()
+        return 0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "in_use": self.in_use,
+            "checkouts": self.checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "mean_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    async def publish(
+        self, logger: structlog.stdlib.BoundLogger, interval: float
+    ) -> None:
+        """Log the pool metrics every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("database pool", **self.stats())
+
+
+class TimedPool(AsyncAdaptedQueuePool):
+    """A queue pool that reports how long each checkout waited to ``metrics``."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self) -> "TimedPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+async def warm_pool(engine: AsyncEngine, size: int) -> None:
+    """
+    Open ``size`` connections at once and hand them back to the pool, so the first
+    burst of requests does not queue behind connection setup.
+    """
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+
+    for result in results:
+        if isinstance(result, AsyncConnection):
+            await result.close()
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """
+    The statements run on behalf of one unit of work, usually a request: how many,
+    how long they took in total and which one was the slowest. Statements that
+    fail are counted too.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+
+    @classmethod
+    def attach(cls, engine: AsyncEngine) -> None:
+        """Time every statement ``engine`` runs, see ``track``."""
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+    @classmethod
+    @contextmanager
+    def track(cls) -> Iterator["QueryStats"]:
+        """
+        Attribute the statements run in this context, including tasks started from
+        it, to a fresh ``QueryStats``.
+        """
+        stats = cls()
+        token = _current.set(stats)
+        try:
+            yield stats
+        finally:
+            _current.reset(token)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_time += seconds
+        if seconds >= self.slowest_time:
+            self.slowest_time = seconds
+            self.slowest_statement = statement
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "db_queries": self.count,
+            "db_time": round(self.total_time, 6),
+            "db_slowest_time": round(self.slowest_time, 6),
+            "db_slowest_statement": self.slowest_statement,
+        }
+
+
+# when each statement in flight was sent, by its execution context. A statement
+# that fails never reaches ``after_cursor_execute``, so keying by the connection
+# would pair later statements with the failed one's start time.
+_start_times: WeakKeyDictionary[Any, float] = WeakKeyDictionary()
+
+
+def _before_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *_: Any
+) -> None:
+    _start_times[context] = time.perf_counter()
+
+
+def _after_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *_: Any
+) -> None:
+    _record(context, statement)
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    context = exception_context.execution_context
+    if context is not None and exception_context.statement is not None:
+        _record(context, exception_context.statement)
+
+
+def _record(context: Any, statement: str) -> None:
+    start = _start_times.pop(context, None)
+    stats = _current.get()
+    if start is not None and stats is not None:
+        stats.record(statement, time.perf_counter() - start)
@@ -0,0 +1,86 @@
+import asyncio
+from itertools import count
+from typing import Sequence
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+# seconds the replica is behind the primary, 0 if it has replayed everything it has
+# received so an idle primary does not look like lag.
+_REPLICATION_LAG = text(
+    "select case when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0 "
+    "else coalesce(extract(epoch from now() - pg_last_xact_replay_timestamp()), 0) "
+    "end"
+)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        self.lag: float | None = None
+        self.healthy = True
+
+
+class ReplicaSet:
+    """
+    Read replicas handed out round-robin, skipping any that are unreachable or
+    further behind the primary than ``max_lag`` seconds at the last check.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        max_lag: float,
+        logger: structlog.stdlib.BoundLogger | None = None,
+    ) -> None:
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self._logger = logger or structlog.get_logger()
+        self._turn = count()
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def next(self) -> Replica | None:
+        """The next healthy replica, or ``None`` if reads must go to the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def check(self) -> None:
+        """Measure each replica's lag and eject or restore it accordingly."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                replica.lag = float((await conn.execute(_REPLICATION_LAG)).scalar_one())
+        except Exception as e:
+            replica.lag = None
+            healthy = False
+            self._logger.warning(
+                "replica unreachable", replica=str(replica.engine.url), error=str(e)
+            )
+        else:
+            healthy = replica.lag <= self.max_lag
+
+        if healthy != replica.healthy:
+            self._logger.info(
+                "replica restored" if healthy else "replica ejected",
+                replica=str(replica.engine.url),
+                lag=replica.lag,
+            )
+        replica.healthy = healthy
+
+    async def monitor(self, interval: float) -> None:
+        """Check the replicas every ``interval`` seconds until cancelled."""
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
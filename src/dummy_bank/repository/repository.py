@@ -1,6 +1,39 @@
-from typing import Any, Literal
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Iterable,
+    Literal,
+    NamedTuple,
+    Sequence,
+)
+from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    String,
+    Uuid,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    exists,
+    func,
+    select,
+    table,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -8,18 +41,101 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.dml import ReturningInsert
+
+from .count_mode import CountMode
+from .cursor import Cursor
+from .replicas import ReplicaSet
+from .search_condition import SortOrder
+from .statements import StatementRegistry
+from .unit_of_work import UnitOfWork
+
+# how a ``<column>__<lookup>`` filter compares the column with its parameter. Each
+# one leaves the column bare, or wrapped as in an expression index, so it can be
+# answered from an index.
+_LOOKUPS: dict[str, Callable[[Any, str], ColumnElement[bool]]] = {
+    "in": lambda column, key: column == any_(bindparam(key, type_=ARRAY(column.type))),
+    "gt": lambda column, key: column > bindparam(key, type_=column.type),
+    "gte": lambda column, key: column >= bindparam(key, type_=column.type),
+    "lt": lambda column, key: column < bindparam(key, type_=column.type),
+    "lte": lambda column, key: column <= bindparam(key, type_=column.type),
+    # case-insensitive, served by ``lower(column)`` indexes
+    "iexact": lambda column, key: func.lower(column) == bindparam(key, type_=String),
+    # case-insensitive, served by ``lower(column) text_pattern_ops`` indexes
+    "prefix": lambda column, key: func.lower(column).like(bindparam(key, type_=String)),
+}
+
+
+def _prefix_pattern(prefix: str) -> str:
+    escaped = prefix.lower().replace("\\", "\\\\")
+    return escaped.replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+# how the value of a ``<column>__<lookup>`` filter is bound, where not as it is
+_LOOKUP_PARAMS: dict[str, Callable[[Any], Any]] = {
+    "iexact": str.lower,
+    "prefix": _prefix_pattern,
+}
+
+
+class VersionConflictError(Exception):
+    """A row was written since the copy a write is based on was read."""
+
+
+class ImportResult(NamedTuple):
+    """
+    The ids of the rows an import inserted, and of those it skipped because a row
+    they refer to does not exist. Any other row conflicted with an existing one.
+    """
+
+    inserted: set[UUID]
+    missing_parent: set[UUID]
 
 
 class Repository:
     _engine: AsyncEngine | AsyncConnection
 
-    def __init__(self, engine: AsyncEngine | AsyncConnection):
+    # batches larger than this are written with COPY rather than a multi-row insert
+    bulk_copy_threshold: int = 1_000
+
+    # shared by every repository so each statement shape is only built once per
+    # process
+    statements: ClassVar[StatementRegistry] = StatementRegistry()
+
+    def __init__(
+        self,
+        engine: AsyncEngine | AsyncConnection,
+        unit_of_work: UnitOfWork | None = None,
+        replicas: ReplicaSet | None = None,
+    ):
         self._engine = engine
+        self._unit_of_work = unit_of_work
+        self._replicas = replicas
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._has_written = False
 
     @property
     def engine(self) -> AsyncEngine | AsyncConnection:
         return self._engine
 
+    @property
+    def unit_of_work(self) -> UnitOfWork | None:
+        return self._unit_of_work
+
+    @property
+    def replicas(self) -> ReplicaSet | None:
+        return self._replicas
+
+    @property
+    def has_written(self) -> bool:
+        """
+        Whether this repository, or any other sharing its unit of work, has written
+        to the primary. Reads after a write stay on the primary so they see it.
+        """
+        if self._unit_of_work is not None:
+            return self._unit_of_work.has_written
+        return self._has_written
+
     async def health_check(self) -> Literal["ok"]:
         """
         Check if the database connection is alive and healthy.
@@ -32,17 +148,541 @@ class Repository:
 
         return "ok"
 
-    def _session(self) -> AsyncSession:
-        return async_sessionmaker(self.engine)()
+    @asynccontextmanager
+    async def _session(self, read_only: bool = False) -> AsyncIterator[AsyncSession]:
+        """
+        Yield the unit of work's shared session if there is one, otherwise a
+        short-lived session that is closed on exit.
 
-    async def get_count(self, model: type[DeclarativeBase], **kwargs: Any) -> int:
-        async with self._session() as session:
-            stmt = select(func.count()).select_from(model)
+        ``read_only`` sessions are opened on a healthy replica instead, unless
+        nothing has been written yet.
+        """
+        if read_only and self._replicas is not None and not self.has_written:
+            replica = self._replicas.next()
+            if replica is not None:
+                async with replica.session_factory() as session:
+                    yield session
+                return
+
+        if self._unit_of_work is not None:
+            yield self._unit_of_work.session
+            return
+
+        if self._session_factory is None:
+            self._session_factory = async_sessionmaker(self.engine)
+
+        async with self._session_factory() as session:
+            yield session
+
+    async def _commit(self, session: AsyncSession) -> None:
+        """
+        Commit the session, or only flush it when a unit of work owns the
+        transaction and will commit it once at the end of the request.
+        """
+        if self._unit_of_work is not None:
+            self._unit_of_work.has_written = True
+            await session.flush()
+        else:
+            self._has_written = True
+            await session.commit()
 
-            if kwargs:
-                stmt = stmt.filter_by(**kwargs)
+    async def get_count(self, model: type[DeclarativeBase], **kwargs: Any) -> int:
+        stmt = self._count_statement(model, CountMode.EXACT, kwargs)
 
-            result = await session.execute(stmt)
+        async with self._session(read_only=True) as session:
+            result = await session.execute(stmt, kwargs)
             total_count = result.scalar_one()
 
         return total_count
+
+    async def _upsert(
+        self, model: Any, **values: Any
+    ) -> tuple[datetime, datetime, int]:
+        """
+        Insert or update a ``model`` row in a single ``INSERT ... ON CONFLICT (id)
+        DO UPDATE`` statement and return its stored ``created_at``, ``updated_at``
+        and ``version``, see ``_on_conflict_update``.
+
+        ``created_at`` is only written on insert, so an existing row keeps the
+        timestamp it was created with.
+        """
+        stmt = self.statements.get(
+            ("upsert", model.__tablename__, tuple(values)),
+            lambda: self._on_conflict_update(
+                insert(model.__table__).values({key: bindparam(key) for key in values}),
+                model,
+                values,
+            ),
+        )
+
+        async with self._session() as session:
+            stored = (await session.execute(stmt, values)).one_or_none()
+            if stored is None:
+                raise VersionConflictError(
+                    f"{model.__tablename__} {values['id']} has changed since it was read"
+                )
+            await self._commit(session)
+
+        _, created_at, updated_at, version = stored
+        return created_at, updated_at, version
+
+    async def _upsert_many(
+        self, model: Any, rows: Sequence[dict[str, Any]]
+    ) -> dict[UUID, tuple[datetime, datetime, int]]:
+        """
+        Upsert many ``model`` rows with a single commit and return the stored
+        ``created_at``, ``updated_at`` and ``version`` of each row by id. Nothing
+        is written if any of the rows is out of date, see ``_on_conflict_update``.
+
+        Batches up to ``bulk_copy_threshold`` rows are written as one multi-row
+        ``INSERT ... ON CONFLICT``. Larger batches are streamed with ``COPY`` into a
+        temporary staging table and upserted from there in one statement, which
+        avoids the bind parameter limit and per-row protocol overhead.
+
+        If the same id appears more than once the last row wins.
+        """
+        rows = list({row["id"]: row for row in rows}.values())
+        if not rows:
+            return {}
+
+        async with self._session() as session:
+            if len(rows) <= self.bulk_copy_threshold:
+                stmt = self._on_conflict_update(
+                    insert(model.__table__).values(rows), model, rows[0]
+                )
+                rows_returned = (await session.execute(stmt)).all()
+            else:
+                rows_returned = await self._copy_upsert(session, model, rows)
+
+            stored = {
+                id: (created_at, updated_at, version)
+                for id, created_at, updated_at, version in rows_returned
+            }
+            if len(stored) < len(rows):
+                stale = [str(row["id"]) for row in rows if row["id"] not in stored]
+                raise VersionConflictError(
+                    f"{model.__tablename__} {', '.join(stale)} "
+                    "have changed since they were read"
+                )
+            await self._commit(session)
+
+        return stored
+
+    async def _copy_upsert(
+        self, session: AsyncSession, model: Any, rows: Sequence[dict[str, Any]]
+    ) -> Sequence[Row[tuple[UUID, datetime, datetime, int]]]:
+        columns = list(rows[0])
+        staging_name = await self._stage(
+            session,
+            model,
+            columns,
+            [tuple(row[name] for name in columns) for row in rows],
+        )
+
+        staging = table(staging_name, *[column(name) for name in columns])
+        stmt = insert(model.__table__).from_select(columns, select(*staging.c))
+        stmt = self._on_conflict_update(stmt, model, columns)
+        rows_returned = (await session.execute(stmt)).all()
+
+        # drop straight away in case the unit of work stages the same table again
+        # before it commits.
+        await session.execute(text(f"drop table {staging_name}"))
+        return rows_returned
+
+    @staticmethod
+    async def _stage(
+        session: AsyncSession,
+        model: Any,
+        columns: list[str],
+        records: list[tuple[Any, ...]],
+    ) -> str:
+        """
+        Copy ``records`` of ``columns`` into a new temporary table shaped like
+        ``model``'s, which is dropped on commit, and return its name.
+        """
+        staging_name = f"staging_{model.__tablename__}"
+
+        # creating the table through the session also opens the transaction the
+        # copy below runs in.
+        await session.execute(
+            text(
+                f"create temporary table {staging_name} "
+                f"(like {model.__tablename__} including defaults) on commit drop"
+            )
+        )
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_name, records=records, columns=columns
+        )
+        return staging_name
+
+    async def _copy_insert(
+        self, model: Any, rows: Sequence[dict[str, Any]]
+    ) -> ImportResult:
+        """
+        Insert new ``model`` rows with a single commit, leaving existing rows as
+        they are. The rows are streamed with ``COPY`` into a temporary staging table
+        and inserted from there with ``ON CONFLICT DO NOTHING``, so a row that
+        clashes with any unique constraint, or refers to a row that does not
+        exist, is skipped rather than failing the batch.
+
+        Rows without a ``created_at`` are stamped with the current time, as is the
+        ``updated_at`` of every row.
+        """
+        if not rows:
+            return ImportResult(set(), set())
+
+        now = datetime.now(timezone.utc)
+        timestamps = ("created_at", "updated_at")
+        columns = [name for name in rows[0] if name not in timestamps] + [*timestamps]
+
+        async with self._session() as session:
+            staging_name = await self._stage(
+                session,
+                model,
+                columns,
+                [
+                    (
+                        *(row[name] for name in columns[:-2]),
+                        row.get("created_at") or now,
+                        now,
+                    )
+                    for row in rows
+                ],
+            )
+            insert_stmt, orphans_stmt = self.statements.get(
+                ("copy_insert", model.__tablename__, tuple(columns)),
+                lambda: self._copy_insert_statements(model, staging_name, columns),
+            )
+
+            missing_parent: set[UUID] = set()
+            if orphans_stmt is not None:
+                missing_parent = set((await session.execute(orphans_stmt)).scalars())
+            inserted = set((await session.execute(insert_stmt)).scalars())
+
+            await session.execute(text(f"drop table {staging_name}"))
+            await self._commit(session)
+
+        return ImportResult(inserted, missing_parent)
+
+    @staticmethod
+    def _copy_insert_statements(
+        model: Any, staging_name: str, columns: list[str]
+    ) -> tuple[ReturningInsert[tuple[UUID]], Select[tuple[UUID]] | None]:
+        """
+        Insert the staged rows whose foreign keys all exist, returning their ids,
+        and select the ids of the staged rows where one does not, or ``None`` if
+        ``model`` has no foreign keys.
+        """
+        staging = table(staging_name, *[column(name) for name in columns])
+        parents_exist = [
+            exists().where(key.column == staging.c[key.parent.name])
+            for key in model.__table__.foreign_keys
+        ]
+
+        insert_stmt = (
+            insert(model.__table__)
+            .from_select(columns, select(*staging.c).where(*parents_exist))
+            .on_conflict_do_nothing()
+            .returning(model.__table__.c.id)
+        )
+        if not parents_exist:
+            return insert_stmt, None
+
+        return insert_stmt, select(staging.c.id).where(~and_(*parents_exist))
+
+    @staticmethod
+    def _on_conflict_update(
+        stmt: Insert, model: Any, columns: Iterable[str]
+    ) -> ReturningInsert[tuple[UUID, datetime, datetime, int]]:
+        """
+        Turn ``stmt`` into an upsert that only updates a row if it is still at the
+        version the written one was based on, without taking any locks.
+
+        Each written row carries the ``version`` it will have once written, one
+        past the version it was read at, or 1 for a row not saved before. A row
+        that has been written since, or a new row whose id is taken, is left as it
+        is and not returned.
+        """
+        table_columns = model.__table__.c
+        return stmt.on_conflict_do_update(
+            index_elements=[table_columns.id],
+            set_={
+                key: stmt.excluded[key]
+                for key in columns
+                if key not in ("id", "created_at")
+            },
+            where=table_columns.version == stmt.excluded.version - 1,
+        ).returning(
+            table_columns.id,
+            table_columns.created_at,
+            table_columns.updated_at,
+            table_columns.version,
+        )
+
+    @staticmethod
+    def _filter_shape(filters: dict[str, Any]) -> tuple[tuple[str, bool], ...]:
+        """
+        The columns a statement filters on and whether each one is compared against
+        ``NULL``, which is all that separates one cached filter statement from
+        another. The values themselves are bound when the statement is executed.
+        """
+        return tuple(sorted((key, value is None) for key, value in filters.items()))
+
+    @staticmethod
+    def _where(
+        model: Any, shape: tuple[tuple[str, bool], ...]
+    ) -> list[ColumnElement[bool]]:
+        """
+        The conditions for a filter shape. A plain ``<column>`` key is an equality
+        test, ``<column>__<lookup>`` uses one of ``_LOOKUPS`` instead. A
+        ``ValueError`` is raised for a column or lookup that does not exist.
+        """
+        columns = model.__table__.c
+        where = []
+        for key, is_null in shape:
+            name, _, lookup = key.partition("__")
+            if name not in columns or (lookup and lookup not in _LOOKUPS):
+                raise ValueError(f"cannot filter {model.__tablename__} by {key}")
+
+            if lookup:
+                where.append(_LOOKUPS[lookup](columns[name], key))
+            elif is_null:
+                where.append(columns[name].is_(None))
+            else:
+                where.append(columns[name] == bindparam(key))
+        return where
+
+    @staticmethod
+    def _filter_params(filters: dict[str, Any]) -> dict[str, Any]:
+        """The values to bind for ``filters``, see ``_where``."""
+        params = {}
+        for key, value in filters.items():
+            convert = _LOOKUP_PARAMS.get(key.partition("__")[2])
+            params[key] = convert(value) if convert and value is not None else value
+        return params
+
+    @classmethod
+    def _select_statement(cls, model: Any, filters: dict[str, Any]) -> Select[Any]:
+        """Select the ``model`` rows whose columns equal ``filters``."""
+        shape = cls._filter_shape(filters)
+        return cls.statements.get(
+            ("select", model.__tablename__, shape),
+            lambda: select(model.__table__).where(*cls._where(model, shape)),
+        )
+
+    @classmethod
+    def _select_with_ids_statement(cls, model: Any) -> Select[Any]:
+        """
+        Select the ``model`` rows in the ``ids`` parameter. The ids are bound as a
+        single array, so the statement is the same however many are looked up.
+        """
+        return cls.statements.get(
+            ("select_with_ids", model.__tablename__),
+            lambda: select(model.__table__).where(
+                model.__table__.c.id == any_(bindparam("ids", type_=ARRAY(Uuid)))
+            ),
+        )
+
+    @classmethod
+    def _count_statement(
+        cls, model: Any, count: CountMode, filters: dict[str, Any] | None = None
+    ) -> Select[tuple[int]] | None:
+        """
+        Statement returning the total number of rows a paginated list is drawn from,
+        or ``None`` if the caller does not want a count.
+
+        An estimated count is read from ``pg_class.reltuples`` rather than scanning
+        the table. The planner statistics only describe the whole table, so a
+        filtered list is always counted exactly. So is a table that has not been
+        analyzed yet, for which ``reltuples`` is -1, or 0 before Postgres 14.
+        """
+        if count is CountMode.NONE:
+            return None
+
+        shape = cls._filter_shape(filters or {})
+        if count is CountMode.ESTIMATED and not shape:
+            pg_class = table("pg_class", column("oid"), column("reltuples"))
+            return cls.statements.get(
+                ("count_estimated", model.__tablename__),
+                lambda: select(
+                    case(
+                        (
+                            pg_class.c.reltuples > 0,
+                            cast(pg_class.c.reltuples, BigInteger),
+                        ),
+                        # only run when the statistics are missing
+                        else_=select(func.count())
+                        .select_from(model.__table__)
+                        .correlate(None)
+                        .scalar_subquery(),
+                    )
+                ).where(pg_class.c.oid == func.to_regclass(model.__tablename__)),
+            )
+
+        return cls.statements.get(
+            ("count", model.__tablename__, shape),
+            lambda: (
+                select(func.count())
+                .select_from(model.__table__)
+                .where(*cls._where(model, shape))
+            ),
+        )
+
+    @classmethod
+    def _page_statement(
+        cls,
+        model: Any,
+        filters: dict[str, Any],
+        count: CountMode,
+        after_cursor: bool,
+        sort: SortOrder = SortOrder.OLDEST_FIRST,
+    ) -> Select[Any]:
+        """
+        Select one page of the ``model`` rows matching ``filters``, see
+        ``_paginate``, with the list's total count as an extra ``total_count``
+        column.
+        """
+
+        def build() -> Select[Any]:
+            stmt = cls._paginate(
+                cls._select_statement(model, filters), model, after_cursor, sort
+            )
+            count_stmt = cls._count_statement(model, count, filters)
+            if count_stmt is None:
+                return stmt
+            return stmt.add_columns(
+                count_stmt.correlate(None).scalar_subquery().label("total_count")
+            )
+
+        return cls.statements.get(
+            (
+                "page",
+                model.__tablename__,
+                cls._filter_shape(filters),
+                count,
+                after_cursor,
+                sort,
+            ),
+            build,
+        )
+
+    async def _load_page(
+        self,
+        model: Any,
+        page: int,
+        page_size: int,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        sort: SortOrder = SortOrder.OLDEST_FIRST,
+        **kwargs: Any,
+    ) -> tuple[Sequence[Any], int | None, str | None]:
+        """
+        Load one page of ``model`` rows matching ``kwargs``, together with the total
+        count and the cursor of the next page. Rows are read through the table
+        rather than the ORM entity, so no instances are built or tracked.
+
+        The count is selected as an extra column of the page query, so both come
+        back in a single round trip. Only a page that comes back empty part way
+        through a list needs a second query to find the total.
+        """
+        filter_params = self._filter_params(kwargs)
+        params: dict[str, Any] = {**filter_params, "limit": page_size + 1}
+        if cursor is None:
+            params["offset"] = (page - 1) * page_size
+        else:
+            after = Cursor.decode(cursor)
+            params["after_created_at"] = after.created_at
+            params["after_id"] = after.id
+
+        stmt = self._page_statement(model, kwargs, count, cursor is not None, sort)
+        count_stmt = self._count_statement(model, count, kwargs)
+
+        async with self._session(read_only=True) as session:
+            rows = (await session.execute(stmt, params)).all()
+
+            total_count: int | None = None
+            if count_stmt is not None:
+                if rows:
+                    total_count = rows[0].total_count
+                elif cursor is None and page == 1:
+                    total_count = 0
+                else:
+                    total_count = await session.scalar(count_stmt, filter_params)
+
+        records, next_cursor = self._page_results(rows, page_size)
+        return records, total_count, next_cursor
+
+    @staticmethod
+    def _paginate(
+        stmt: Select[Any],
+        model: Any,
+        after_cursor: bool,
+        sort: SortOrder = SortOrder.OLDEST_FIRST,
+    ) -> Select[Any]:
+        """
+        Order ``stmt`` by ``(created_at, id)``, or the reverse for
+        ``NEWEST_FIRST``, and restrict it to ``limit`` rows. After a cursor the
+        page starts right after the ``after_created_at`` and ``after_id`` row, which
+        the ``(created_at, id)`` indexes can seek to directly however deep it is, in
+        either direction; otherwise it falls back to ``OFFSET``.
+
+        ``_load_page`` asks for one extra row so ``_page_results`` can tell whether
+        another page follows.
+        """
+        columns = model.__table__.c
+        descending = sort is SortOrder.NEWEST_FIRST
+        order_by = (
+            (columns.created_at.desc(), columns.id.desc())
+            if descending
+            else (columns.created_at, columns.id)
+        )
+        stmt = stmt.order_by(*order_by).limit(bindparam("limit", type_=Integer))
+
+        if not after_cursor:
+            return stmt.offset(bindparam("offset", type_=Integer))
+
+        after_created_at = bindparam("after_created_at", type_=columns.created_at.type)
+        after = tuple_(after_created_at, bindparam("after_id", type_=columns.id.type))
+        position = tuple_(columns.created_at, columns.id)
+        # the plain created_at comparisons are implied by the row comparisons, but
+        # only they let the planner skip partitions on the far side of the cursor
+        if descending:
+            return stmt.where(position < after, columns.created_at <= after_created_at)
+        return stmt.where(position > after, columns.created_at >= after_created_at)
+
+    async def _stream(
+        self, model: Any, batch_size: int, **filters: Any
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Yield every ``model`` row matching ``filters``, ``batch_size`` rows at a
+        time and in no particular order. The rows are read through a server-side
+        cursor, so only one batch is held in memory however many rows match.
+        """
+        stmt = self._select_statement(model, filters)
+
+        async with self._session(read_only=True) as session:
+            result = await session.stream(
+                stmt,
+                self._filter_params(filters),
+                execution_options={"yield_per": batch_size},
+            )
+            async for rows in result.partitions():
+                yield rows
+
+    @staticmethod
+    def _page_results(
+        records: Sequence[Any], page_size: int
+    ) -> tuple[Sequence[Any], str | None]:
+        """
+        Trim the look-ahead row fetched by ``_paginate`` and build the cursor for
+        the next page, or ``None`` if this was the last one.
+        """
+        if len(records) <= page_size:
+            return records, None
+
+        records = records[:page_size]
+        last = records[-1]
+        return records, Cursor(created_at=last.created_at, id=last.id).encode()
@@ -1,7 +1,14 @@
+from datetime import datetime
+from enum import StrEnum
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, NonNegativeInt
+
+
+class SortOrder(StrEnum):
+    OLDEST_FIRST = "created_at"
+    NEWEST_FIRST = "-created_at"
 
 
 class SearchCondition(BaseModel):
@@ -12,5 +19,48 @@ class SearchCondition(BaseModel):
     account_number: str | None = None
     account_type: str | None = None
 
+    # filters other than equality, bound as ``<column>__<lookup>``, see
+    # ``Repository._where``
+    ids: list[UUID] | None = None
+    account_types: list[str] | None = None
+    kinds: list[str] | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    min_balance: NonNegativeInt | None = None
+    max_balance: NonNegativeInt | None = None
+    first_name_prefix: str | None = Field(default=None, min_length=1)
+    last_name_prefix: str | None = Field(default=None, min_length=1)
+    email_prefix: str | None = Field(default=None, min_length=1)
+    post_code_prefix: str | None = Field(default=None, min_length=1)
+
+    sort: SortOrder = SortOrder.OLDEST_FIRST
+
     def as_filter_by_kwargs(self) -> dict[str, Any]:
-        return self.model_dump(exclude_unset=True)
+        filters = self.model_dump(exclude_unset=True, exclude={"sort"})
+        kwargs = {}
+        for key, value in filters.items():
+            if key not in _LOOKUPS:
+                kwargs[key] = value
+            elif value is not None:
+                kwargs[_LOOKUPS[key]] = value
+            elif key == "email":
+                # a missing email is still matched, as ``IS NULL``, rather than
+                # dropping the filter along with the other unset lookups
+                kwargs[key] = None
+        return kwargs
+
+
+_LOOKUPS = {
+    "email": "email__iexact",
+    "ids": "id__in",
+    "account_types": "account_type__in",
+    "kinds": "kind__in",
+    "created_after": "created_at__gte",
+    "created_before": "created_at__lt",
+    "min_balance": "account_balance__gte",
+    "max_balance": "account_balance__lte",
+    "first_name_prefix": "first_name__prefix",
+    "last_name_prefix": "last_name__prefix",
+    "email_prefix": "email__prefix",
+    "post_code_prefix": "post_code__prefix",
+}
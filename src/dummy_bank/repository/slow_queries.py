@@ -0,0 +1,164 @@
+import asyncio
+import contextvars
+import re
+import time
+from itertools import count
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# parameters holding personal data, named after the columns they are compared with
+# or written to, optionally followed by a ``__<lookup>``, see ``Repository._where``
+_PII = frozenset(
+    {
+        "first_name",
+        "middle_names",
+        "last_name",
+        "email",
+        "phone",
+        "account_number",
+        "building_name",
+        "building_number",
+        "street",
+        "town",
+        "post_code",
+        "county",
+        "latitude",
+        "longitude",
+        # the customer search term, see ``CustomerRepository.search_customers``
+        "q",
+    }
+)
+# statements that can be prepared, and so explained
+_EXPLAINABLE = frozenset({"select", "insert", "update", "delete", "with"})
+# the suffixes SQLAlchemy gives to anonymous and repeated parameters, ``_1``, and
+# to the rows of a multi-row ``VALUES``, ``_m0``, which can follow one another
+_PARAM_SUFFIX = re.compile(r"(_[a-z]?\d+)+$")
+
+
+def redact(parameters: dict[str, Any]) -> dict[str, Any]:
+    """``parameters`` with personal data masked and the rest made loggable."""
+    redacted: dict[str, Any] = {}
+    for name, value in parameters.items():
+        column = _PARAM_SUFFIX.sub("", name).partition("__")[0]
+        if column in _PII and value is not None:
+            redacted[name] = "<redacted>"
+        elif value is None or isinstance(value, (bool, int, float)):
+            redacted[name] = value
+        else:
+            redacted[name] = str(value)
+    return redacted
+
+
+class SlowQueryLog:
+    """
+    Logs statements that take longer than ``threshold`` seconds, once per
+    statement shape, together with their redacted parameters and the plan
+    Postgres would use for them. Up to ``max_shapes`` shapes are logged.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        logger: structlog.stdlib.BoundLogger | None = None,
+        max_shapes: int = 1_000,
+    ) -> None:
+        self.threshold = threshold
+        self.max_shapes = max_shapes
+        self._logger = logger or structlog.get_logger()
+        self._seen: set[str] = set()
+        self._names = count()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+
+        # by execution context, see ``query_stats._start_times``
+        start_times: WeakKeyDictionary[Any, float] = WeakKeyDictionary()
+
+        def before_execute(
+            conn: Any,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            *_: Any,
+        ) -> None:
+            start_times[context] = time.perf_counter()
+
+        def after_execute(
+            conn: Any,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            executemany: bool,
+        ) -> None:
+            seconds = time.perf_counter() - start_times.pop(context)
+            if (
+                seconds < self.threshold
+                or statement in self._seen
+                or len(self._seen) >= self.max_shapes
+                or conn.get_execution_options().get("explaining")
+            ):
+                return
+            self._seen.add(statement)
+
+            compiled = getattr(context, "compiled_parameters", None) or [{}]
+            self._logger.warning(
+                "slow query",
+                statement=statement,
+                parameters=redact(compiled[0]),
+                executemany=executemany,
+                duration=round(seconds, 6),
+            )
+            if statement.split(None, 1)[0].lower() not in _EXPLAINABLE:
+                return
+            n_params = len(parameters[0] if executemany else parameters or ())
+
+            # a fresh context, so the plan's statements are not counted against
+            # the request that ran the slow one
+            task = asyncio.get_running_loop().create_task(
+                self.explain(engine, statement, n_params),
+                context=contextvars.Context(),
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        event.listen(sync_engine, "before_cursor_execute", before_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_execute)
+
+    async def explain(self, engine: AsyncEngine, statement: str, n_params: int) -> None:
+        """
+        Log the generic plan of ``statement``, which takes ``n_params`` positional
+        parameters. The statement is prepared rather than run, and the plan is
+        built without parameter values so none of them end up in the log.
+        """
+        name = f"slow_query_{next(self._names)}"
+        args = f"({', '.join(['null'] * n_params)})" if n_params else ""
+
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(explaining=True)
+                await conn.exec_driver_sql(
+                    "set local plan_cache_mode = force_generic_plan"
+                )
+                await conn.exec_driver_sql(f"prepare {name} as {statement}")
+                try:
+                    plan = (
+                        await conn.exec_driver_sql(
+                            f"explain (analyze off) execute {name}{args}"
+                        )
+                    ).scalars()
+                    self._logger.info(
+                        "slow query plan", statement=statement, plan="\n".join(plan)
+                    )
+                finally:
+                    await conn.exec_driver_sql(f"deallocate {name}")
+        except Exception as e:
+            self._logger.warning(
+                "failed to explain slow query", statement=statement, error=str(e)
+            )
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Callable, Hashable
+
+import structlog
+
+
+class StatementRegistry:
+    """
+    Builds each distinct statement shape once and hands back the same object on
+    every later request.
+
+    Values are always passed as bound parameters at execution time, so hot queries
+    skip rebuilding the statement, and every call with the same shape reuses one
+    entry in SQLAlchemy's compiled cache and the driver's prepared statements.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get[T](self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the statement registered under ``key``, building it on first use."""
+        try:
+            statement = self._statements[key]
+        except KeyError:
+            self.misses += 1
+            statement = self._statements[key] = build()
+        else:
+            self.hits += 1
+
+        return statement
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "statements": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    async def publish(
+        self, logger: structlog.stdlib.BoundLogger, interval: float
+    ) -> None:
+        """Log the registry stats every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("statement registry", **self.stats())
@@ -0,0 +1,358 @@
+import re
+from datetime import date, datetime, timezone
+from typing import Any, NamedTuple, Self
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    DateTime,
+    Select,
+    Uuid,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+    text,
+    true,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.dml import ReturningInsert
+
+from dummy_bank.domain import Transaction
+
+from .count_mode import CountMode
+from .db_account import DBAccount
+from .db_balance_snapshot import DBBalanceSnapshot
+from .db_transaction import DBTransaction
+from .repository import Repository
+from .search_condition import SearchCondition
+
+_PARTITION_NAME = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+# partition DDL locks the whole ledger, so it waits this long at most rather than
+# holding up every query queued behind it
+_DDL_LOCK_TIMEOUT = "set local lock_timeout = '5s'"
+
+
+def _add_months(month: date, months: int) -> date:
+    """The first day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _sum_of_amounts() -> ColumnElement[int]:
+    # the sum of bigints is a numeric, cast back so balances stay integers
+    ledger = DBTransaction.__table__
+    return cast(func.coalesce(func.sum(ledger.c.amount), 0), BigInteger)
+
+
+class LedgerPartition(NamedTuple):
+    """One month of the ledger, holding rows created from ``start`` until ``end``."""
+
+    start: date
+
+    @classmethod
+    def for_month(cls, day: date) -> Self:
+        return cls(start=day.replace(day=1))
+
+    @classmethod
+    def from_name(cls, name: str) -> Self | None:
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            return None
+        return cls(start=date(int(match[1]), int(match[2]), 1))
+
+    @property
+    def end(self) -> date:
+        return _add_months(self.start, 1)
+
+    @property
+    def name(self) -> str:
+        return f"transactions_y{self.start:%Y}m{self.start:%m}"
+
+
+class TransactionsRepository(Repository):
+    """
+    Reads the ledger. Entries are only ever written by ``AccountsRepository``, in
+    the same statement as the balance change they record.
+    """
+
+    async def load_paginated_transactions(
+        self,
+        page: int,
+        page_size: int,
+        account_id: UUID,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+        search_condition: SearchCondition | None = None,
+    ) -> dict[str, Any]:
+        search_condition = search_condition or SearchCondition()
+        results, total_count, next_cursor = await self._load_page(
+            DBTransaction,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+            sort=search_condition.sort,
+            **{**search_condition.as_filter_by_kwargs(), "account_id": account_id},
+        )
+
+        total_pages = (
+            (total_count + page_size - 1) // page_size
+            if total_count is not None
+            else None
+        )
+
+        return {
+            "results": [Transaction.from_record(record) for record in results],
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
+        }
+
+    async def take_snapshots(self, at: datetime) -> int:
+        """
+        Checkpoint the balance of every account opened before ``at``, as of
+        ``at``, and return how many snapshots were written. Accounts that already
+        have a snapshot at ``at`` are left alone, so the job can be re-run.
+
+        The balance is worked back from the current one, so only the entries
+        created since ``at`` are read. ``at`` should be far enough in the past
+        that no balance change dated before it is still in flight.
+        """
+        async with self._session() as session:
+            result = await session.execute(self._take_snapshots_statement(), {"at": at})
+            await self._commit(session)
+
+        return len(result.all())
+
+    async def balance_at(self, account_id: UUID, at: datetime) -> int | None:
+        """
+        The balance of account ``account_id`` once every ledger entry created up
+        to and including ``at`` was applied, or ``None`` if it does not exist.
+
+        Only the entries between ``at`` and the nearest snapshot are replayed:
+        forwards from the last snapshot taken at or before ``at``, otherwise
+        backwards from the first one after it, or from the current balance if
+        there is none.
+        """
+        params = {"account_id": account_id, "at": at}
+
+        async with self._session(read_only=True) as session:
+            balance = await session.scalar(self._replay_forward_statement(), params)
+            if balance is None:
+                balance = await session.scalar(
+                    self._replay_backward_statement(), params
+                )
+
+        return balance
+
+    @classmethod
+    def _take_snapshots_statement(cls) -> ReturningInsert[tuple[UUID]]:
+        def build() -> ReturningInsert[tuple[UUID]]:
+            accounts = DBAccount.__table__
+            ledger = DBTransaction.__table__
+            snapshots = DBBalanceSnapshot.__table__
+            at = bindparam("at", type_=DateTime(timezone=True))
+
+            since = (
+                select(_sum_of_amounts())
+                .where(ledger.c.account_id == accounts.c.id, ledger.c.created_at >= at)
+                .scalar_subquery()
+            )
+            return (
+                insert(snapshots)
+                .from_select(
+                    [snapshots.c.account_id, snapshots.c.taken_at, snapshots.c.balance],
+                    select(
+                        accounts.c.id,
+                        cast(at, DateTime(timezone=True)),
+                        accounts.c.account_balance - since,
+                    ).where(accounts.c.created_at < at),
+                )
+                .on_conflict_do_nothing()
+                .returning(snapshots.c.account_id)
+            )
+
+        return cls.statements.get(
+            ("take_snapshots", DBBalanceSnapshot.__tablename__), build
+        )
+
+    @classmethod
+    def _replay_forward_statement(cls) -> Select[Any]:
+        def build() -> Select[Any]:
+            ledger = DBTransaction.__table__
+            snapshots = DBBalanceSnapshot.__table__
+            account_id = bindparam("account_id", type_=Uuid)
+            at = bindparam("at", type_=DateTime(timezone=True))
+
+            snapshot = (
+                select(snapshots.c.balance, snapshots.c.taken_at)
+                .where(snapshots.c.account_id == account_id, snapshots.c.taken_at <= at)
+                .order_by(snapshots.c.taken_at.desc())
+                .limit(1)
+                .subquery("snapshot")
+            )
+            since = (
+                select(_sum_of_amounts())
+                .where(
+                    ledger.c.account_id == account_id,
+                    ledger.c.created_at >= snapshot.c.taken_at,
+                    ledger.c.created_at <= at,
+                )
+                .scalar_subquery()
+            )
+            return select(snapshot.c.balance + since)
+
+        return cls.statements.get(
+            ("replay_forward", DBBalanceSnapshot.__tablename__), build
+        )
+
+    @classmethod
+    def _replay_backward_statement(cls) -> Select[Any]:
+        def build() -> Select[Any]:
+            accounts = DBAccount.__table__
+            ledger = DBTransaction.__table__
+            snapshots = DBBalanceSnapshot.__table__
+            account_id = bindparam("account_id", type_=Uuid)
+            at = bindparam("at", type_=DateTime(timezone=True))
+
+            snapshot = (
+                select(snapshots.c.balance, snapshots.c.taken_at)
+                .where(snapshots.c.account_id == account_id, snapshots.c.taken_at > at)
+                .order_by(snapshots.c.taken_at)
+                .limit(1)
+                .subquery("snapshot")
+            )
+            until = (
+                select(_sum_of_amounts())
+                .where(
+                    ledger.c.account_id == account_id,
+                    ledger.c.created_at > at,
+                    or_(
+                        snapshot.c.taken_at.is_(None),
+                        ledger.c.created_at < snapshot.c.taken_at,
+                    ),
+                )
+                .scalar_subquery()
+            )
+            return (
+                select(
+                    func.coalesce(snapshot.c.balance, accounts.c.account_balance)
+                    - until
+                )
+                .select_from(accounts.outerjoin(snapshot, true()))
+                .where(accounts.c.id == account_id)
+            )
+
+        return cls.statements.get(
+            ("replay_backward", DBBalanceSnapshot.__tablename__), build
+        )
+
+    async def partitions(self) -> list[LedgerPartition]:
+        """The monthly partitions currently attached to the ledger, oldest first."""
+        async with self._session() as session:
+            names = await session.scalars(
+                text(
+                    "select child.relname from pg_inherits "
+                    "join pg_class child on child.oid = pg_inherits.inhrelid "
+                    "where pg_inherits.inhparent = 'transactions'::regclass"
+                )
+            )
+            partitions = [LedgerPartition.from_name(name) for name in names]
+
+        return sorted(partition for partition in partitions if partition is not None)
+
+    async def create_partitions(
+        self, months_ahead: int, today: date | None = None
+    ) -> dict[LedgerPartition, int]:
+        """
+        Make sure there is a partition for the current month and each of the
+        ``months_ahead`` months after it. Return the ones that were created, with
+        how many rows each took over from the default partition.
+
+        Rows only land in the default partition when no monthly partition covers
+        them, which running this ahead of time avoids. Each partition is created
+        empty, filled with the rows it covers from the default partition and then
+        attached, all in one transaction, as Postgres refuses to attach a partition
+        while the default still holds rows for it. Attaching scans the default
+        partition, so that is kept small by the same schedule.
+        """
+        existing = set(await self.partitions())
+        month = LedgerPartition.for_month(today or datetime.now(timezone.utc).date())
+        wanted = [
+            LedgerPartition(_add_months(month.start, n))
+            for n in range(months_ahead + 1)
+        ]
+        columns = ", ".join(DBTransaction.__table__.c.keys())
+
+        created: dict[LedgerPartition, int] = {}
+        for partition in wanted:
+            if partition in existing:
+                continue
+
+            # bounds are given in UTC so a month means the same thing whatever the
+            # session time zone is
+            start = f"'{partition.start} 00:00:00+00'"
+            end = f"'{partition.end} 00:00:00+00'"
+            async with self._session() as session:
+                await session.execute(text(_DDL_LOCK_TIMEOUT))
+                await session.execute(
+                    text(
+                        f"create table {partition.name} "
+                        f"(like transactions including defaults including constraints)"
+                    )
+                )
+                moved = await session.scalar(
+                    text(
+                        f"with moved as ("
+                        f"delete from transactions_default "
+                        f"where created_at >= {start} and created_at < {end} "
+                        f"returning {columns}), "
+                        f"inserted as ("
+                        f"insert into {partition.name} ({columns}) "
+                        f"select {columns} from moved returning 1) "
+                        f"select count(*) from inserted"
+                    )
+                )
+                await session.execute(
+                    text(
+                        f"alter table transactions attach partition {partition.name} "
+                        f"for values from ({start}) to ({end})"
+                    )
+                )
+                await self._commit(session)
+
+            created[partition] = moved or 0
+
+        return created
+
+    async def detach_partitions(self, before: date) -> list[LedgerPartition]:
+        """
+        Detach every partition holding only rows created before ``before`` and
+        return them. Detached partitions stay in the database as plain tables, to be
+        archived and dropped, and are no longer read or vacuumed as part of the
+        ledger.
+
+        Postgres cannot detach ``CONCURRENTLY`` while the ledger has a default
+        partition, so each detach briefly locks the whole ledger. It gives up
+        rather than queue every other query behind a long running one.
+        """
+        detached = [
+            partition
+            for partition in await self.partitions()
+            if partition.end <= before
+        ]
+
+        for partition in detached:
+            async with self._session() as session:
+                await session.execute(text(_DDL_LOCK_TIMEOUT))
+                await session.execute(
+                    text(f"alter table transactions detach partition {partition.name}")
+                )
+                await self._commit(session)
+
+        return detached
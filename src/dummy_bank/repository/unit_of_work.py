@@ -0,0 +1,34 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class UnitOfWork:
+    """
+    Shares a single session, and therefore a single connection and transaction,
+    between every repository taking part in a request.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self.has_written = False
+
+    @property
+    def session(self) -> AsyncSession:
+        """The shared session, opened lazily on first use."""
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        """Close the session, rolling back anything that was not committed."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
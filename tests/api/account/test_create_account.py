@@ -44,6 +44,7 @@ class TestCreateAccount:
             "account_balance": 10000,
             "created_at": "2018-11-13T15:16:08Z",
             "updated_at": "2018-11-13T15:16:08Z",
+            "version": 1,
         }
 
         response = await test_client.post("/dummy-bank/v1/accounts", json=payload)
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import AccountsRepository, CustomerRepository
+
+from ...make_domain_objects import MakeAccount, MakeCustomer
+
+
+@pytest.fixture
+async def accounts(
+    account_repository: AccountsRepository,
+    customer_repository: CustomerRepository,
+    make_account: MakeAccount,
+    make_customer: MakeCustomer,
+) -> set[str]:
+    customer = make_customer()
+    await customer_repository.save_customer(customer)
+    accounts = [
+        make_account(customer_id=customer.id, account_number=str(n), account_balance=10)
+        for n in range(3)
+    ]
+    await account_repository.save_accounts(accounts)
+    return {str(account.id) for account in accounts}
+
+
+class TestExportAccounts:
+    @pytest.mark.asyncio
+    async def test_ndjson(self, test_client: AsyncClient, accounts: set[str]) -> None:
+        response = await test_client.get("/dummy-bank/v1/accounts/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert (
+            response.headers["content-disposition"]
+            == 'attachment; filename="accounts.ndjson"'
+        )
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert {row["id"] for row in rows} == accounts
+        assert all(row["account_balance"] == 1000 for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_csv(self, test_client: AsyncClient, accounts: set[str]) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/accounts/export", params={"format": "csv"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert {row["id"] for row in rows} == accounts
+        assert all(row["account_balance"] == "1000" for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_empty(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/accounts/export", params={"format": "csv"}
+        )
+        assert response.status_code == 200
+        assert response.text.splitlines() == [
+            "id,customer_id,created_at,updated_at,version,account_balance,account_type,"
+            "account_number"
+        ]
+
+
+class TestExportAccountsInvalidFormat:
+    @pytest.mark.asyncio
+    async def test(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/accounts/export", params={"format": "xml"}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from dummy_bank.api.dependencies import get_transactions_repository
+from dummy_bank.repository import AccountsRepository, CustomerRepository
+
+from ...make_domain_objects import MakeAccount, MakeCustomer
+
+
+class TestGetBalanceForNonExistingAccount:
+    @pytest.mark.asyncio
+    async def test(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{uuid.uuid4()}/balance",
+            params={"at": datetime.now(timezone.utc).isoformat()},
+        )
+        assert response.status_code == 404
+        assert response.json() == {"detail": "account not found"}
+
+
+class TestGetBalance:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+        assert account.created_at is not None
+
+        await test_client.post(
+            f"/dummy-bank/v1/accounts/{account.id}/deposit", json={"amount": 5}
+        )
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/balance",
+            params={"at": account.created_at.isoformat()},
+        )
+        assert response.status_code == 200
+        assert response.json()["balance"] == 1000
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/balance",
+            params={"at": datetime.now(timezone.utc).isoformat()},
+        )
+        assert response.status_code == 200
+        assert response.json()["account_id"] == str(account.id)
+        assert response.json()["balance"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_before_account_opened(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id)
+        await account_repository.save_account(account)
+        assert account.created_at is not None
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/balance",
+            params={"at": (account.created_at - timedelta(days=1)).isoformat()},
+        )
+        assert response.status_code == 400
+        assert response.json() == {"detail": "account was not open at this time"}
+
+    @pytest.mark.asyncio
+    async def test_account_deleted_meanwhile(
+        self,
+        app: FastAPI,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id)
+        await account_repository.save_account(account)
+
+        repository = Mock(balance_at=AsyncMock(return_value=None))
+        app.dependency_overrides[get_transactions_repository] = lambda: repository
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/balance",
+            params={"at": datetime.now(timezone.utc).isoformat()},
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_naive_datetime(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{uuid.uuid4()}/balance",
+            params={"at": "2025-01-01T00:00:00"},
+        )
+        assert response.status_code == 422
@@ -21,6 +21,7 @@ class TestListAccountForNonExistingCustomer:
             "results": [],
             "total_count": 0,
             "total_pages": 0,
+            "next_cursor": None,
         }
 
 
@@ -44,6 +45,7 @@ class TestListAccountsThatDontExist:
             "results": [],
             "total_count": 0,
             "total_pages": 0,
+            "next_cursor": None,
         }
 
 
@@ -175,3 +177,56 @@ class TestListAccounts:
     async def test_bad_params(self, test_client: AsyncClient, params: dict) -> None:
         response = await test_client.get("/dummy-bank/v1/accounts", params=params)
         assert response.status_code == 422
+
+
+class TestListAccountsFiltered:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        accounts = [
+            make_account(
+                customer_id=customer.id,
+                account_type=account_type,
+                account_balance=balance,
+            )
+            for account_type, balance in [
+                ("current", 5),
+                ("current", 50),
+                ("savings", 500),
+                ("isa", 5000),
+            ]
+        ]
+        for account in accounts:
+            await account_repository.save_account(account)
+
+        response = await test_client.get(
+            "/dummy-bank/v1/accounts",
+            params={
+                "customer_id": str(customer.id),
+                "account_type": ["current", "savings"],
+                "min_balance": 5000,
+                "max_balance": 50000,
+            },
+        )
+        assert response.status_code == 200
+        assert [a["id"] for a in response.json()["results"]] == [
+            str(accounts[1].id),
+            str(accounts[2].id),
+        ]
+        assert response.json()["total_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_balance(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/accounts",
+            params={"customer_id": str(uuid.uuid4()), "min_balance": -1},
+        )
+        assert response.status_code == 422
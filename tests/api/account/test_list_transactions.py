@@ -0,0 +1,114 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import AccountsRepository, CustomerRepository
+
+from ...make_domain_objects import MakeAccount, MakeCustomer
+
+
+class TestListTransactionsForNonExistingAccount:
+    @pytest.mark.asyncio
+    async def test(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{uuid.uuid4()}/transactions"
+        )
+        assert response.status_code == 404
+        assert response.json() == {"detail": "account not found"}
+
+
+class TestListTransactions:
+    @pytest.mark.asyncio
+    async def test_empty(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id)
+        await account_repository.save_account(account)
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/transactions"
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "page": 1,
+            "page_size": 50,
+            "results": [],
+            "total_count": 0,
+            "total_pages": 0,
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        await test_client.post(
+            f"/dummy-bank/v1/accounts/{account.id}/deposit", json={"amount": 5}
+        )
+        await test_client.post(
+            f"/dummy-bank/v1/accounts/{account.id}/withdraw", json={"amount": 2.5}
+        )
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/transactions",
+            params={"page_size": 1},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_count"] == 2
+        assert [
+            (t["kind"], t["amount"], t["balance_after"]) for t in body["results"]
+        ] == [("deposit", 500, 1500)]
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/transactions",
+            params={"page_size": 1, "cursor": body["next_cursor"]},
+        )
+        assert [
+            (t["kind"], t["amount"], t["balance_after"])
+            for t in response.json()["results"]
+        ] == [("withdrawal", -250, 1250)]
+        assert response.json()["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_filtered(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        for amount in (1, 2, 3):
+            await account_repository.increase_balance(account.id, amount)
+        await account_repository.decrease_balance(account.id, 4)
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/accounts/{account.id}/transactions",
+            params={"kind": "deposit", "sort": "-created_at"},
+        )
+        assert response.status_code == 200
+        assert [t["amount"] for t in response.json()["results"]] == [3, 2, 1]
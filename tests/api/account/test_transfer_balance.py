@@ -6,7 +6,6 @@ from fastapi import FastAPI
 from httpx import AsyncClient
 from structlog.stdlib import BoundLogger
 
-from dummy_bank.api.lock_manager import LockManager
 from dummy_bank.repository import AccountsRepository, CustomerRepository
 
 from ...make_domain_objects import MakeAccount, MakeCustomer
@@ -163,7 +162,6 @@ class TestTransferBalance:
         make_customer: MakeCustomer,
         make_account: MakeAccount,
         logger: BoundLogger,
-        lock_manager: LockManager,
         test_client: AsyncClient,
     ) -> None:
         customer = make_customer()
@@ -65,6 +65,7 @@ class TestCreateAddress:
             "longitude": "22.22",
             "created_at": "2018-11-13T15:16:08Z",
             "updated_at": "2018-11-13T15:16:08Z",
+            "version": 1,
             "display_address": "Default Building, 123, Main Street, Springfield, Default County, AB12 3CD, Default Country",
         }
 
@@ -148,6 +149,7 @@ class TestCreateAddress:
             "longitude": None,
             "created_at": "2018-11-13T15:16:08Z",
             "updated_at": "2018-11-13T15:16:08Z",
+            "version": 1,
             "display_address": "Default Building, 123, Main Street, Springfield, Default County, AB12 3CD, Default Country",
         }
 
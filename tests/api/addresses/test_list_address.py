@@ -27,6 +27,7 @@ class TestListAddressesForNonExistingCustomer:
             "results": [],
             "total_count": 0,
             "total_pages": 0,
+            "next_cursor": None,
         }
 
 
@@ -51,6 +52,7 @@ class TestListAddressesThatDontExist:
             "results": [],
             "total_count": 0,
             "total_pages": 0,
+            "next_cursor": None,
         }
 
 
@@ -199,3 +201,31 @@ class TestListAccounts:
     ) -> None:
         response = await test_client.get("/dummy-bank/v1/addresses", params=params)
         assert response.status_code == 422
+
+
+class TestListAddressesFiltered:
+    @pytest.mark.asyncio
+    async def test_post_code_prefix(
+        self,
+        addresses_repository: AddressesRepository,
+        customer_repository: CustomerRepository,
+        make_address: MakeAddress,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        for post_code in ("SW1A 1AA", "sw1a 2bb", "E1 6AN"):
+            await addresses_repository.save_address(
+                make_address(customer_id=customer.id, post_code=post_code)
+            )
+
+        response = await test_client.get(
+            "/dummy-bank/v1/addresses",
+            params={"customer_id": str(customer.id), "post_code_prefix": "sw1a"},
+        )
+        assert response.status_code == 200
+        assert [a["post_code"] for a in response.json()["results"]] == [
+            "SW1A 1AA",
+            "sw1a 2bb",
+        ]
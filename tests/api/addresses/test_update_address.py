@@ -24,6 +24,37 @@ class TestAddressNotFound:
         assert response.json() == {"detail": "address not found"}
 
 
+class TestVersionConflict:
+    @pytest.mark.asyncio
+    @patch.object(GoogleMapsClient, "get_coordinates")
+    async def test(
+        self,
+        mock_get_coordinates: MagicMock,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        addresses_repository: AddressesRepository,
+        make_address: MakeAddress,
+        test_client: AsyncClient,
+    ) -> None:
+        mock_get_coordinates.return_value = None
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        existing = make_address(customer_id=customer.id)
+        await addresses_repository.save_address(existing)
+
+        existing.street = "Other Street"
+        await addresses_repository.save_address(existing)
+
+        response = await test_client.patch(
+            f"/dummy-bank/v1/addresses/{existing.id}",
+            json={"street": "High Street", "version": 1},
+        )
+        assert response.status_code == 409
+        assert response.json() == {
+            "detail": "address has been changed since it was read"
+        }
+
+
 class TestUpdateField:
     @pytest.mark.parametrize(
         "field, original, updated",
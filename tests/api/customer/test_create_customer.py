@@ -15,7 +15,7 @@ class TestCustomerAlreadyExists:
     async def test(
         self, customer_repository: CustomerRepository, test_client: AsyncClient
     ) -> None:
-        payload = {
+        payload: dict[str, Any] = {
             "email": "customer@example.com",
             "first_name": "John",
             "last_name": "Smith",
@@ -36,6 +36,26 @@ class TestCustomerAlreadyExists:
         assert response.status_code == 409
         assert response.json() == {"detail": "customer already exists"}
 
+        response = await test_client.post(
+            "/dummy-bank/v1/customers",
+            json={**payload, "email": "Customer@Example.com"},
+        )
+        assert response.status_code == 409
+
+
+class TestCreateCustomersWithoutEmail:
+    @pytest.mark.asyncio
+    async def test(
+        self, customer_repository: CustomerRepository, test_client: AsyncClient
+    ) -> None:
+        for first_name in ("John", "Jane"):
+            response = await test_client.post(
+                "/dummy-bank/v1/customers",
+                json={"first_name": first_name, "last_name": "Smith"},
+            )
+            assert response.status_code == 201
+            assert response.json()["email"] is None
+
 
 class TestCreateCustomer:
     @patch("dummy_bank.api.customers.router.uuid4")
@@ -62,6 +82,7 @@ class TestCreateCustomer:
             "id": str(expected_id),
             "created_at": "2018-11-13T15:16:08Z",
             "updated_at": "2018-11-13T15:16:08Z",
+            "version": 1,
             "name": "John Smith Smith",
             **payload,
         }
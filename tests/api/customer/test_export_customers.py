@@ -0,0 +1,28 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import CustomerRepository
+
+from ...make_domain_objects import MakeCustomer
+
+
+class TestExportCustomers:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customers = [make_customer() for _ in range(2)]
+        await customer_repository.save_customers(customers)
+
+        response = await test_client.get("/dummy-bank/v1/customers/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert {row["id"] for row in rows} == {str(c.id) for c in customers}
+        assert rows[0]["name"] == "Bob Bobberson Bobbington"
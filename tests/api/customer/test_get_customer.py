@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import UUID, uuid4
 
 import pytest
@@ -16,7 +17,7 @@ class TestGetCustomer:
     ) -> None:
         expected_id = UUID("9a4bdb0b-43cf-4efc-8a4c-260f8e117d9d")
 
-        payload = {
+        payload: dict[str, Any] = {
             "email": "customer@example.com",
             "first_name": "John",
             "last_name": "Smith",
@@ -35,6 +36,7 @@ class TestGetCustomer:
             "id": str(expected_id),
             "created_at": "2018-11-13T15:16:08Z",
             "updated_at": "2018-11-13T15:16:08Z",
+            "version": 1,
             "name": "John Smith Smith",
             **payload,
         }
@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import (
+    AccountsRepository,
+    AddressesRepository,
+    CustomerRepository,
+)
+
+from ...make_domain_objects import MakeAccount, MakeAddress, MakeCustomer
+
+
+class TestGetCustomerOverview:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        addresses_repository: AddressesRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+        make_address: MakeAddress,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id)
+        await account_repository.save_account(account)
+        address = make_address(customer_id=customer.id)
+        await addresses_repository.save_address(address)
+
+        response = await test_client.get(
+            f"/dummy-bank/v1/customers/{customer.id}/overview"
+        )
+        assert response.status_code == 200
+
+        body = response.json()
+        assert body["customer"]["id"] == str(customer.id)
+        assert [a["id"] for a in body["accounts"]] == [str(account.id)]
+        assert body["accounts"][0]["account_balance"] == account.account_balance
+        assert [a["id"] for a in body["addresses"]] == [str(address.id)]
+        assert body["addresses"][0]["display_address"] == address.display_address
+
+
+class TestGetCustomerOverviewNotFound:
+    @pytest.mark.asyncio
+    async def test(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(f"/dummy-bank/v1/customers/{uuid4()}/overview")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "customer not found"}
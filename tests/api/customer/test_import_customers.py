@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import CustomerRepository, DBCustomer
+
+from ...make_domain_objects import MakeCustomer
+
+
+class TestImportCustomers:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        existing = make_customer(email="bob@example.com")
+        await customer_repository.save_customer(existing)
+        body = (
+            "id,first_name,last_name,email\n"
+            f"{existing.id},Bob,Bobbington,bob@example.com\n"
+            ",Sue,Smith,sue@example.com\n"
+            ",Sam,,sam@example.com\n"
+        )
+
+        response = await test_client.post(
+            "/dummy-bank/v1/customers/import",
+            params={"format": "csv"},
+            content=body,
+            headers={"content-type": "text/csv"},
+        )
+        assert response.status_code == 200
+
+        assert response.json() == {
+            "imported": 1,
+            "rejected": 2,
+            "rejects": [
+                {
+                    "line": 2,
+                    "id": str(existing.id),
+                    "reason": "conflicts with an existing row",
+                },
+                {"line": 4, "id": None, "reason": "last_name: Field required"},
+            ],
+        }
+        assert await customer_repository.get_count(DBCustomer) == 2
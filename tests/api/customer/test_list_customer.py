@@ -21,6 +21,7 @@ class TestListCustomersThatDontExist:
             "results": [],
             "total_count": 0,
             "total_pages": 0,
+            "next_cursor": None,
         }
 
 
@@ -101,3 +102,199 @@ class TestListCustomers:
         assert response_json["total_pages"] == 1
         assert response_json["page"] == 1
         assert response_json["page_size"] == 50
+
+
+class TestListCustomersWithCursor:
+    @pytest.mark.asyncio
+    async def test_walks_every_page(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for i in range(7):
+            await customer_repository.save_customer(
+                make_customer(email=f"john.smith_{i}@example.com")
+            )
+
+        seen: list[str] = []
+        params: dict = {"page_size": 3}
+        while True:
+            response = await test_client.get("/dummy-bank/v1/customers", params=params)
+            assert response.status_code == 200
+
+            response_json = response.json()
+            seen.extend(customer["email"] for customer in response_json["results"])
+
+            if response_json["next_cursor"] is None:
+                break
+            params["cursor"] = response_json["next_cursor"]
+
+        assert seen == [f"john.smith_{i}@example.com" for i in range(7)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"cursor": "not a cursor"}
+        )
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid cursor"}
+
+
+class TestListCustomersCount:
+    @pytest.mark.asyncio
+    async def test_none(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for i in range(3):
+            await customer_repository.save_customer(
+                make_customer(email=f"john.smith_{i}@example.com")
+            )
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"count": "none"}
+        )
+        assert response.status_code == 200
+
+        response_json = response.json()
+        assert len(response_json["results"]) == 3
+        assert response_json["total_count"] is None
+        assert response_json["total_pages"] is None
+
+    @pytest.mark.asyncio
+    async def test_estimated(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for i in range(3):
+            await customer_repository.save_customer(
+                make_customer(email=f"john.smith_{i}@example.com")
+            )
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"count": "estimated"}
+        )
+        assert response.status_code == 200
+
+        response_json = response.json()
+        assert len(response_json["results"]) == 3
+        # the table has not been analyzed, so there is nothing to estimate from
+        assert response_json["total_count"] == 3
+        assert response_json["total_pages"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exact_past_the_last_page(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for i in range(3):
+            await customer_repository.save_customer(
+                make_customer(email=f"john.smith_{i}@example.com")
+            )
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"page": 5, "page_size": 2}
+        )
+        assert response.status_code == 200
+
+        response_json = response.json()
+        assert response_json["results"] == []
+        assert response_json["total_count"] == 3
+        assert response_json["total_pages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_count(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"count": "roughly"}
+        )
+        assert response.status_code == 422
+
+
+class TestListCustomersFiltered:
+    @pytest.mark.asyncio
+    async def test_prefix(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for email in ("jo_n@example.com", "JOHN@example.com", "jane@example.com"):
+            await customer_repository.save_customer(make_customer(email=email))
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"email_prefix": "Jo"}
+        )
+        assert response.status_code == 200
+        assert [c["email"] for c in response.json()["results"]] == [
+            "jo_n@example.com",
+            "JOHN@example.com",
+        ]
+
+        # "_" is matched literally rather than as a LIKE wildcard
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"email_prefix": "jo_"}
+        )
+        assert [c["email"] for c in response.json()["results"]] == ["jo_n@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_newest_first(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        for i in range(5):
+            await customer_repository.save_customer(
+                make_customer(email=f"john.smith_{i}@example.com")
+            )
+
+        seen: list[str] = []
+        params: dict = {"page_size": 2, "sort": "-created_at"}
+        while True:
+            response = await test_client.get("/dummy-bank/v1/customers", params=params)
+            seen.extend(customer["email"] for customer in response.json()["results"])
+            if response.json()["next_cursor"] is None:
+                break
+            params["cursor"] = response.json()["next_cursor"]
+
+        assert seen == [f"john.smith_{i}@example.com" for i in reversed(range(5))]
+
+    @pytest.mark.asyncio
+    async def test_created_range(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        customers = [
+            make_customer(email=f"john.smith_{i}@example.com") for i in range(3)
+        ]
+        for customer in customers:
+            await customer_repository.save_customer(customer)
+        created = [str(customer.created_at) for customer in customers]
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers",
+            params={
+                "created_after": created[1],
+                "created_before": created[2],
+            },
+        )
+        assert [c["email"] for c in response.json()["results"]] == [
+            "john.smith_1@example.com"
+        ]
+        assert response.json()["total_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_sort(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/customers", params={"sort": "email"}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,44 @@
+import pytest
+from httpx import AsyncClient
+
+from dummy_bank.repository import CustomerRepository
+
+from ...make_domain_objects import MakeCustomer
+
+
+class TestSearchCustomers:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        test_client: AsyncClient,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer(first_name="Margaret", last_name="Thornton")
+        await customer_repository.save_customers([customer, make_customer()])
+
+        response = await test_client.get(
+            "/dummy-bank/v1/customers/search", params={"q": "margret thornton"}
+        )
+        assert response.status_code == 200
+        assert [c["id"] for c in response.json()] == [str(customer.id)]
+
+    @pytest.mark.asyncio
+    async def test_no_matches(self, test_client: AsyncClient) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/customers/search", params={"q": "nobody"}
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestSearchCustomersInvalidQuery:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params", [{}, {"q": "ab"}, {"q": "abc", "limit": 0}])
+    async def test(
+        self, test_client: AsyncClient, params: dict[str, str | int]
+    ) -> None:
+        response = await test_client.get(
+            "/dummy-bank/v1/customers/search", params=params
+        )
+        assert response.status_code == 422
@@ -22,6 +22,39 @@ class TestCustomerNotFound:
         assert response.json() == {"detail": "customer not found"}
 
 
+class TestVersionConflict:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        test_client: AsyncClient,
+    ) -> None:
+        existing = make_customer()
+        await customer_repository.save_customer(existing)
+
+        response = await test_client.patch(
+            f"/dummy-bank/v1/customers/{existing.id}",
+            json={"first_name": "Bob", "version": existing.version},
+        )
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
+
+        # based on the version the first update replaced
+        response = await test_client.patch(
+            f"/dummy-bank/v1/customers/{existing.id}",
+            json={"first_name": "Sue", "version": existing.version},
+        )
+        assert response.status_code == 409
+        assert response.json() == {
+            "detail": "customer has been changed since it was read"
+        }
+
+        loaded = await customer_repository.load_customer_with_id(existing.id)
+        assert loaded is not None
+        assert loaded.first_name == "Bob"
+
+
 @pytest.mark.parametrize(
     "field, original, updated",
     [
@@ -0,0 +1,229 @@
+from typing import Any, AsyncIterator, Sequence
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from dummy_bank.api.bulk_import import import_rows
+from dummy_bank.api.models import (
+    CreateCustomer,
+    DataFormat,
+    ImportAccount,
+    ImportCustomer,
+)
+from dummy_bank.repository import ImportResult
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+class FakeInsert:
+    """Records each batch, inserting every row except those with ``conflicts``."""
+
+    def __init__(
+        self, conflicts: set[UUID] | None = None, orphans: set[UUID] | None = None
+    ) -> None:
+        self.batches: list[list[dict[str, Any]]] = []
+        self.conflicts = conflicts or set()
+        self.orphans = orphans or set()
+
+    async def __call__(self, rows: Sequence[dict[str, Any]]) -> ImportResult:
+        self.batches.append(list(rows))
+        ids = {row["id"] for row in rows}
+        return ImportResult(ids - self.conflicts - self.orphans, ids & self.orphans)
+
+
+class TestImportRows:
+    @pytest.mark.asyncio
+    async def test_ndjson(self) -> None:
+        insert = FakeInsert()
+        id = uuid4()
+
+        report = await import_rows(
+            _chunks(
+                f'{{"id": "{id}", "first_name": "Bob", "la'.encode(),
+                b'st_name": "Bobbington", "name": "ignored"}\n\n',
+                b'{"first_name": "Sue", "last_name": "Smith", "email": "sue@example.com"}',
+            ),
+            DataFormat.NDJSON,
+            ImportCustomer,
+            insert,
+        )
+
+        assert report.imported == 2
+        assert report.rejected == 0
+        [batch] = insert.batches
+        assert batch[0]["id"] == id
+        assert "name" not in batch[0]
+        assert batch[1]["email"] == "sue@example.com"
+        assert isinstance(batch[1]["id"], UUID)
+
+    @pytest.mark.asyncio
+    async def test_csv(self) -> None:
+        insert = FakeInsert()
+        customer_id = uuid4()
+
+        report = await import_rows(
+            _chunks(
+                b"customer_id,account_type,account_number,account_balance\r\n",
+                f'{customer_id},current,"1234,5678",1000\r\n'.encode(),
+                f"{customer_id},,87654321,10\n".encode(),
+                b"too,few\n",
+            ),
+            DataFormat.CSV,
+            ImportAccount,
+            insert,
+        )
+
+        assert report.imported == 1
+        assert [(r.line, r.reason) for r in report.rejects] == [
+            (3, "account_type: Field required"),
+            (4, "has 2 fields rather than 4"),
+        ]
+        [[row]] = insert.batches
+        assert row["account_number"] == "1234,5678"
+        assert row["account_balance"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_rejects(self) -> None:
+        id, conflict, orphan = uuid4(), uuid4(), uuid4()
+        insert = FakeInsert(conflicts={conflict}, orphans={orphan})
+        row = '{{"id": "{}", "customer_id": "{}", "account_type": "current", "account_number": "1", "account_balance": 1}}\n'
+
+        report = await import_rows(
+            _chunks(
+                row.format(id, uuid4()).encode(),
+                row.format(id, uuid4()).encode(),
+                row.format(conflict, uuid4()).encode(),
+                row.format(orphan, uuid4()).encode(),
+                b"[1, 2]\n",
+                b"{not json\n",
+                b"\xff\n",
+            ),
+            DataFormat.NDJSON,
+            ImportAccount,
+            insert,
+        )
+
+        assert report.imported == 1
+        assert report.rejected == 6
+        assert [(r.line, r.id, r.reason) for r in report.rejects[:3]] == [
+            (2, id, "repeats the id of an earlier row"),
+            (3, conflict, "conflicts with an existing row"),
+            (4, orphan, "refers to a customer that does not exist"),
+        ]
+        assert [r.line for r in report.rejects[3:]] == [5, 6, 7]
+
+    @pytest.mark.asyncio
+    async def test_email(self) -> None:
+        insert = FakeInsert()
+
+        report = await import_rows(
+            _chunks(
+                b'{"first_name": "Bob", "last_name": "B", "email": "Bob@EXAMPLE.com"}\n',
+                b'{"first_name": "Sue", "last_name": "S", "email": "sue@localhost"}\n',
+            ),
+            DataFormat.NDJSON,
+            ImportCustomer,
+            insert,
+        )
+
+        # validated and normalised just as the create customer payload is
+        assert [row["email"] for row in insert.batches[0]] == [
+            CreateCustomer(
+                first_name="Bob", last_name="B", email="Bob@EXAMPLE.com"
+            ).email
+        ]
+        [reject] = report.rejects
+        assert reject.line == 2
+        assert reject.reason.startswith("email: value is not a valid email address")
+
+    @pytest.mark.asyncio
+    async def test_batches(self) -> None:
+        insert = FakeInsert()
+        commits = 0
+
+        async def commit() -> None:
+            nonlocal commits
+            commits += 1
+
+        lines = b"".join(
+            b'{"first_name": "Bob", "last_name": "Bobbington"}\n' for _ in range(5)
+        )
+
+        report = await import_rows(
+            _chunks(lines),
+            DataFormat.NDJSON,
+            ImportCustomer,
+            insert,
+            commit,
+            batch_size=2,
+        )
+
+        assert report.imported == 5
+        assert [len(batch) for batch in insert.batches] == [2, 2, 1]
+        assert commits == 3
+
+    @pytest.mark.asyncio
+    async def test_lists_the_first_rejects(self) -> None:
+        report = await import_rows(
+            _chunks(b"{}\n" * 3),
+            DataFormat.NDJSON,
+            ImportCustomer,
+            FakeInsert(),
+            max_listed_rejects=2,
+        )
+
+        assert report.rejected == 3
+        assert [r.line for r in report.rejects] == [1, 2]
+
+
+class TestBulkEmailStr:
+    @staticmethod
+    def _validate(model: type[CreateCustomer], email: str) -> str:
+        try:
+            customer = model(first_name="Bob", last_name="Bobbington", email=email)
+        except ValidationError as e:
+            return e.errors(include_url=False)[0]["msg"]
+        assert customer.email is not None
+        return customer.email
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "bob@example.com",
+            "bob.bobbington+bank@EXAMPLE.com",
+            "Bob.Bobbington@EXAMPLE.com",
+            "PostMaster@example.com",
+            "postmaster@example.com",
+            "bob@bücher.de",
+            "bob@xn--bcher-kva.de",
+            "üser@example.com",
+            " bob@example.com ",
+            "Bob <bob@example.com>",
+            '"bob bobbington"@example.com',
+            "a" * 64 + "@example.com",
+            "a" * 65 + "@example.com",
+            "a" * 60 + "@" + ".".join(["b" * 60] * 3) + ".com",
+            "bob@" + ".".join(["a" * 60] * 4)[:240] + ".com",
+            "bob@" + "a" * 64 + ".com",
+            "a..b@example.com",
+            ".bob@example.com",
+            "bob.@example.com",
+            "bob@example..com",
+            "bob@localhost",
+            "bob@example.local",
+            "bob@example.1",
+            "bob@[127.0.0.1]",
+            "bob@@example.com",
+            "@example.com",
+            "bob@",
+            "bob",
+        ],
+    )
+    def test_same_as_email_str(self, email: str) -> None:
+        assert self._validate(ImportCustomer, email) == self._validate(
+            CreateCustomer, email
+        )
@@ -10,15 +10,17 @@ from dummy_bank.api.dependencies import (
     AddressesRepositoryDep,
     CustomerRepositoryDep,
     DatabaseEngineDep,
-    LockManagerDep,
     LoggerDep,
+    ReplicasDep,
     RepositoryDep,
     SettingsDep,
+    TransactionsRepositoryDep,
+    UnitOfWorkDep,
     get_database_engine,
 )
-from dummy_bank.api.lock_manager import LockManager
 from dummy_bank.api.main import create_app
 from dummy_bank.api.settings import Settings
+from dummy_bank.repository import ReplicaSet
 
 
 class TestGetSettings:
@@ -51,20 +53,6 @@ class TestGetLogger:
             assert response.status_code == 204
 
 
-class TestGetLockManager:
-    def test(self) -> None:
-        app = create_app(Settings(), Mock())
-
-        @app.get("/test", status_code=204)
-        def fn(lock_manager_dep: LockManagerDep) -> None:
-            assert isinstance(lock_manager_dep, LockManager)
-            return
-
-        with TestClient(app) as client:
-            response = client.get("/test")
-            assert response.status_code == 204
-
-
 class TestGetDatabaseEngine:
     def test(self) -> None:
         settings = Settings()
@@ -162,3 +150,88 @@ class TestGetAddressesRepository:
         with TestClient(app) as client:
             response = client.get("/test")
             assert response.status_code == 204
+
+
+class TestGetTransactionsRepository:
+    def test(self) -> None:
+        app = create_app(Settings(), Mock())
+
+        database_engine = Mock(spec=AsyncEngine)
+
+        def override_get_database_engine(request: Request) -> AsyncEngine:
+            return database_engine
+
+        app.dependency_overrides[get_database_engine] = override_get_database_engine
+
+        @app.get("/test", status_code=204)
+        def fn(transactions_repository: TransactionsRepositoryDep) -> None:
+            assert transactions_repository.engine == database_engine
+            return
+
+        with TestClient(app) as client:
+            response = client.get("/test")
+            assert response.status_code == 204
+
+
+class TestGetUnitOfWork:
+    def test_shared_between_repositories(self) -> None:
+        app = create_app(Settings(), Mock())
+
+        @app.get("/test", status_code=204)
+        def fn(
+            unit_of_work: UnitOfWorkDep,
+            customer_repository: CustomerRepositoryDep,
+            account_repository: AccountRepositoryDep,
+            address_repository: AddressesRepositoryDep,
+        ) -> None:
+            assert customer_repository.unit_of_work is unit_of_work
+            assert account_repository.unit_of_work is unit_of_work
+            assert address_repository.unit_of_work is unit_of_work
+            return
+
+        with TestClient(app) as client:
+            response = client.get("/test")
+            assert response.status_code == 204
+
+    def test_new_per_request(self) -> None:
+        app = create_app(Settings(), Mock())
+        seen = []
+
+        @app.get("/test", status_code=204)
+        def fn(unit_of_work: UnitOfWorkDep) -> None:
+            seen.append(unit_of_work)
+            return
+
+        with TestClient(app) as client:
+            client.get("/test")
+            client.get("/test")
+
+        assert len(seen) == 2
+        assert seen[0] is not seen[1]
+
+
+class TestGetReplicas:
+    def test_read_request(self) -> None:
+        app = create_app(Settings(DB_REPLICA_HOSTS=["127.0.0.1:1"]), Mock())
+
+        @app.get("/test", status_code=204)
+        def fn(customer_repository: CustomerRepositoryDep) -> None:
+            assert isinstance(customer_repository.replicas, ReplicaSet)
+            assert customer_repository.replicas.replicas[0].engine.url.port == 1
+            return
+
+        with TestClient(app) as client:
+            response = client.get("/test")
+            assert response.status_code == 204
+
+    def test_write_request(self) -> None:
+        app = create_app(Settings(), Mock())
+
+        @app.post("/test", status_code=204)
+        def fn(replicas: ReplicasDep) -> None:
+            assert replicas is None
+            return
+
+        with TestClient(app) as client:
+            response = client.post("/test")
+            assert response.status_code == 204
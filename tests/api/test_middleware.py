@@ -0,0 +1,85 @@
+from typing import AsyncIterator
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from dummy_bank.api.middleware import log_requests
+
+from ..repository.test_query_stats import run_statement
+
+
+def make_app(logger: Mock, query_budget: int) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(log_requests(logger, query_budget))
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        run_statement("select 1")
+        run_statement("select 2")
+        return {"id": item_id}
+
+    @app.get("/export")
+    async def export() -> StreamingResponse:
+        async def body() -> AsyncIterator[str]:
+            for n in range(3):
+                run_statement(f"select {n}")
+                yield f"{n}\n"
+
+        return StreamingResponse(body())
+
+    return app
+
+
+async def get(app: FastAPI, path: str) -> int:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return (await client.get(path)).status_code
+
+
+class TestLogRequests:
+    @pytest.mark.asyncio
+    async def test_within_budget(self) -> None:
+        logger = Mock()
+
+        assert await get(make_app(logger, query_budget=2), "/items/1") == 200
+
+        logger.info.assert_called_once()
+        event, fields = logger.info.call_args.args[0], logger.info.call_args.kwargs
+        assert event == "request"
+        assert fields["path"] == "/items/{item_id}"
+        assert fields["status_code"] == 200
+        assert fields["db_queries"] == 2
+        assert fields["db_slowest_statement"] in ("select 1", "select 2")
+        logger.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_over_budget(self) -> None:
+        logger = Mock()
+
+        await get(make_app(logger, query_budget=1), "/items/1")
+
+        logger.warning.assert_called_once()
+        assert logger.warning.call_args.args[0] == "query budget exceeded"
+        assert logger.warning.call_args.kwargs["query_budget"] == 1
+        logger.info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_streaming_response(self) -> None:
+        logger = Mock()
+
+        assert await get(make_app(logger, query_budget=5), "/export") == 200
+
+        logger.info.assert_called_once()
+        assert logger.info.call_args.kwargs["db_queries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_route(self) -> None:
+        logger = Mock()
+
+        assert await get(make_app(logger, query_budget=0), "/nothing") == 404
+
+        assert logger.info.call_args.kwargs["path"] == "/nothing"
+        assert logger.info.call_args.kwargs["db_queries"] == 0
@@ -1,6 +1,5 @@
 import os
-import uuid
-from typing import Any, AsyncIterator, Generator
+from typing import AsyncIterator
 from unittest.mock import Mock
 
 import pytest
@@ -11,18 +10,22 @@ from httpx import ASGITransport, AsyncClient
 from psycopg import Connection
 from pytest_postgresql import factories
 from sqlalchemy import URL
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from structlog.stdlib import BoundLogger
 
 from dummy_bank.api.dependencies import (
     get_account_repository,
     get_customer_repository,
     get_database_engine,
-    get_lock_manager,
     get_logger,
+    get_session_factory,
     get_settings,
 )
-from dummy_bank.api.lock_manager import LockManager
 from dummy_bank.api.main import create_app
 from dummy_bank.api.settings import Settings
 from dummy_bank.lib.geolocation_client import GoogleMapsClient
@@ -31,6 +34,7 @@ from dummy_bank.repository import (
     AccountsRepository,
     AddressesRepository,
     CustomerRepository,
+    TransactionsRepository,
 )
 
 pytest_plugins = [
@@ -91,7 +95,6 @@ async def database_engine(postgresql: Connection) -> AsyncIterator[AsyncEngine]:
 def app(
     database_engine: AsyncEngine,
     customer_repository: CustomerRepository,
-    lock_manager: LockManager,
     account_repository: AccountsRepository,
     logger: BoundLogger,
     settings: Settings,
@@ -102,9 +105,6 @@ def app(
     def override_get_account_repository() -> AccountsRepository:
         return account_repository
 
-    def override_get_lock_manager() -> LockManager:
-        return lock_manager
-
     def override_get_logger() -> BoundLogger:
         return logger
 
@@ -114,13 +114,16 @@ def app(
     def override_get_database_engine() -> AsyncEngine:
         return database_engine
 
+    def override_get_session_factory() -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(database_engine, expire_on_commit=False)
+
     app = create_app(settings=Settings(), logger=Mock())
     app.dependency_overrides[get_customer_repository] = override_get_customer_repository
     app.dependency_overrides[get_account_repository] = override_get_account_repository
-    app.dependency_overrides[get_lock_manager] = override_get_lock_manager
     app.dependency_overrides[get_logger] = override_get_logger
     app.dependency_overrides[get_settings] = override_get_settings
     app.dependency_overrides[get_database_engine] = override_get_database_engine
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
 
     return app
 
@@ -156,6 +159,13 @@ async def addresses_repository(database_engine: AsyncEngine) -> AddressesReposit
     return AddressesRepository(engine=database_engine)
 
 
+@pytest.fixture
+async def transactions_repository(
+    database_engine: AsyncEngine,
+) -> TransactionsRepository:
+    return TransactionsRepository(engine=database_engine)
+
+
 @pytest.fixture
 async def settings() -> Settings:
     return Settings()
@@ -181,16 +191,6 @@ def google_maps_api_key() -> str:
     return "dummy_secret"
 
 
-@pytest.fixture()
-def lock_manager() -> Generator[LockManager, Any, None]:
-    yield LockManager()
-
-
-@pytest.fixture()
-def lock_id() -> uuid.UUID:
-    return uuid.uuid4()
-
-
 @pytest.fixture()
 def google_maps_client(
     google_maps_url: str, google_maps_api_key: str
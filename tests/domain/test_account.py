@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from uuid import UUID
 
 import pytest
@@ -182,6 +183,14 @@ class TestBalance:
         with pytest.raises(ValueError):
             account.decrease_balance(5.67)
 
+    def test_to_cents(self) -> None:
+        assert Account.to_cents(9.97) == 997
+        assert Account.to_cents(100) == 10000
+
+    def test_to_cents_negative(self) -> None:
+        with pytest.raises(ValidationError):
+            Account.to_cents(-5.67)
+
     def test_is_not_new(self, make_account: MakeAccount) -> None:
         value = 100
         account = make_account(account_balance=value, is_new=False)
@@ -207,3 +216,23 @@ class TestFromRecord:
         assert account.account_balance == record.account_balance
         assert account.created_at == record.created_at
         assert account.updated_at == record.updated_at
+
+    def test_from_row(self) -> None:
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            account_type="credit",
+            account_number="1234",
+            account_balance=10000,
+            customer_id=uuid.uuid4(),
+            created_at=datetime.now(tz=timezone.utc),
+            updated_at=datetime.now(tz=timezone.utc),
+            version=1,
+        )
+        account = Account.from_record(row)
+        assert account.account_balance == 10000
+
+        account.increase_balance(1.5)
+        assert account.account_balance == 10150
+
+        with pytest.raises(AttributeError):
+            account.created_at = datetime.now(tz=timezone.utc)
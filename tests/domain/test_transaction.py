@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+from uuid import UUID
+
+import pytest
+from pydantic import ValidationError
+
+from dummy_bank.domain import Transaction, TransactionKind
+
+
+def make_transaction(kind: Any = TransactionKind.DEPOSIT) -> Transaction:
+    return Transaction(
+        id=UUID("be8f74c0-c7ff-4bd1-9d5b-6e224d6ce6bc"),
+        account_id=UUID("c668e0af-d1b9-412f-a1da-790e5905da26"),
+        created_at=datetime(2024, 8, 15, 16, 0, tzinfo=timezone.utc),
+        kind=kind,
+        amount=1050,
+        balance_after=2050,
+    )
+
+
+class TestTransaction:
+    def test_init(self) -> None:
+        transaction = make_transaction()
+
+        assert transaction.id == UUID("be8f74c0-c7ff-4bd1-9d5b-6e224d6ce6bc")
+        assert transaction.account_id == UUID("c668e0af-d1b9-412f-a1da-790e5905da26")
+        assert transaction.kind is TransactionKind.DEPOSIT
+        assert transaction.amount == 1050
+        assert transaction.balance_after == 2050
+        assert transaction.counterparty_account_id is None
+
+    def test_kind_from_string(self) -> None:
+        assert make_transaction(kind="withdrawal").kind is TransactionKind.WITHDRAWAL
+
+    def test_invalid_kind(self) -> None:
+        with pytest.raises(ValidationError):
+            make_transaction(kind="refund")
+
+    @pytest.mark.parametrize(
+        "field",
+        [
+            "id",
+            "account_id",
+            "created_at",
+            "kind",
+            "amount",
+            "balance_after",
+            "counterparty_account_id",
+        ],
+    )
+    def test_is_read_only(self, field: str) -> None:
+        transaction = make_transaction()
+
+        with pytest.raises(AttributeError):
+            setattr(transaction, field, None)
+
+    def test_from_record(self) -> None:
+        record = SimpleNamespace(
+            id=UUID("be8f74c0-c7ff-4bd1-9d5b-6e224d6ce6bc"),
+            account_id=UUID("c668e0af-d1b9-412f-a1da-790e5905da26"),
+            created_at=datetime(2024, 8, 15, 16, 0, tzinfo=timezone.utc),
+            kind="transfer_in",
+            amount=100,
+            balance_after=200,
+            counterparty_account_id=UUID("3f1a0b52-6f4e-4d5b-9d61-0b8d5d2b8c11"),
+        )
+
+        transaction = Transaction.from_record(record)
+
+        assert transaction.kind is TransactionKind.TRANSFER_IN
+        assert transaction.amount == 100
+        assert transaction.counterparty_account_id == record.counterparty_account_id
@@ -1,5 +1,6 @@
+import asyncio
 import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from freezegun import freeze_time
@@ -10,11 +11,17 @@ from dummy_bank.repository import (
     AccountsRepository,
     CustomerRepository,
     SearchCondition,
+    VersionConflictError,
 )
 
 from ..make_domain_objects import MakeAccount, MakeCustomer
 
 
+async def _balances(repository: AccountsRepository, *ids: UUID) -> list[int]:
+    accounts = [await repository.load_account_with_id(id) for id in ids]
+    return [account.account_balance for account in accounts if account is not None]
+
+
 class TestLoadAccountWithId:
     @pytest.mark.asyncio
     @freeze_time("2018-11-13T15:16:08")
@@ -239,3 +246,321 @@ class TestLoadAccount:
         condition = SearchCondition.model_validate({field: value})
         loaded = await account_repository.load_account(search_condition=condition)
         assert loaded is None
+
+
+class TestSaveAccounts:
+    @pytest.mark.parametrize(argnames="bulk_copy_threshold", argvalues=[1_000, 2])
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+        bulk_copy_threshold: int,
+    ) -> None:
+        account_repository.bulk_copy_threshold = bulk_copy_threshold
+
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+
+        accounts = [
+            make_account(
+                customer_id=customer.id, account_number=str(i), account_balance=i
+            )
+            for i in range(5)
+        ]
+        await account_repository.save_accounts(accounts)
+
+        loaded = await account_repository.load_account_with_customer_id(customer.id)
+        assert loaded is not None
+        assert {account.id: account.account_balance for account in loaded} == {
+            account.id: account.account_balance for account in accounts
+        }
+
+    @pytest.mark.parametrize(argnames="bulk_copy_threshold", argvalues=[1_000, 2])
+    @pytest.mark.asyncio
+    async def test_missing_customer(
+        self,
+        account_repository: AccountsRepository,
+        make_account: MakeAccount,
+        bulk_copy_threshold: int,
+    ) -> None:
+        account_repository.bulk_copy_threshold = bulk_copy_threshold
+
+        accounts = [make_account(account_number=str(i)) for i in range(3)]
+        with pytest.raises(IntegrityError):
+            await account_repository.save_accounts(accounts)
+
+
+class TestChangeBalance:
+    @pytest.mark.asyncio
+    async def test_increase(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        updated = await account_repository.increase_balance(account.id, 250)
+
+        assert updated is not None
+        assert updated.account_balance == 1250
+        assert updated.version == 2
+        loaded = await account_repository.load_account_with_id(account.id)
+        assert loaded is not None
+        assert loaded.account_balance == 1250
+
+        # the copy saved before the deposit is now out of date
+        with pytest.raises(VersionConflictError):
+            await account_repository.save_account(account)
+
+    @pytest.mark.asyncio
+    async def test_decrease(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        updated = await account_repository.decrease_balance(account.id, 1000)
+
+        assert updated is not None
+        assert updated.account_balance == 0
+
+    @pytest.mark.asyncio
+    async def test_decrease_insufficient_funds(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        with pytest.raises(ValueError, match="insufficient funds"):
+            await account_repository.decrease_balance(account.id, 1001)
+
+        loaded = await account_repository.load_account_with_id(account.id)
+        assert loaded is not None
+        assert loaded.account_balance == 1000
+
+    @pytest.mark.asyncio
+    async def test_beyond_32_bits(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=20_000_000)
+        await account_repository.save_account(account)
+
+        updated = await account_repository.increase_balance(account.id, 500_000_000)
+
+        assert updated is not None
+        assert updated.account_balance == 2_500_000_000
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, account_repository: AccountsRepository) -> None:
+        missing_id = UUID("ff5efd4c-c13c-4787-8a62-2941c0a5553c")
+
+        assert await account_repository.increase_balance(missing_id, 1) is None
+        assert await account_repository.decrease_balance(missing_id, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_account(account)
+
+        await asyncio.gather(
+            *(account_repository.increase_balance(account.id, 100) for _ in range(20))
+        )
+
+        loaded = await account_repository.load_account_with_id(account.id)
+        assert loaded is not None
+        assert loaded.account_balance == 2000
+
+
+class TestTransfer:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        source = make_account(customer_id=customer.id, account_balance=10)
+        target = make_account(customer_id=customer.id, account_balance=1)
+        await account_repository.save_accounts([source, target])
+
+        transferred = await account_repository.transfer(source.id, target.id, 250)
+
+        assert transferred is not None
+        assert [account.account_balance for account in transferred] == [750, 350]
+        assert await _balances(account_repository, source.id, target.id) == [
+            750,
+            350,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_insufficient_funds(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        source = make_account(customer_id=customer.id, account_balance=1)
+        target = make_account(customer_id=customer.id, account_balance=1)
+        await account_repository.save_accounts([source, target])
+
+        with pytest.raises(ValueError, match="insufficient funds"):
+            await account_repository.transfer(source.id, target.id, 101)
+
+        assert await _balances(account_repository, source.id, target.id) == [
+            100,
+            100,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_not_found(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        source = make_account(customer_id=customer.id, account_balance=1)
+        await account_repository.save_account(source)
+
+        missing_id = UUID("ff5efd4c-c13c-4787-8a62-2941c0a5553c")
+        assert await account_repository.transfer(source.id, missing_id, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_same_account(self, account_repository: AccountsRepository) -> None:
+        id = UUID("ff5efd4c-c13c-4787-8a62-2941c0a5553c")
+        with pytest.raises(ValueError, match="same account"):
+            await account_repository.transfer(id, id, 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_opposite_directions(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        first = make_account(customer_id=customer.id, account_balance=100)
+        second = make_account(customer_id=customer.id, account_balance=100)
+        await account_repository.save_accounts([first, second])
+
+        await asyncio.gather(
+            *(
+                account_repository.transfer(source.id, target.id, 100)
+                for _ in range(10)
+                for source, target in ((first, second), (second, first))
+            )
+        )
+
+        assert await _balances(account_repository, first.id, second.id) == [
+            10000,
+            10000,
+        ]
+
+
+class TestStreamAccounts:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        accounts = [
+            make_account(customer_id=customer.id, account_number=str(n))
+            for n in range(3)
+        ]
+        await account_repository.save_accounts(accounts)
+
+        batches = [
+            batch async for batch in account_repository.stream_accounts(batch_size=2)
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert {account.id for batch in batches for account in batch} == {
+            account.id for account in accounts
+        }
+
+    @pytest.mark.asyncio
+    async def test_empty(self, account_repository: AccountsRepository) -> None:
+        assert [batch async for batch in account_repository.stream_accounts()] == []
+
+
+class TestImportAccounts:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        created_at = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        id, orphan_id = uuid4(), uuid4()
+        rows = [
+            {
+                "id": account_id,
+                "customer_id": customer_id,
+                "created_at": created_at,
+                "account_type": "current",
+                "account_number": "12345678",
+                "account_balance": 5_000_000_000,
+            }
+            for account_id, customer_id in ((id, customer.id), (orphan_id, uuid4()))
+        ]
+
+        result = await account_repository.import_accounts(rows)
+
+        assert result.inserted == {id}
+        assert result.missing_parent == {orphan_id}
+        account = await account_repository.load_account_with_id(id)
+        assert account is not None
+        assert account.created_at == created_at
+        assert account.account_balance == 5_000_000_000
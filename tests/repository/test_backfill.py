@@ -0,0 +1,113 @@
+from typing import AsyncIterator
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from dummy_bank.repository import (
+    WIDENED_BALANCES,
+    AccountsRepository,
+    CustomerRepository,
+    DBAccount,
+    DBTransaction,
+    backfill_wide_columns,
+)
+
+from ..make_domain_objects import MakeAccount, MakeCustomer
+
+
+@pytest.fixture
+async def wide_columns(database_engine: AsyncEngine) -> AsyncIterator[None]:
+    """The wide copies added by migration c5e8a1f3b9d7, without its triggers."""
+    async with database_engine.begin() as conn:
+        for model, columns in WIDENED_BALANCES.items():
+            for column in columns:
+                await conn.execute(
+                    text(
+                        f"alter table {model.__tablename__} "
+                        f"add column {column}_wide bigint"
+                    )
+                )
+    yield
+
+
+@pytest.fixture
+async def accounts(
+    account_repository: AccountsRepository,
+    customer_repository: CustomerRepository,
+    make_account: MakeAccount,
+    make_customer: MakeCustomer,
+) -> list[UUID]:
+    customer = make_customer()
+    await customer_repository.save_customer(customer)
+    accounts = [
+        make_account(customer_id=customer.id, account_number=str(n)) for n in range(3)
+    ]
+    await account_repository.save_accounts(accounts)
+    for account in accounts:
+        await account_repository.increase_balance(account.id, 100)
+    return [account.id for account in accounts]
+
+
+async def _uncopied(engine: AsyncEngine, table: str, column: str) -> int:
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(
+                text(
+                    f"select count(*) from {table} "
+                    f"where {column}_wide is distinct from {column}"
+                )
+            )
+        ).scalar_one()
+
+
+class TestBackfillWideColumns:
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("wide_columns")
+    async def test_in_batches(
+        self, database_engine: AsyncEngine, accounts: list[UUID]
+    ) -> None:
+        async with database_engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "update accounts set account_balance_wide = account_balance "
+                    "where id = :id"
+                ),
+                {"id": accounts[0]},
+            )
+
+        batches = [
+            copied
+            async for copied in backfill_wide_columns(
+                database_engine, DBAccount, batch_size=2
+            )
+        ]
+
+        # rows that already have their copy are visited but left alone
+        assert len(batches) == 2
+        assert sum(batches) == 2
+        assert await _uncopied(database_engine, "accounts", "account_balance") == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("wide_columns", "accounts")
+    async def test_composite_key(self, database_engine: AsyncEngine) -> None:
+        batches = [
+            copied
+            async for copied in backfill_wide_columns(
+                database_engine, DBTransaction, batch_size=1
+            )
+        ]
+
+        assert batches == [1, 1, 1]
+        for column in ("amount", "balance_after"):
+            assert await _uncopied(database_engine, "transactions", column) == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("wide_columns")
+    async def test_empty(self, database_engine: AsyncEngine) -> None:
+        batches = [
+            copied async for copied in backfill_wide_columns(database_engine, DBAccount)
+        ]
+
+        assert batches == []
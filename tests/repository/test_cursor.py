@@ -0,0 +1,35 @@
+import datetime
+from uuid import UUID
+
+import pytest
+
+from dummy_bank.repository.cursor import Cursor, InvalidCursorError
+
+
+class TestCursor:
+    def test_round_trip(self) -> None:
+        cursor = Cursor(
+            created_at=datetime.datetime(
+                2018, 11, 13, 15, 16, 8, 123456, tzinfo=datetime.timezone.utc
+            ),
+            id=UUID("b9448b6a-c470-45e7-8de0-6b926065cd40"),
+        )
+
+        encoded = cursor.encode()
+
+        assert "=" not in encoded
+        assert Cursor.decode(encoded) == cursor
+
+    @pytest.mark.parametrize(
+        argnames="value",
+        argvalues=[
+            "",
+            "not a cursor",
+            "WyJub3QgYSBkYXRlIiwgIm5vdCBhIHV1aWQiXQ",
+            "eyJhIjogMX0",
+            "WzEsIDJd",
+        ],
+    )
+    def test_invalid(self, value: str) -> None:
+        with pytest.raises(InvalidCursorError, match="invalid cursor"):
+            Cursor.decode(value)
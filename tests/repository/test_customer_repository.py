@@ -1,13 +1,19 @@
 import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from freezegun import freeze_time
 from freezegun.api import FakeDatetime
 
-from dummy_bank.repository import CustomerRepository, SearchCondition
+from dummy_bank.repository import (
+    AccountsRepository,
+    AddressesRepository,
+    CustomerRepository,
+    SearchCondition,
+    VersionConflictError,
+)
 
-from ..make_domain_objects import MakeCustomer
+from ..make_domain_objects import MakeAccount, MakeAddress, MakeCustomer
 
 
 class TestLoadCustomerWithId:
@@ -88,6 +94,108 @@ class TestSaveCustomer:
         assert loaded.email == customer.email
         assert loaded.phone == customer.phone
 
+    @pytest.mark.asyncio
+    async def test_writes_back_timestamps(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+
+        loaded = await customer_repository.load_customer_with_id(customer.id)
+        assert loaded is not None
+        assert customer.created_at == loaded.created_at
+        assert customer.updated_at == loaded.updated_at
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_created_at(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        with freeze_time("2018-11-13T15:16:08"):
+            customer = make_customer()
+            await customer_repository.save_customer(customer)
+
+        with freeze_time("2019-01-01T00:00:00"):
+            # a fresh object for the same id updates the row it was based on
+            replacement = make_customer(id=customer.id, first_name="Robert")
+            replacement.version = customer.version
+            await customer_repository.save_customer(replacement)
+
+        assert replacement.created_at == FakeDatetime(
+            2018, 11, 13, 15, 16, 8, tzinfo=datetime.timezone.utc
+        )
+        assert replacement.updated_at == FakeDatetime(
+            2019, 1, 1, tzinfo=datetime.timezone.utc
+        )
+
+        loaded = await customer_repository.load_customer_with_id(customer.id)
+        assert loaded is not None
+        assert loaded.first_name == "Robert"
+        assert loaded.created_at == replacement.created_at
+        assert loaded.updated_at == replacement.updated_at
+
+    @pytest.mark.asyncio
+    async def test_increments_version(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        assert customer.version is None
+
+        await customer_repository.save_customer(customer)
+        assert customer.version == 1
+
+        customer.first_name = "Robert"
+        await customer_repository.save_customer(customer)
+        assert customer.version == 2
+
+        loaded = await customer_repository.load_customer_with_id(customer.id)
+        assert loaded is not None
+        assert loaded.version == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_version(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+
+        first = await customer_repository.load_customer_with_id(customer.id)
+        second = await customer_repository.load_customer_with_id(customer.id)
+        assert first is not None and second is not None
+
+        first.first_name = "First"
+        await customer_repository.save_customer(first)
+
+        second.first_name = "Second"
+        with pytest.raises(VersionConflictError):
+            await customer_repository.save_customer(second)
+
+        loaded = await customer_repository.load_customer_with_id(customer.id)
+        assert loaded is not None
+        assert loaded.first_name == "First"
+        assert loaded.version == 2
+
+    @pytest.mark.asyncio
+    async def test_new_object_for_existing_id(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+
+        with pytest.raises(VersionConflictError):
+            await customer_repository.save_customer(
+                make_customer(id=customer.id, first_name="Robert")
+            )
+
 
 class TestLoadCustomer:
     @pytest.mark.parametrize(argnames="field", argvalues=["id", "email"])
@@ -152,3 +260,223 @@ class TestLoadCustomer:
         condition = SearchCondition.model_validate({field: value})
         loaded = await customer_repository.load_customer(search_condition=condition)
         assert loaded is None
+
+
+class TestSaveCustomers:
+    @pytest.mark.parametrize(argnames="bulk_copy_threshold", argvalues=[1_000, 2])
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        bulk_copy_threshold: int,
+    ) -> None:
+        customer_repository.bulk_copy_threshold = bulk_copy_threshold
+
+        existing = make_customer(email="existing@example.com")
+        await customer_repository.save_customer(existing)
+
+        customers = [
+            make_customer(email=f"john.smith_{i}@example.com") for i in range(5)
+        ]
+        updated = make_customer(id=existing.id, first_name="Robert")
+        updated.version = existing.version
+        await customer_repository.save_customers([*customers, updated])
+
+        for customer in customers:
+            assert customer.created_at is not None
+            assert customer.updated_at is not None
+
+            loaded = await customer_repository.load_customer_with_id(customer.id)
+            assert loaded is not None
+            assert loaded.email == customer.email
+            assert loaded.created_at == customer.created_at
+
+        loaded = await customer_repository.load_customer_with_id(existing.id)
+        assert loaded is not None
+        assert loaded.first_name == "Robert"
+        assert loaded.created_at == existing.created_at
+        assert updated.created_at == existing.created_at
+
+    @pytest.mark.asyncio
+    async def test_empty(self, customer_repository: CustomerRepository) -> None:
+        await customer_repository.save_customers([])
+
+    @pytest.mark.parametrize(argnames="bulk_copy_threshold", argvalues=[1_000, 2])
+    @pytest.mark.asyncio
+    async def test_stale_version(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        bulk_copy_threshold: int,
+    ) -> None:
+        customer_repository.bulk_copy_threshold = bulk_copy_threshold
+
+        existing = make_customer()
+        await customer_repository.save_customer(existing)
+        stale = make_customer(id=existing.id, first_name="Robert")
+        customers = [make_customer() for _ in range(3)]
+
+        with pytest.raises(VersionConflictError):
+            await customer_repository.save_customers([*customers, stale])
+
+        # nothing is written, not even the rows that were up to date
+        for customer in customers:
+            assert await customer_repository.load_customer_with_id(customer.id) is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_last_wins(
+        self,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        first = make_customer(first_name="First")
+        second = make_customer(id=first.id, first_name="Second")
+        await customer_repository.save_customers([first, second])
+
+        loaded = await customer_repository.load_customer_with_id(first.id)
+        assert loaded is not None
+        assert loaded.first_name == "Second"
+
+
+class TestLoadCustomerOverview:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        customer_repository: CustomerRepository,
+        account_repository: AccountsRepository,
+        addresses_repository: AddressesRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+        make_address: MakeAddress,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        accounts = [make_account(customer_id=customer.id) for _ in range(2)]
+        for account in accounts:
+            await account_repository.save_account(account)
+        address = make_address(customer_id=customer.id, building_name=None)
+        await addresses_repository.save_address(address)
+
+        overview = await customer_repository.load_customer_overview(customer.id)
+
+        assert overview is not None
+        loaded_customer, loaded_accounts, loaded_addresses = overview
+        assert loaded_customer.__dict__ == customer.__dict__
+        assert [a.__dict__ for a in loaded_accounts] == [a.__dict__ for a in accounts]
+        assert [a.__dict__ for a in loaded_addresses] == [address.__dict__]
+
+    @pytest.mark.asyncio
+    async def test_no_accounts_or_addresses(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+
+        overview = await customer_repository.load_customer_overview(customer.id)
+
+        assert overview is not None
+        assert overview[1:] == ([], [])
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, customer_repository: CustomerRepository) -> None:
+        assert await customer_repository.load_customer_overview(uuid4()) is None
+
+
+class TestSearchCustomers:
+    @pytest.mark.asyncio
+    async def test_ranks_matches(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        exact = make_customer(first_name="Margaret", last_name="Thornton")
+        close = make_customer(first_name="Margot", last_name="Thorntons")
+        other = make_customer(first_name="Bob", last_name="Smith")
+        await customer_repository.save_customers([exact, close, other])
+
+        customers = await customer_repository.search_customers("thornton")
+
+        assert [customer.id for customer in customers] == [exact.id, close.id]
+
+    @pytest.mark.asyncio
+    async def test_email_and_phone(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        by_email = make_customer(email="quentin.blake@example.com")
+        by_phone = make_customer(phone="07700 900461")
+        await customer_repository.save_customers([by_email, by_phone])
+
+        assert [
+            customer.id
+            for customer in await customer_repository.search_customers("qentin.blake")
+        ] == [by_email.id]
+        assert [
+            customer.id
+            for customer in await customer_repository.search_customers("900461")
+        ] == [by_phone.id]
+
+    @pytest.mark.asyncio
+    async def test_limit(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        await customer_repository.save_customers(
+            make_customer(last_name="Featherstone") for _ in range(3)
+        )
+
+        customers = await customer_repository.search_customers("featherstone", limit=2)
+
+        assert len(customers) == 2
+
+
+class TestStreamCustomers:
+    @pytest.mark.asyncio
+    async def test(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        customers = [make_customer() for _ in range(3)]
+        await customer_repository.save_customers(customers)
+
+        batches = [
+            batch async for batch in customer_repository.stream_customers(batch_size=2)
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert {c.id for batch in batches for c in batch} == {c.id for c in customers}
+
+
+class TestImportCustomers:
+    @staticmethod
+    def _row(email: str) -> dict:
+        return {
+            "id": uuid4(),
+            "created_at": None,
+            "first_name": "Bob",
+            "middle_names": None,
+            "last_name": "Bobbington",
+            "email": email,
+            "phone": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test(
+        self, customer_repository: CustomerRepository, make_customer: MakeCustomer
+    ) -> None:
+        existing = make_customer(email="bob@example.com")
+        await customer_repository.save_customer(existing)
+        new = self._row("new@example.com")
+        same_id = {**self._row("other@example.com"), "id": existing.id}
+        same_email = self._row("BOB@example.com")
+
+        result = await customer_repository.import_customers([new, same_id, same_email])
+
+        assert result.inserted == {new["id"]}
+        assert result.missing_parent == set()
+        stored = await customer_repository.load_customer_with_id(new["id"])
+        assert stored is not None
+        assert stored.email == "new@example.com"
+        assert stored.created_at == stored.updated_at
+
+    @pytest.mark.asyncio
+    async def test_empty(self, customer_repository: CustomerRepository) -> None:
+        result = await customer_repository.import_customers([])
+
+        assert result == (set(), set())
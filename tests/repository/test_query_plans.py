@@ -0,0 +1,291 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, cast
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from dummy_bank.repository import (
+    AccountsRepository,
+    CountMode,
+    CustomerRepository,
+    DBAccount,
+    DBAddress,
+    DBCustomer,
+    DBTransaction,
+    Repository,
+    SortOrder,
+    TransactionsRepository,
+)
+
+# big enough that the planner prefers an index over reading the whole table,
+# whenever the table has a suitable one
+_CUSTOMERS = 10_000
+_TRANSACTIONS_PER_ACCOUNT = 5
+_LARGE_TABLES = ("customers", "accounts", "addresses", "transactions")
+
+_SEED = [
+    f"""
+    insert into customers
+        (id, created_at, updated_at, first_name, last_name, email, phone)
+    select
+        gen_random_uuid(),
+        timestamptz '2025-01-01' + n * interval '1 minute',
+        now(),
+        'first' || n,
+        'last' || n,
+        'customer' || n || '@example.com',
+        '07700' || lpad(n::text, 6, '0')
+    from generate_series(1, {_CUSTOMERS}) as n
+    """,
+    """
+    insert into accounts
+        (id, customer_id, created_at, updated_at, account_number, account_type,
+        account_balance)
+    select
+        gen_random_uuid(), id, created_at, now(), substr(md5(id::text), 1, 8),
+        'current', 10000
+    from customers
+    """,
+    """
+    insert into addresses
+        (id, customer_id, created_at, updated_at, building_number, street, town,
+        post_code, country)
+    select
+        gen_random_uuid(), id, created_at, now(), '1', 'High Street', 'London',
+        upper(substr(md5(id::text), 1, 3)) || ' 1AA', 'United Kingdom'
+    from customers
+    """,
+    f"""
+    insert into transactions (id, created_at, account_id, kind, amount, balance_after)
+    select
+        gen_random_uuid(), accounts.created_at + n * interval '1 day', accounts.id,
+        'deposit', 2000, 10000 + 2000 * n
+    from accounts, generate_series(1, {_TRANSACTIONS_PER_ACCOUNT}) as n
+    """,
+    "analyze",
+]
+
+_AT = datetime(2025, 1, 3, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def seeded(database_engine: AsyncEngine) -> dict[str, Any]:
+    """Fill the tables, and return a couple of customers' rows to look up."""
+    rows: dict[str, Any] = {}
+    async with database_engine.begin() as conn:
+        for statement in _SEED:
+            await conn.execute(text(statement))
+
+        for key, n in (("customer", 5000), ("other", 5001)):
+            customer = (
+                await conn.execute(
+                    text("select * from customers where first_name = :name"),
+                    {"name": f"first{n}"},
+                )
+            ).one()
+            for table in ("accounts", "addresses"):
+                rows[f"{key}_{table}"] = (
+                    await conn.execute(
+                        text(f"select * from {table} where customer_id = :id"),
+                        {"id": customer.id},
+                    )
+                ).one()
+            rows[key] = customer
+
+    return rows
+
+
+def _page(
+    model: Any,
+    filters: dict[str, Any],
+    count: CountMode = CountMode.EXACT,
+    after: Any = None,
+    sort: SortOrder = SortOrder.OLDEST_FIRST,
+) -> tuple[ClauseElement, dict[str, Any]]:
+    """A page statement as ``Repository._load_page`` would run it."""
+    params: dict[str, Any] = {**Repository._filter_params(filters), "limit": 51}
+    if after is None:
+        params["offset"] = 0
+    else:
+        params["after_created_at"] = after.created_at
+        params["after_id"] = after.id
+
+    stmt = Repository._page_statement(model, filters, count, after is not None, sort)
+    return stmt, params
+
+
+def _select(
+    model: Any, filters: dict[str, Any]
+) -> tuple[ClauseElement, dict[str, Any]]:
+    stmt = Repository._select_statement(model, filters)
+    return stmt, Repository._filter_params(filters)
+
+
+# every statement the repositories run against a large table, with the parameters
+# to plan it for. Counting a whole unfiltered list is left out, as an exact count
+# has to read every row by definition, see ``CountMode``, and so is the exact
+# count an estimated one only runs without statistics, see ``_counts_whole_table``.
+_STATEMENTS: dict[
+    str, Callable[[dict[str, Any]], tuple[ClauseElement, dict[str, Any]]]
+] = {
+    "customers page": lambda rows: _page(DBCustomer, {}, CountMode.ESTIMATED),
+    "customers page after cursor": lambda rows: _page(
+        DBCustomer, {}, CountMode.NONE, after=rows["customer"]
+    ),
+    "customers page newest first": lambda rows: _page(
+        DBCustomer,
+        {},
+        CountMode.NONE,
+        after=rows["customer"],
+        sort=SortOrder.NEWEST_FIRST,
+    ),
+    "customers page by last name prefix": lambda rows: _page(
+        DBCustomer, {"last_name__prefix": "LAST12"}
+    ),
+    "customers page by email prefix": lambda rows: _page(
+        DBCustomer, {"email__prefix": "customer12"}
+    ),
+    "customers page created after": lambda rows: _page(
+        DBCustomer,
+        {"created_at__gte": datetime(2025, 1, 7, 12, tzinfo=timezone.utc)},
+    ),
+    "customer by email": lambda rows: _select(
+        DBCustomer, {"email__iexact": rows["customer"].email.upper()}
+    ),
+    "customers with ids": lambda rows: (
+        Repository._select_with_ids_statement(DBCustomer),
+        {"ids": [rows["customer"].id, rows["other"].id]},
+    ),
+    "customer overview": lambda rows: (
+        CustomerRepository._overview_statement(),
+        {"id": rows["customer"].id},
+    ),
+    "customer search": lambda rows: (
+        CustomerRepository._search_statement(),
+        {"q": rows["customer"].last_name, "limit": 20},
+    ),
+    "accounts page": lambda rows: _page(
+        DBAccount, {"customer_id": rows["customer"].id}
+    ),
+    "accounts page by type and balance": lambda rows: _page(
+        DBAccount,
+        {
+            "customer_id": rows["customer"].id,
+            "account_type__in": ["current"],
+            "account_balance__gte": 0,
+        },
+    ),
+    "account by number": lambda rows: _select(
+        DBAccount,
+        {
+            "customer_id": rows["customer"].id,
+            "account_number": rows["customer_accounts"].account_number,
+            "account_type": "current",
+        },
+    ),
+    "accounts locked for a transfer": lambda rows: (
+        AccountsRepository._select_for_update_statement(),
+        {"ids": [rows["customer_accounts"].id, rows["other_accounts"].id]},
+    ),
+    "deposit": lambda rows: (
+        AccountsRepository._change_balance_statement(decrease=False),
+        {"id": rows["customer_accounts"].id, "amount": 100, "now": _AT},
+    ),
+    "withdrawal": lambda rows: (
+        AccountsRepository._change_balance_statement(decrease=True),
+        {"id": rows["customer_accounts"].id, "amount": 100, "now": _AT},
+    ),
+    "transfer": lambda rows: (
+        AccountsRepository._transfer_statement(),
+        {
+            "ids": [rows["customer_accounts"].id, rows["other_accounts"].id],
+            "from_id": rows["customer_accounts"].id,
+            "to_id": rows["other_accounts"].id,
+            "amount": 100,
+            "now": _AT,
+        },
+    ),
+    "addresses page": lambda rows: _page(
+        DBAddress, {"customer_id": rows["customer"].id}
+    ),
+    "address by post code": lambda rows: _select(
+        DBAddress,
+        {
+            "customer_id": rows["customer"].id,
+            "post_code": rows["customer_addresses"].post_code,
+        },
+    ),
+    "transactions page": lambda rows: _page(
+        DBTransaction,
+        {"account_id": rows["customer_accounts"].id, "kind__in": ["deposit"]},
+        after=rows["customer_accounts"],
+    ),
+    "balance replayed forward": lambda rows: (
+        TransactionsRepository._replay_forward_statement(),
+        {"account_id": rows["customer_accounts"].id, "at": _AT},
+    ),
+    "balance replayed backward": lambda rows: (
+        TransactionsRepository._replay_backward_statement(),
+        {"account_id": rows["customer_accounts"].id, "at": _AT},
+    ),
+}
+
+
+async def _explain(
+    conn: AsyncConnection, stmt: ClauseElement, params: dict[str, Any]
+) -> dict[str, Any]:
+    """The plan Postgres picks for ``stmt`` with ``params``, without running it."""
+    compiled = cast(SQLCompiler, stmt.compile(dialect=conn.dialect))
+    values = compiled.construct_params(params)
+    args = tuple(values[name] for name in compiled.positiontup or ())
+    result = await conn.exec_driver_sql(f"explain (format json) {compiled}", args)
+    return result.scalar_one()[0]["Plan"]
+
+
+def _nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _counts_whole_table(plan: dict[str, Any]) -> bool:
+    """
+    Whether ``plan`` is an init plan counting every row of a table, like the
+    estimated count falls back to for a table without statistics.
+    """
+    return (
+        plan.get("Parent Relationship") == "InitPlan"
+        and plan["Node Type"] == "Aggregate"
+        and not any("Filter" in node or "Index Cond" in node for node in _nodes(plan))
+    )
+
+
+def _seq_scans(plan: dict[str, Any]) -> Iterator[str]:
+    if _counts_whole_table(plan):
+        return
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+class TestQueryPlans:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", list(_STATEMENTS))
+    async def test_no_sequential_scans(
+        self, database_engine: AsyncEngine, seeded: dict[str, Any], name: str
+    ) -> None:
+        stmt, params = _STATEMENTS[name](seeded)
+
+        async with database_engine.connect() as conn:
+            plan = await _explain(conn, stmt, params)
+
+        scanned = [
+            relation
+            for relation in _seq_scans(plan)
+            if relation.startswith(_LARGE_TABLES)
+        ]
+        assert not scanned, f"{name} reads all of {scanned}"
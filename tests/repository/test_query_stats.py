@@ -0,0 +1,74 @@
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from dummy_bank.repository.query_stats import (
+    QueryStats,
+    _after_execute,
+    _before_execute,
+)
+
+
+def run_statement(statement: str) -> None:
+    context = Mock()
+    _before_execute(None, None, statement, None, context)
+    _after_execute(None, None, statement, None, context)
+
+
+class TestQueryStats:
+    def test_record(self) -> None:
+        stats = QueryStats()
+        stats.record("select 1", 0.1)
+        stats.record("select 2", 0.3)
+        stats.record("select 3", 0.2)
+
+        assert stats.stats() == {
+            "db_queries": 3,
+            "db_time": 0.6,
+            "db_slowest_time": 0.3,
+            "db_slowest_statement": "select 2",
+        }
+
+    def test_untracked(self) -> None:
+        run_statement("select 1")
+
+    def test_track(self) -> None:
+        with QueryStats.track() as outer:
+            run_statement("select 1")
+            with QueryStats.track() as inner:
+                run_statement("select 2")
+            run_statement("select 3")
+
+        assert outer.count == 2
+        assert inner.count == 1
+        assert inner.slowest_statement == "select 2"
+
+    @pytest.mark.asyncio
+    async def test_attach(self, database_engine: AsyncEngine) -> None:
+        QueryStats.attach(database_engine)
+
+        with QueryStats.track() as stats:
+            async with database_engine.connect() as conn:
+                await conn.execute(text("select 1"))
+                await conn.execute(text("select pg_sleep(0.01)"))
+
+        assert stats.count == 2
+        assert stats.slowest_statement == "select pg_sleep(0.01)"
+        assert stats.total_time >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_attach_failed_statement(self, database_engine: AsyncEngine) -> None:
+        QueryStats.attach(database_engine)
+
+        with QueryStats.track() as stats:
+            async with database_engine.connect() as conn:
+                with pytest.raises(DBAPIError):
+                    await conn.execute(text("select 1 / 0"))
+                await conn.rollback()
+                await conn.execute(text("select pg_sleep(0.01)"))
+
+        assert stats.count == 2
+        assert stats.slowest_statement == "select pg_sleep(0.01)"
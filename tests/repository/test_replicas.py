@@ -0,0 +1,116 @@
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dummy_bank.repository import CustomerRepository, ReplicaSet, UnitOfWork
+
+
+def make_engine(lag: float | None = 0.0) -> MagicMock:
+    """An engine whose replication lag query returns ``lag``, or fails if None."""
+    engine = MagicMock()
+    conn = AsyncMock()
+    if lag is None:
+        engine.connect.return_value.__aenter__.side_effect = OSError("unreachable")
+    else:
+        conn.execute.return_value = Mock(scalar_one=Mock(return_value=lag))
+        engine.connect.return_value.__aenter__.return_value = conn
+    return engine
+
+
+class TestNext:
+    def test_round_robin(self) -> None:
+        replicas = ReplicaSet([make_engine(), make_engine()], max_lag=1)
+        first, second = replicas.replicas
+
+        assert [replicas.next() for _ in range(4)] == [first, second, first, second]
+
+    def test_skips_unhealthy(self) -> None:
+        replicas = ReplicaSet([make_engine(), make_engine()], max_lag=1)
+        first, second = replicas.replicas
+        first.healthy = False
+
+        assert [replicas.next() for _ in range(2)] == [second, second]
+
+    def test_none_healthy(self) -> None:
+        replicas = ReplicaSet([make_engine()], max_lag=1)
+        replicas.replicas[0].healthy = False
+
+        assert replicas.next() is None
+
+
+class TestCheck:
+    @pytest.mark.asyncio
+    async def test_ejects_lagging(self) -> None:
+        replicas = ReplicaSet([make_engine(0.5), make_engine(10)], max_lag=1)
+        await replicas.check()
+
+        assert [replica.healthy for replica in replicas.replicas] == [True, False]
+        assert [replica.lag for replica in replicas.replicas] == [0.5, 10]
+
+    @pytest.mark.asyncio
+    async def test_ejects_unreachable(self) -> None:
+        replicas = ReplicaSet([make_engine(None)], max_lag=1)
+        await replicas.check()
+
+        assert not replicas.replicas[0].healthy
+        assert replicas.replicas[0].lag is None
+
+    @pytest.mark.asyncio
+    async def test_restores_caught_up(self) -> None:
+        replicas = ReplicaSet([make_engine(0)], max_lag=1)
+        replicas.replicas[0].healthy = False
+        await replicas.check()
+
+        assert replicas.replicas[0].healthy
+
+
+class TestRouting:
+    @staticmethod
+    def make_replicas() -> tuple[ReplicaSet, Mock]:
+        replicas = ReplicaSet([make_engine()], max_lag=1)
+        replica_session = Mock(spec=AsyncSession)
+        replica_session_factory = MagicMock()
+        replica_session_factory.return_value.__aenter__.return_value = replica_session
+        replicas.replicas[0].session_factory = replica_session_factory
+        return replicas, replica_session
+
+    @pytest.mark.asyncio
+    async def test_reads_from_replica(self) -> None:
+        replicas, replica_session = self.make_replicas()
+        unit_of_work = UnitOfWork(Mock(return_value=Mock(spec=AsyncSession)))
+        repository = CustomerRepository(
+            Mock(), unit_of_work=unit_of_work, replicas=replicas
+        )
+
+        async with repository._session(read_only=True) as session:
+            assert session is replica_session
+
+        async with repository._session() as session:
+            assert session is unit_of_work.session
+
+    @pytest.mark.asyncio
+    async def test_reads_after_write_from_primary(self) -> None:
+        replicas, _ = self.make_replicas()
+        unit_of_work = UnitOfWork(Mock(return_value=AsyncMock(spec=AsyncSession)))
+        repository = CustomerRepository(
+            Mock(), unit_of_work=unit_of_work, replicas=replicas
+        )
+
+        await repository._commit(unit_of_work.session)
+
+        assert repository.has_written
+        async with repository._session(read_only=True) as session:
+            assert session is unit_of_work.session
+
+    @pytest.mark.asyncio
+    async def test_reads_from_primary_without_healthy_replica(self) -> None:
+        replicas, _ = self.make_replicas()
+        replicas.replicas[0].healthy = False
+        unit_of_work = UnitOfWork(Mock(return_value=Mock(spec=AsyncSession)))
+        repository = CustomerRepository(
+            Mock(), unit_of_work=unit_of_work, replicas=replicas
+        )
+
+        async with repository._session(read_only=True) as session:
+            assert session is unit_of_work.session
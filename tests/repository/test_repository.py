@@ -1,11 +1,13 @@
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
 
 import pytest
 from sqlalchemy import URL
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.pool import NullPool
 
-from dummy_bank.repository import Repository
+from dummy_bank.repository import CountMode, DBAccount, Repository, SortOrder
 from dummy_bank.repository.db_customer import DBCustomer
 
 
@@ -66,3 +68,131 @@ class TestGetCount:
 
             mock_session.execute.assert_called_once()
             assert count == 10
+
+
+class TestCountStatement:
+    def test_none(self) -> None:
+        assert Repository._count_statement(DBCustomer, CountMode.NONE) is None
+
+    def test_exact(self) -> None:
+        stmt = Repository._count_statement(DBCustomer, CountMode.EXACT)
+        assert stmt is not None
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "count(*)" in sql
+        assert "FROM customers" in sql
+
+    def test_estimated(self) -> None:
+        stmt = Repository._count_statement(DBCustomer, CountMode.ESTIMATED)
+        assert stmt is not None
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "pg_class.reltuples" in sql
+        # counted exactly only for a table without statistics
+        assert "WHEN (pg_class.reltuples > " in sql
+        assert "ELSE (SELECT count(*) AS count_1 \nFROM customers)" in sql
+
+    def test_estimated_with_filter_is_exact(self) -> None:
+        stmt = Repository._count_statement(
+            DBAccount, CountMode.ESTIMATED, {"customer_id": uuid4()}
+        )
+        assert stmt is not None
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "count(*)" in sql
+        assert "accounts.customer_id" in sql
+
+    def test_is_cached(self) -> None:
+        first = Repository._count_statement(
+            DBAccount, CountMode.EXACT, {"customer_id": uuid4()}
+        )
+        second = Repository._count_statement(
+            DBAccount, CountMode.EXACT, {"customer_id": uuid4()}
+        )
+        assert first is second
+
+
+class TestSelectStatement:
+    def test_binds_values(self) -> None:
+        stmt = Repository._select_statement(DBAccount, {"customer_id": uuid4()})
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "accounts.customer_id = %(customer_id)s" in sql
+
+    def test_none_is_null(self) -> None:
+        stmt = Repository._select_statement(DBAccount, {"customer_id": None})
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "accounts.customer_id IS NULL" in sql
+
+    def test_lookups(self) -> None:
+        stmt = Repository._select_statement(
+            DBCustomer,
+            {
+                "id__in": [uuid4()],
+                "created_at__gt": None,
+                "created_at__lte": None,
+                "email__prefix": "jo",
+                "email__iexact": "jo@example.com",
+            },
+        )
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "customers.id = ANY (%(id__in)s::UUID[])" in sql
+        assert "customers.created_at > %(created_at__gt)s" in sql
+        assert "customers.created_at <= %(created_at__lte)s" in sql
+        assert "lower(customers.email) LIKE %(email__prefix)s" in sql
+        assert "lower(customers.email) = %(email__iexact)s" in sql
+
+    @pytest.mark.parametrize("key", ["nope", "email__nope"])
+    def test_unknown_filter(self, key: str) -> None:
+        with pytest.raises(ValueError, match=f"cannot filter customers by {key}"):
+            Repository._select_statement(DBCustomer, {key: 1})
+
+
+class TestFilterParams:
+    def test_prefix_is_escaped(self) -> None:
+        assert Repository._filter_params(
+            {"email__prefix": "Jo_n%\\", "email": "John@example.com"}
+        ) == {"email__prefix": "jo\\_n\\%\\\\%", "email": "John@example.com"}
+
+    def test_iexact_is_lowered(self) -> None:
+        assert Repository._filter_params(
+            {"email__iexact": "John@Example.com", "last_name__iexact": None}
+        ) == {"email__iexact": "john@example.com", "last_name__iexact": None}
+
+
+class TestPageStatement:
+    def test_offset(self) -> None:
+        stmt = Repository._page_statement(
+            DBAccount, {"customer_id": uuid4()}, CountMode.EXACT, after_cursor=False
+        )
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "LIMIT %(limit)s OFFSET %(offset)s" in sql
+        assert "total_count" in sql
+
+    def test_after_cursor(self) -> None:
+        stmt = Repository._page_statement(
+            DBAccount, {"customer_id": uuid4()}, CountMode.NONE, after_cursor=True
+        )
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "> (%(after_created_at)s, %(after_id)s::UUID)" in sql
+        assert "created_at >= %(after_created_at)s" in sql
+        assert "OFFSET" not in sql
+        assert "total_count" not in sql
+
+    def test_newest_first(self) -> None:
+        stmt = Repository._page_statement(
+            DBAccount,
+            {"customer_id": uuid4()},
+            CountMode.NONE,
+            after_cursor=True,
+            sort=SortOrder.NEWEST_FIRST,
+        )
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "< (%(after_created_at)s, %(after_id)s::UUID)" in sql
+        assert "created_at <= %(after_created_at)s" in sql
+        assert "ORDER BY accounts.created_at DESC, accounts.id DESC" in sql
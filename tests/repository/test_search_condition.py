@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from dummy_bank.repository import SearchCondition, SortOrder
+
+
+class TestAsFilterByKwargs:
+    def test_equality(self) -> None:
+        customer_id = uuid4()
+        condition = SearchCondition(customer_id=customer_id, account_type=None)
+
+        assert condition.as_filter_by_kwargs() == {
+            "customer_id": customer_id,
+            "account_type": None,
+        }
+
+    def test_lookups(self) -> None:
+        after = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        condition = SearchCondition(
+            account_types=["current", "savings"],
+            created_after=after,
+            created_before=None,
+            min_balance=100,
+            email="Jo@example.com",
+            email_prefix="jo",
+            sort=SortOrder.NEWEST_FIRST,
+        )
+
+        assert condition.as_filter_by_kwargs() == {
+            "account_type__in": ["current", "savings"],
+            "created_at__gte": after,
+            "account_balance__gte": 100,
+            "email__iexact": "Jo@example.com",
+            "email__prefix": "jo",
+        }
+
+    def test_no_email(self) -> None:
+        assert SearchCondition(email=None).as_filter_by_kwargs() == {"email": None}
+
+    def test_empty_prefix(self) -> None:
+        with pytest.raises(ValidationError):
+            SearchCondition(last_name_prefix="")
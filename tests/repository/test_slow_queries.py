@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from dummy_bank.repository import DBCustomer
+from dummy_bank.repository.slow_queries import SlowQueryLog, redact
+
+
+class TestRedact:
+    def test(self) -> None:
+        assert redact(
+            {
+                "id": UUID("9a4bdb0b-43cf-4efc-8a4c-260f8e117d9d"),
+                "email": "customer@example.com",
+                "email_1": "customer@example.com",
+                "last_name__prefix": "smi%",
+                "q": "smith",
+                "phone": None,
+                "limit": 51,
+                "now": datetime(2025, 1, 1, tzinfo=timezone.utc),
+            }
+        ) == {
+            "id": "9a4bdb0b-43cf-4efc-8a4c-260f8e117d9d",
+            "email": "<redacted>",
+            "email_1": "<redacted>",
+            "last_name__prefix": "<redacted>",
+            "q": "<redacted>",
+            "phone": None,
+            "limit": 51,
+            "now": "2025-01-01 00:00:00+00:00",
+        }
+
+    def test_multi_row_values(self) -> None:
+        stmt = insert(DBCustomer).values(
+            [
+                {"id": uuid4(), "first_name": "Bob", "email": "bob@example.com"},
+                {"id": uuid4(), "first_name": "Sue", "email": "sue@example.com"},
+            ]
+        )
+        parameters = stmt.compile(dialect=postgresql.dialect()).params
+
+        redacted = redact(parameters)
+
+        assert {"first_name_m0", "email_m1"} <= set(redacted)
+        assert not {"Bob", "Sue", "bob@example.com", "sue@example.com"} & set(
+            redacted.values()
+        )
+        assert redacted["id_m0"] == str(parameters["id_m0"])
+
+
+class TestSlowQueryLog:
+    @pytest.mark.asyncio
+    async def test_logs_once_with_plan(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        slow_queries = SlowQueryLog(threshold=0, logger=logger)
+        slow_queries.attach(database_engine)
+
+        statement = text("select * from customers where email = :email")
+        async with database_engine.connect() as conn:
+            for _ in range(2):
+                await conn.execute(statement, {"email": "customer@example.com"})
+        await asyncio.gather(*slow_queries._tasks)
+
+        logger.warning.assert_called_once()
+        assert logger.warning.call_args.args[0] == "slow query"
+        assert logger.warning.call_args.kwargs["parameters"] == {"email": "<redacted>"}
+
+        logger.info.assert_called_once()
+        assert logger.info.call_args.args[0] == "slow query plan"
+        plan = logger.info.call_args.kwargs["plan"]
+        assert "customers" in plan
+        assert "customer@example.com" not in plan
+
+    @pytest.mark.asyncio
+    async def test_below_threshold(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        SlowQueryLog(threshold=60, logger=logger).attach(database_engine)
+
+        async with database_engine.connect() as conn:
+            await conn.execute(text("select 1"))
+
+        logger.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_not_explainable(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        slow_queries = SlowQueryLog(threshold=0, logger=logger)
+        slow_queries.attach(database_engine)
+
+        async with database_engine.connect() as conn:
+            await conn.execute(text("set local statement_timeout = 0"))
+
+        assert not slow_queries._tasks
+        logger.warning.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_explain_fails(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        slow_queries = SlowQueryLog(threshold=0, logger=logger)
+        slow_queries.attach(database_engine)
+
+        # the plan is prepared on another connection, which cannot see the table
+        async with database_engine.connect() as conn:
+            await conn.execute(text("create temporary table scratch (x integer)"))
+            await conn.execute(text("select * from scratch"))
+        await asyncio.gather(*slow_queries._tasks)
+
+        assert logger.warning.call_args.args[0] == "failed to explain slow query"
+
+    @pytest.mark.asyncio
+    async def test_max_shapes(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        slow_queries = SlowQueryLog(threshold=0, logger=logger, max_shapes=1)
+        slow_queries.attach(database_engine)
+
+        async with database_engine.connect() as conn:
+            await conn.execute(text("select 1"))
+            await conn.execute(text("select 2"))
+        await asyncio.gather(*slow_queries._tasks)
+
+        logger.warning.assert_called_once()
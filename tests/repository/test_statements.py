@@ -0,0 +1,61 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from dummy_bank.repository.statements import StatementRegistry
+
+
+class TestGet:
+    def test_builds_once(self) -> None:
+        registry = StatementRegistry()
+        build = Mock(return_value=object())
+
+        first = registry.get("key", build)
+        second = registry.get("key", build)
+
+        assert first is second
+        build.assert_called_once()
+
+    def test_keys_are_separate(self) -> None:
+        registry = StatementRegistry()
+
+        first = registry.get("first", object)
+        second = registry.get("second", object)
+
+        assert first is not second
+        assert len(registry) == 2
+
+
+class TestStats:
+    def test_empty(self) -> None:
+        assert StatementRegistry().stats() == {
+            "statements": 0,
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": 0.0,
+        }
+
+    def test(self) -> None:
+        registry = StatementRegistry()
+        for _ in range(4):
+            registry.get("key", object)
+
+        assert registry.stats() == {
+            "statements": 1,
+            "hits": 3,
+            "misses": 1,
+            "hit_rate": 0.75,
+        }
+
+    @pytest.mark.asyncio
+    async def test_publish(self) -> None:
+        registry = StatementRegistry()
+        registry.get("key", object)
+        logger = Mock()
+
+        task = asyncio.create_task(registry.publish(logger, 0.001))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        logger.info.assert_called_with("statement registry", **registry.stats())
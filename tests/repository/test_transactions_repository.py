@@ -0,0 +1,327 @@
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from dummy_bank.domain import TransactionKind
+from dummy_bank.repository import (
+    AccountsRepository,
+    CustomerRepository,
+    LedgerPartition,
+    TransactionsRepository,
+)
+
+from ..make_domain_objects import MakeAccount, MakeCustomer
+
+
+class TestLedger:
+    @pytest.mark.asyncio
+    async def test_balance_changes(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+
+        await account_repository.increase_balance(account.id, 500)
+        await account_repository.decrease_balance(account.id, 200)
+        with pytest.raises(ValueError):
+            await account_repository.decrease_balance(account.id, 10_000)
+
+        page = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=10, account_id=account.id
+        )
+
+        assert page["total_count"] == 2
+        assert [(t.kind, t.amount, t.balance_after) for t in page["results"]] == [
+            (TransactionKind.DEPOSIT, 500, 1500),
+            (TransactionKind.WITHDRAWAL, -200, 1300),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_zero_withdrawal(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_account(account)
+
+        await account_repository.decrease_balance(account.id, 0)
+
+        page = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=10, account_id=account.id
+        )
+        assert [(t.kind, t.amount) for t in page["results"]] == [
+            (TransactionKind.WITHDRAWAL, 0)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_account_with_entries_cannot_be_deleted(
+        self,
+        database_engine: AsyncEngine,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_account(account)
+        await account_repository.increase_balance(account.id, 100)
+
+        with pytest.raises(IntegrityError):
+            async with database_engine.begin() as conn:
+                await conn.execute(
+                    text("delete from accounts where id = :id"), {"id": account.id}
+                )
+
+    @pytest.mark.asyncio
+    async def test_transfer(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        source = make_account(customer_id=customer.id, account_balance=10)
+        target = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_accounts([source, target])
+
+        await account_repository.transfer(source.id, target.id, 250)
+
+        source_page = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=10, account_id=source.id
+        )
+        target_page = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=10, account_id=target.id
+        )
+
+        [out] = source_page["results"]
+        assert out.kind is TransactionKind.TRANSFER_OUT
+        assert (out.amount, out.balance_after) == (-250, 750)
+        assert out.counterparty_account_id == target.id
+
+        [in_] = target_page["results"]
+        assert in_.kind is TransactionKind.TRANSFER_IN
+        assert (in_.amount, in_.balance_after) == (250, 250)
+        assert in_.counterparty_account_id == source.id
+
+
+class TestLoadPaginatedTransactions:
+    @pytest.mark.asyncio
+    async def test_cursor(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_account(account)
+
+        for amount in range(1, 6):
+            await account_repository.increase_balance(account.id, amount)
+
+        first = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=3, account_id=account.id
+        )
+        second = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=3, account_id=account.id, cursor=first["next_cursor"]
+        )
+
+        assert [t.amount for t in first["results"]] == [1, 2, 3]
+        assert [t.amount for t in second["results"]] == [4, 5]
+        assert second["next_cursor"] is None
+
+
+class TestLedgerPartition:
+    def test_for_month(self) -> None:
+        partition = LedgerPartition.for_month(date(2024, 12, 17))
+
+        assert partition.start == date(2024, 12, 1)
+        assert partition.end == date(2025, 1, 1)
+        assert partition.name == "transactions_y2024m12"
+
+    def test_from_name(self) -> None:
+        assert LedgerPartition.from_name("transactions_y2025m03") == LedgerPartition(
+            date(2025, 3, 1)
+        )
+        assert LedgerPartition.from_name("transactions_default") is None
+
+
+class TestPartitions:
+    @pytest.mark.asyncio
+    async def test_create_and_detach(
+        self, transactions_repository: TransactionsRepository
+    ) -> None:
+        created = await transactions_repository.create_partitions(
+            months_ahead=2, today=date(2020, 11, 5)
+        )
+        assert [p.name for p in created] == [
+            "transactions_y2020m11",
+            "transactions_y2020m12",
+            "transactions_y2021m01",
+        ]
+        assert (
+            await transactions_repository.create_partitions(
+                months_ahead=2, today=date(2020, 11, 5)
+            )
+            == {}
+        )
+
+        detached = await transactions_repository.detach_partitions(
+            before=date(2021, 1, 1)
+        )
+
+        assert [p.name for p in detached] == [
+            "transactions_y2020m11",
+            "transactions_y2020m12",
+        ]
+        assert LedgerPartition(date(2021, 1, 1)) in (
+            await transactions_repository.partitions()
+        )
+
+    @pytest.mark.asyncio
+    async def test_moves_rows_out_of_the_default_partition(
+        self,
+        database_engine: AsyncEngine,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=0)
+        await account_repository.save_account(account)
+
+        # no partition covers November 2020 yet
+        async with database_engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "insert into transactions (id, account_id, created_at, kind, "
+                    "amount, balance_after) values (gen_random_uuid(), :account_id, "
+                    "'2020-11-10 12:00:00+00', 'deposit', 100, 100)"
+                ),
+                {"account_id": account.id},
+            )
+
+        created = await transactions_repository.create_partitions(
+            months_ahead=1, today=date(2020, 11, 5)
+        )
+
+        assert {p.name: n for p, n in created.items()} == {
+            "transactions_y2020m11": 1,
+            "transactions_y2020m12": 0,
+        }
+        async with database_engine.connect() as conn:
+            assert (
+                await conn.scalar(text("select count(*) from transactions_default"))
+                == 0
+            )
+            assert (
+                await conn.scalar(text("select count(*) from transactions_y2020m11"))
+                == 1
+            )
+
+        detached = await transactions_repository.detach_partitions(
+            before=date(2020, 12, 1)
+        )
+        assert [p.name for p in detached] == ["transactions_y2020m11"]
+
+
+class TestBalanceAt:
+    @pytest.mark.asyncio
+    async def test(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=10)
+        await account_repository.save_account(account)
+        assert account.created_at is not None
+
+        await account_repository.increase_balance(account.id, 500)
+        await account_repository.increase_balance(account.id, 200)
+        page = await transactions_repository.load_paginated_transactions(
+            page=1, page_size=10, account_id=account.id
+        )
+        first, second = (t.created_at for t in page["results"])
+
+        # without a snapshot, replayed back from the current balance
+        assert await transactions_repository.balance_at(account.id, first) == 1500
+
+        assert await transactions_repository.take_snapshots(at=second) == 1
+        assert await transactions_repository.take_snapshots(at=second) == 0
+
+        # forwards from the snapshot
+        assert await transactions_repository.balance_at(account.id, second) == 1700
+        # backwards from the snapshot
+        assert await transactions_repository.balance_at(account.id, first) == 1500
+        assert (
+            await transactions_repository.balance_at(account.id, account.created_at)
+            == 1000
+        )
+
+    @pytest.mark.asyncio
+    async def test_beyond_32_bits(
+        self,
+        account_repository: AccountsRepository,
+        customer_repository: CustomerRepository,
+        transactions_repository: TransactionsRepository,
+        make_account: MakeAccount,
+        make_customer: MakeCustomer,
+    ) -> None:
+        customer = make_customer()
+        await customer_repository.save_customer(customer)
+        account = make_account(customer_id=customer.id, account_balance=20_000_000)
+        await account_repository.save_account(account)
+        assert account.created_at is not None
+
+        await account_repository.increase_balance(account.id, 500_000_000)
+        await account_repository.increase_balance(account.id, 500_000_000)
+
+        balance = await transactions_repository.balance_at(
+            account.id, account.created_at
+        )
+        assert balance == 2_000_000_000
+        assert isinstance(balance, int)
+
+    @pytest.mark.asyncio
+    async def test_account_not_found(
+        self, transactions_repository: TransactionsRepository
+    ) -> None:
+        assert (
+            await transactions_repository.balance_at(
+                uuid4(), datetime.now(timezone.utc)
+            )
+            is None
+        )
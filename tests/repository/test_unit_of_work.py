@@ -0,0 +1,136 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from dummy_bank.repository import (
+    AccountsRepository,
+    CustomerRepository,
+    UnitOfWork,
+)
+
+from ..make_domain_objects import MakeAccount, MakeCustomer
+
+
+class TestSession:
+    def test_is_lazy(self) -> None:
+        session_factory = Mock()
+        UnitOfWork(session_factory)
+        session_factory.assert_not_called()
+
+    def test_is_shared(self) -> None:
+        session_factory = Mock()
+        unit_of_work = UnitOfWork(session_factory)
+
+        assert unit_of_work.session is unit_of_work.session
+        session_factory.assert_called_once()
+
+
+class TestCommit:
+    @pytest.mark.asyncio
+    async def test_without_session(self) -> None:
+        session_factory = Mock()
+        await UnitOfWork(session_factory).commit()
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test(self) -> None:
+        session = AsyncMock()
+        unit_of_work = UnitOfWork(Mock(return_value=session))
+        unit_of_work.session
+
+        await unit_of_work.commit()
+        session.commit.assert_awaited_once()
+
+
+class TestRollback:
+    @pytest.mark.asyncio
+    async def test_without_session(self) -> None:
+        session_factory = Mock()
+        await UnitOfWork(session_factory).rollback()
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test(self) -> None:
+        session = AsyncMock()
+        unit_of_work = UnitOfWork(Mock(return_value=session))
+        unit_of_work.session
+
+        await unit_of_work.rollback()
+        session.rollback.assert_awaited_once()
+
+
+class TestClose:
+    @pytest.mark.asyncio
+    async def test_without_session(self) -> None:
+        session_factory = Mock()
+        await UnitOfWork(session_factory).close()
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test(self) -> None:
+        session = AsyncMock()
+        session_factory = Mock(return_value=session)
+        unit_of_work = UnitOfWork(session_factory)
+        unit_of_work.session
+
+        await unit_of_work.close()
+        session.close.assert_awaited_once()
+
+        # a fresh session is opened if the unit of work is used again
+        unit_of_work.session
+        assert session_factory.call_count == 2
+
+
+class TestSharedBetweenRepositories:
+    @pytest.mark.asyncio
+    async def test_commits_once(
+        self,
+        database_engine: AsyncEngine,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+        make_account: MakeAccount,
+    ) -> None:
+        unit_of_work = UnitOfWork(
+            async_sessionmaker(database_engine, expire_on_commit=False)
+        )
+        customers = CustomerRepository(database_engine, unit_of_work=unit_of_work)
+        accounts = AccountsRepository(database_engine, unit_of_work=unit_of_work)
+
+        customer = make_customer()
+        account = make_account(customer_id=customer.id)
+        await customers.save_customer(customer)
+        await accounts.save_account(account)
+
+        # visible inside the unit of work before it is committed
+        assert await accounts.load_account_with_id(account.id) is not None
+        assert await customer_repository.load_customer_with_id(customer.id) is None
+
+        await unit_of_work.commit()
+        await unit_of_work.close()
+
+        assert await customer_repository.load_customer_with_id(customer.id)
+
+    @pytest.mark.asyncio
+    async def test_close_discards_uncommitted_writes(
+        self,
+        database_engine: AsyncEngine,
+        customer_repository: CustomerRepository,
+        make_customer: MakeCustomer,
+    ) -> None:
+        unit_of_work = UnitOfWork(async_sessionmaker(database_engine))
+        customers = CustomerRepository(database_engine, unit_of_work=unit_of_work)
+
+        customer = make_customer()
+        await customers.save_customer(customer)
+        await unit_of_work.close()
+
+        assert await customer_repository.load_customer_with_id(customer.id) is None
+
+    @pytest.mark.asyncio
+    async def test_session_is_the_unit_of_work_session(self) -> None:
+        unit_of_work = UnitOfWork(Mock(return_value=Mock(spec=AsyncSession)))
+        repository = CustomerRepository(Mock(), unit_of_work=unit_of_work)
+
+        async with repository._session() as session:
+            assert session is unit_of_work.session
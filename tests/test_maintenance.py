@@ -0,0 +1,165 @@
+import argparse
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from dummy_bank.api.models import DataFormat
+from dummy_bank.maintenance import (
+    backfill_balances,
+    bulk_import,
+    create_partitions,
+    detach_partitions,
+    parse_args,
+    run,
+    take_snapshots,
+)
+from dummy_bank.repository import (
+    WIDENED_BALANCES,
+    CustomerRepository,
+    DBCustomer,
+    LedgerPartition,
+    TransactionsRepository,
+)
+
+
+class TestParseArgs:
+    def test_create_partitions(self) -> None:
+        args = parse_args(["create-partitions"])
+
+        assert args.command is create_partitions
+        assert args.months_ahead == 3
+
+    def test_detach_partitions(self) -> None:
+        args = parse_args(["detach-partitions", "--before", "2025-01-01"])
+
+        assert args.command is detach_partitions
+        assert args.before == date(2025, 1, 1)
+
+    def test_detach_partitions_requires_before(self) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["detach-partitions"])
+
+    def test_take_snapshots(self) -> None:
+        args = parse_args(["take-snapshots", "--at", "2025-01-02"])
+
+        assert args.command is take_snapshots
+        assert args.at == date(2025, 1, 2)
+
+    def test_backfill_balances(self) -> None:
+        args = parse_args(["backfill-balances", "--batch-size", "500"])
+
+        assert args.command is backfill_balances
+        assert args.batch_size == 500
+
+    def test_bulk_import(self) -> None:
+        args = parse_args(["bulk-import", "accounts", "accounts.csv"])
+
+        assert args.command is bulk_import
+        assert args.table == "accounts"
+        assert args.path == Path("accounts.csv")
+        assert args.format is None
+        assert args.batch_size == 5_000
+
+    def test_bulk_import_format(self) -> None:
+        args = parse_args(["bulk-import", "customers", "rows", "--format", "ndjson"])
+
+        assert args.format is DataFormat.NDJSON
+
+    def test_bulk_import_unknown_table(self) -> None:
+        with pytest.raises(SystemExit):
+            parse_args(["bulk-import", "transactions", "rows.csv"])
+
+
+class TestCommands:
+    @pytest.mark.asyncio
+    async def test_create_and_detach_partitions(
+        self,
+        database_engine: AsyncEngine,
+        transactions_repository: TransactionsRepository,
+    ) -> None:
+        logger = Mock()
+        this_month = LedgerPartition.for_month(datetime.now(timezone.utc).date())
+
+        await create_partitions(
+            database_engine, logger, argparse.Namespace(months_ahead=0)
+        )
+        assert this_month in await transactions_repository.partitions()
+
+        await detach_partitions(
+            database_engine, logger, argparse.Namespace(before=this_month.end)
+        )
+        assert this_month not in await transactions_repository.partitions()
+
+        assert logger.info.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_take_snapshots(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+
+        await take_snapshots(
+            database_engine, logger, argparse.Namespace(at=date(2025, 1, 2))
+        )
+
+        logger.info.assert_called_once_with(
+            "took balance snapshots", at="2025-01-02T00:00:00+00:00", accounts=0
+        )
+
+    @pytest.mark.asyncio
+    async def test_backfill_balances(self, database_engine: AsyncEngine) -> None:
+        logger = Mock()
+        async with database_engine.begin() as conn:
+            for model, columns in WIDENED_BALANCES.items():
+                for column in columns:
+                    await conn.execute(
+                        text(
+                            f"alter table {model.__tablename__} "
+                            f"add column {column}_wide bigint"
+                        )
+                    )
+
+        await backfill_balances(
+            database_engine, logger, argparse.Namespace(batch_size=10)
+        )
+
+        assert [call.kwargs for call in logger.info.call_args_list] == [
+            {"table": "accounts", "rows": 0},
+            {"table": "balance_snapshots", "rows": 0},
+            {"table": "transactions", "rows": 0},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_import(
+        self,
+        database_engine: AsyncEngine,
+        customer_repository: CustomerRepository,
+        tmp_path: Path,
+    ) -> None:
+        logger = Mock()
+        path = tmp_path / "customers.csv"
+        path.write_text("first_name,last_name\nBob,Bobbington\nSue,\n")
+
+        await bulk_import(
+            database_engine,
+            logger,
+            argparse.Namespace(table="customers", path=path, format=None, batch_size=1),
+        )
+
+        assert [call.kwargs for call in logger.info.call_args_list] == [
+            {"line": 3, "id": None, "reason": "last_name: Field required"},
+            {"table": "customers", "imported": 1, "rejected": 1},
+        ]
+        assert await customer_repository.get_count(DBCustomer) == 1
+
+
+class TestRun:
+    @pytest.mark.asyncio
+    async def test_runs_command(self) -> None:
+        command = AsyncMock()
+
+        await run(argparse.Namespace(command=command))
+
+        command.assert_awaited_once()